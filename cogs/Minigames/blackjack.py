@@ -49,11 +49,6 @@ class Blackjack:
         self.message_game = await self.ctx.send(embed=self.embed)
 
 
-        def check(reaction, user):
-            valid = user == self.ctx.author and reaction.message.id == self.message_game.id and reaction.emoji in self.moves
-            return valid
-
-
         for move in self.moves:
             await self.message_game.add_reaction(move)
 
@@ -100,16 +95,16 @@ class Blackjack:
 
             # ask player input
                 try:
-                    reaction, user = await self.bot.wait_for('reaction_add', timeout=3 * 60,  # 3 minutes
-                        check=check, )
+                    payload = await self.bot.router.wait_for_reaction(self.message_game.id, self.ctx.author.id, self.moves,
+                                                                      timeout=3 * 60)  # 3 minutes
                 except asyncio.TimeoutError as e:
                     # should probably stand if timeout
                     self.playing = False
                     self.timeout = True
                     break
 
-                move = reaction.emoji
-                await reaction.remove(user)
+                move = str(payload.emoji)
+                await self.message_game.remove_reaction(payload.emoji, self.ctx.author)
                 # if hit
                 if move == Alphabet.H.value:
                     # give card
@@ -201,7 +196,7 @@ class Blackjack:
             self.update_embed(hint_message=hint_message, money=0, win="+", color=discord.Color.teal())
 
         if self.bet > 0 and not self.push:
-            await sql.change_balance(self.bot.pool, self.ctx.guild.id, self.ctx.author.id, self.balance+credits_won)
+            await sql.transfer(self.bot.pool, self.ctx.guild.id, None, self.ctx.author.id, credits_won)
         await self.message_game.edit(embed=self.embed)
         await self.message_game.clear_reactions()
 
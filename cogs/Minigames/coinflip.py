@@ -33,17 +33,15 @@ class Coinflip:
     async def play(self):
         self.game_msg = await self.ctx.send(embed=self.startembed)
 
-        def check(reaction, user):
-            valid = (user == self.player2 or (user==self.player1 and str(reaction.emoji) == '❌')) \
-                    and reaction.message.id == self.game_msg.id and str(reaction.emoji) in ['✅', '❌']
-            return valid
+        def check(payload):
+            return payload.user_id == self.player2.id or (payload.user_id == self.player1.id and str(payload.emoji) == '❌')
 
         await self.game_msg.add_reaction('✅')
         await self.game_msg.add_reaction('❌')
 
         try:
-            reaction, user = await self.client.wait_for('reaction_add', timeout=90,  # 90 seconds
-                check=check)
+            payload = await self.client.router.wait_for_reaction(self.game_msg.id, emojis=['✅', '❌'], timeout=90,  # 90 seconds
+                                                                 check=check)
 
         except asyncio.TimeoutError as e:
             self.gameembed.color = discord.Color.red()
@@ -52,7 +50,8 @@ class Coinflip:
             await self.game_msg.edit(embed=self.gameembed)
             return await self.game_msg.clear_reactions()
 
-        resp = str(reaction.emoji)
+        resp = str(payload.emoji)
+        user = self.player2 if payload.user_id == self.player2.id else self.player1
         await self.game_msg.clear_reactions()
 
         if resp == '✅':
@@ -104,17 +103,15 @@ class Coinflip:
         self.gameembed.color = discord.Color.green()
         self.gameembed.clear_fields()
         if self.p1coin:
-            await sql.change_balance(self.client.pool, self.ctx.guild.id, self.player1.id, self.p1balance + self.bet)
-            await sql.change_balance(self.client.pool, self.ctx.guild.id, self.player2.id, self.p2balance - self.bet)
+            _, p2balance, p1balance = await sql.transfer(self.client.pool, self.ctx.guild.id, self.player2.id, self.player1.id,
+                                                         self.bet, check_funds=False)
             self.gameembed.add_field(name="Coin", value=f"\n{self.player1.mention} won **{self.bet}** credits!", inline=False)
-            self.gameembed.add_field(name="Balances", value=f"{self.player1.mention} - **{self.p1balance+(self.bet)}**\n"
-                                                                  f"{self.player2.mention} - **{self.p2balance-(self.bet)}**")
         else:
-            await sql.change_balance(self.client.pool, self.ctx.guild.id, self.player1.id, self.p1balance - self.bet)
-            await sql.change_balance(self.client.pool, self.ctx.guild.id, self.player2.id, self.p2balance + self.bet)
+            _, p1balance, p2balance = await sql.transfer(self.client.pool, self.ctx.guild.id, self.player1.id, self.player2.id,
+                                                         self.bet, check_funds=False)
             self.gameembed.add_field(name="Coin", value=f"{self.player2.mention} won **{self.bet}** credits!", inline=False)
-            self.gameembed.add_field(name="Balances", value=f"{self.player1.mention} - **{self.p1balance-(self.bet)}**\n"
-                                                                  f"{self.player2.mention} - **{self.p2balance+(self.bet)}**")
+        self.gameembed.add_field(name="Balances", value=f"{self.player1.mention} - **{p1balance}**\n"
+                                                        f"{self.player2.mention} - **{p2balance}**")
 
         mention = self.player1.mention if self.p1coin else self.player2.mention
         await self.game_msg.edit(content=f"{mention}", embed=self.gameembed)
@@ -117,16 +117,9 @@ class Connect4:
             self.update_embed(hint_message, player)
             await self.message_game.edit(embed=self.embed)
 
-
-            def check(reaction, user):
-                valid = user == self.players[
-                    player] and reaction.message.id == self.message_game.id and reaction.emoji in self.emoji_numbers
-                return valid
-
-
             try:
-                reaction, user = await self.bot.wait_for('reaction_add', timeout=5 * 60,  # 5 minutes
-                    check=check, )
+                payload = await self.bot.router.wait_for_reaction(self.message_game.id, self.players[player].id, self.emoji_numbers,
+                                                                  timeout=5 * 60)  # 5 minutes
             except asyncio.TimeoutError as e:
                 # makes the other player (not in turn) the winner if
                 # the current player times out
@@ -138,8 +131,8 @@ class Connect4:
 
                 break
 
-            column = self.emoji_numbers.index(reaction.emoji)
-            await reaction.remove(user)
+            column = self.emoji_numbers.index(str(payload.emoji))
+            await self.message_game.remove_reaction(payload.emoji, self.players[player])
 
             try:
                 self.board.player_play(player + 1, column)
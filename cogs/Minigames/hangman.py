@@ -62,11 +62,7 @@ class Hangman:
         """Play a game of Hangman!"""
 
         def check(message):
-            valid = (message.author == self.ctx.author and \
-                message.channel == self.ctx.channel) and \
-                (len(message.content) == 1 or \
-                message.content.lower() == 'cancel') or len(message.content.split()) == 1
-            return valid
+            return len(message.content) == 1 or message.content.lower() == 'cancel' or len(message.content.split()) == 1
 
         hint_message = 'Guess the word! Enter a letter to begin.'
         self.update_embed(hint_message)
@@ -74,8 +70,9 @@ class Hangman:
         while self.chances > 0 and not self.won:
 
             try:
-                guess_message = await self.bot.wait_for(
-                    'message',
+                guess_message = await self.bot.router.wait_for_message(
+                    self.ctx.channel.id,
+                    self.ctx.author.id,
                     timeout=5 * 60,  # 5 minutes
                     check=check,
                     )
@@ -50,13 +50,6 @@ class HighLow:
         self.update_embed('Please wait, setting things up...', hide_next=True)
         self.message_game = await self.ctx.send(embed=self.embed)
 
-        def check(reaction, user):
-            valid = user == self.ctx.author \
-                    and reaction.message.id == self.message_game.id \
-                    and reaction.emoji in self.moves
-
-            return valid
-
         for move in self.moves:
             await self.message_game.add_reaction(move)
 
@@ -73,16 +66,17 @@ class HighLow:
 
             # guess = input('Higher or Lower? ').upper()
             try:
-                reaction, user = await self.bot.wait_for(
-                    'reaction_add',
+                payload = await self.bot.router.wait_for_reaction(
+                    self.message_game.id,
+                    self.ctx.author.id,
+                    self.moves,
                     timeout=5 * 60,
-                    check=check,
                     )
             except asyncio.TimeoutError as e:
                 break
 
-            move = reaction.emoji
-            await reaction.remove(user)
+            move = str(payload.emoji)
+            await self.message_game.remove_reaction(payload.emoji, self.ctx.author)
             prev_lower_than_next = self.prev_card.rank < self.next_card.rank
 
             if self.prev_card.rank == self.next_card.rank:
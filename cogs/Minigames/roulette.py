@@ -48,9 +48,9 @@ class Roulette:
 
         self.gameembed.set_field_at(2, name="Wheel", value=res, inline=False)
         self.gameembed.add_field(name="Profit", value=profit, inline=False)
-        self.gameembed.add_field(name="Balance", value=f"**{self.balance+(self.bet*multiplier):,}** credits.")
+        _, _, balance = await sql.transfer(self.client.pool, self.ctx.guild.id, None, self.player.id, self.bet*multiplier)
+        self.gameembed.add_field(name="Balance", value=f"**{balance:,}** credits.")
         self.gameembed.color = get_color(num)
-        await sql.change_balance(self.client.pool, self.ctx.guild.id, self.player.id, self.balance+(self.bet*multiplier))
 
         # await asyncio.sleep(12)
         await self.game_msg.edit(embed=self.gameembed)
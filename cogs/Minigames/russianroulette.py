@@ -35,13 +35,10 @@ class RussianRoulette:
         self.starttime = datetime.datetime.utcnow()
         self.game_msg = await self.ctx.send(embed=self.gameembed)
 
-        def check(reaction, user):
-            if reaction.message.id == self.game_msg.id:
-                if str(reaction.emoji) == '✅':
-                    return user not in self.players
-                if str(reaction.emoji) == "▶":
-                    return user.id == self.player1.id
-            return False
+        def check(payload):
+            if str(payload.emoji) == '✅':
+                return payload.user_id not in [p.id for p in self.players]
+            return payload.user_id == self.player1.id
 
         await self.game_msg.add_reaction('✅')
         await self.game_msg.add_reaction('▶')
@@ -51,7 +48,8 @@ class RussianRoulette:
 
         while self.waiting:
             try:
-                reaction, user = await self.client.wait_for('reaction_add', timeout=self.secondsleft, check=check)
+                payload = await self.client.router.wait_for_reaction(self.game_msg.id, emojis=['✅', '▶'], timeout=self.secondsleft,
+                                                                     check=check)
 
             except asyncio.TimeoutError as e:
                 if len(self.players) == 1:
@@ -66,7 +64,7 @@ class RussianRoulette:
                     await self.play_game()
                     break
 
-            if str(reaction.emoji) == "▶":
+            if str(payload.emoji) == "▶":
                 if len(self.players) == 1:
                     self.task.cancel()
                     if self.player1.id in self.client.players_in_game:  ##Temp bugfix for players not appending properly
@@ -79,6 +77,7 @@ class RussianRoulette:
                     await self.play_game()
                     break
 
+            user = payload.member
             data = await sql.get_casino_player(self.client.pool, user.id)
             balance = data[sql.casino_cols.balance]
             if balance < self.bet:
@@ -133,14 +132,9 @@ class RussianRoulette:
 
     async def after_game(self):
         for p in self.killedplayers:
-            data = await sql.get_casino_player(self.client.pool, p.id)
-            balance = data[sql.casino_cols.balance]
-            await sql.change_balance(self.client.pool, self.ctx.guild.id, p.id, balance-self.bet)
+            await sql.transfer(self.client.pool, self.ctx.guild.id, p.id, self.players[0].id, self.bet, check_funds=False)
             if p.id in self.client.players_in_game: ##Temp bugfix for players not appending properly
                 self.client.players_in_game.remove(p.id)
-        data = await sql.get_casino_player(self.client.pool, self.players[0].id)
-        balance = data[sql.casino_cols.balance]
-        await sql.change_balance(self.client.pool, self.ctx.guild.id, self.players[0].id, balance + (self.bet*len(self.killedplayers)))
         if self.players[0].id in self.client.players_in_game:
             self.client.players_in_game.remove(self.players[0].id)
         self.gameembed.color = discord.Color.green()
@@ -55,17 +55,17 @@ class Slots:
         await self.update_embed()
 
         if self.winner is True:
-            await sql.change_balance(self.client.pool, self.ctx.guild.id, self.user.id, self.balance+self.winA)
+            _, _, balance = await sql.transfer(self.client.pool, self.ctx.guild.id, None, self.user.id, self.winA)
             self.gameembed.color = discord.Color.gold() if self.mult >= 38 else discord.Color.green()
             self.gameembed.description = "Slots - **JACKPOT!**" if self.mult >= 60 else "Slots - **You Won!**"
             self.gameembed.set_field_at(1, name="Bet", value=f"**+{self.winA+self.bet:,}** credits (x{self.mult+1})", inline=False)
-            self.gameembed.add_field(name="Balance", value=f"**{self.balance+self.winA:,}** credits.", inline=False)
+            self.gameembed.add_field(name="Balance", value=f"**{balance:,}** credits.", inline=False)
         else:
-            await sql.change_balance(self.client.pool, self.ctx.guild.id, self.user.id, self.balance - self.bet)
+            _, balance, _ = await sql.transfer(self.client.pool, self.ctx.guild.id, self.user.id, None, self.bet, check_funds=False)
             self.gameembed.color = discord.Color.red()
             self.gameembed.description = "Slots - **You lost!**"
             self.gameembed.set_field_at(1, name="Bet", value=f"**-{self.bet:,}** credits", inline=False)
-            self.gameembed.add_field(name="Balance", value=f"**{self.balance-self.bet:,}** credits.", inline=False)
+            self.gameembed.add_field(name="Balance", value=f"**{balance:,}** credits.", inline=False)
         self.gameembed.set_footer(text=f"Your Ticket was {self.ticket}")
         if self.mult >= 60:
             self.gameembed.set_thumbnail(url="https://media3.giphy.com/media/NsAXBSpx0MJ6IBDCPY/source.gif")
@@ -92,17 +92,12 @@ class TicTacToe:
             self.update_embed(hint_message, player)
             await self.message_game.edit(embed=self.embed)
 
-            def check(reaction, user):
-                valid = user == self.players[player] \
-                    and reaction.message.id == self.message_game.id \
-                    and reaction.emoji in self.emoji_positions
-                return valid
-
             try:
-                reaction, user = await self.bot.wait_for(
-                    'reaction_add',
+                payload = await self.bot.router.wait_for_reaction(
+                    self.message_game.id,
+                    self.players[player].id,
+                    self.emoji_positions,
                     timeout=5 * 60,  # 5 minutes
-                    check=check,
                     )
             except asyncio.TimeoutError as e:
                 # makes the other player (not in turn) the winner if
@@ -115,10 +110,9 @@ class TicTacToe:
 
                 break
 
-            position = self.emoji_positions.index(reaction.emoji)
+            position = self.emoji_positions.index(str(payload.emoji))
 
-            async for member in reaction.users():
-                await reaction.remove(member)
+            await self.message_game.clear_reaction(payload.emoji)
 
             try:
                 self.board.player_play(player + 1, position)
@@ -61,13 +61,11 @@ class AfkCheck:
         # Edit to dungeon selection embed
         await self.setup_msg.edit(embed=self.dungeonembed)
 
-        def dungeon_check(m):
-            return m.author == self.ctx.author and m.channel == self.ctx.channel and m.content.isdigit()
-
         # Wait for author to select a dungeon
         while True:
             try:
-                msg = await self.client.wait_for('message', timeout=60, check=dungeon_check)
+                msg = await self.client.router.wait_for_message(self.ctx.channel.id, self.ctx.author.id, timeout=60,
+                                                                check=lambda m: m.content.isdigit())
             except asyncio.TimeoutError:
                 embed = discord.Embed(title="Timed out!", description="You didn't choose a dungeon in time!", color=discord.Color.red())
                 await self.setup_msg.clear_reactions()
@@ -107,7 +105,7 @@ class AfkCheck:
             await self.setup_msg.delete()
         except discord.NotFound:
             pass
-        await self.vcchannel.set_permissions(self.raiderrole, connect=True, view_channel=True, speak=False)
+        await self.client.dispatcher.critical(self.vcchannel.set_permissions(self.raiderrole, connect=True, view_channel=True, speak=False))
 
         if not convert_from_hc:
             self.afkmsg = await self.hcchannel.send(f"@here `{self.dungeontitle}` {self.emojis[0]} started by {self.ctx.author.mention} "
@@ -133,6 +131,7 @@ class AfkCheck:
         cmojis = True if self.confirmreactions else False
         cp = embeds.afk_check_control_panel(self.afkmsg.jump_url, self.location, self.dungeontitle, self.emojis[1], True, rushers=rush, reactions=cmojis,
                                             vc_name=self.vcchannel.name)
+        self.cp_embed = cp
         self.cpmsg = await self.ctx.send(embed=cp)
 
         await self.cpmsg.add_reaction("📝")
@@ -160,7 +159,7 @@ class AfkCheck:
                     self.raiderids.append(payload.member.id)
                 if not payload.member.voice or not payload.member.voice.channel == self.vcchannel:
                     try:
-                        await payload.member.edit(voice_channel=self.vcchannel)
+                        await self.client.dispatcher.critical(payload.member.edit(voice_channel=self.vcchannel))
                     except discord.Forbidden:
                         pass
 
@@ -175,14 +174,14 @@ class AfkCheck:
                     if len(self.nitroboosters) > 5:
                         return await payload.member.send("We already have 6 Nitro Boosters for this run. Wait for the RL to call location.")
                     if payload.member not in self.patreons:
-                        await payload.member.send(f"Confirmed {payload.emoji}. The location for this run is:\n***{self.location}***\nPlease get to the location soon.")
+                        await self.client.dispatcher.critical(payload.member.send(f"Confirmed {payload.emoji}. The location for this run is:\n***{self.location}***\nPlease get to the location soon."))
                         if payload.member not in self.userswloc:
                             self.userswloc.append(payload.member)
                         if payload.member not in self.nitroboosters:
                             self.nitroboosters.append(payload.member)
-                        cp = self.cpmsg.embeds[0]
+                        cp = self.cp_embed
                         cp.set_field_at(1, name="Nitro Boosters:", value=" | ".join([m.mention for m in self.nitroboosters]), inline=False)
-                        await self.cpmsg.edit(embed=cp)
+                        await self.client.editor.edit(self.cpmsg, embed=cp)
             elif emote == '<:patreon:736944176469508118>':
                 if payload.member not in self.patreons:
                     is_patreon = payload.member.id in self.client.patreon_ids
@@ -191,10 +190,10 @@ class AfkCheck:
                             self.patreons.append(payload.member)
                         if payload.member not in self.userswloc:
                             self.userswloc.append(payload.member)
-                        await payload.member.send(f"Confirmed {payload.emoji}. The location for this run is:\n***{self.location}***\nPlease get to the location soon.")
-                        cp = self.cpmsg.embeds[0]
+                        await self.client.dispatcher.critical(payload.member.send(f"Confirmed {payload.emoji}. The location for this run is:\n***{self.location}***\nPlease get to the location soon."))
+                        cp = self.cp_embed
                         cp.set_field_at(2, name="Patreons:", value=" | ".join([m.mention for m in self.patreons]), inline=False)
-                        await self.cpmsg.edit(embed=cp)
+                        await self.client.editor.edit(self.cpmsg, embed=cp)
             elif emote == "❌" and payload.member.top_role >= self.rlrole:
                 self.autoendtask.cancel()
                 return await self.post_afk(False, payload.member)
@@ -273,19 +272,21 @@ class AfkCheck:
             except discord.NotFound:
                 pass
 
-            for m in self.userswloc:
-                await m.send(f"The location has changed to **{self.location}**.\nPlease get to the new location as soon as possible.")
+            res = await self.client.dispatcher.fan_out(self.userswloc, f"The location has changed to **{self.location}**.\nPlease get to the new location as "
+                                                                        f"soon as possible.")
+            if res.failed:
+                await self.ctx.send(f"Couldn't send the new location to: {', '.join(m.mention for m in res.failed)}", delete_after=30)
 
-            cp = self.cpmsg.embeds[0]
+            cp = self.cp_embed
             cp.set_field_at(0, name="Location of run:", value=self.location, inline=False)
-            await self.cpmsg.edit(embed=cp)
+            await self.client.editor.edit(self.cpmsg, embed=cp, urgent=True)
 
         elif str(payload.emoji) == "🛑":
             await self.abort_afk(payload.member)
         elif str(payload.emoji) == "🗺️":
             embed = self.afkmsg.embeds[0]
             embed.description += f"\n\nLocation has been revealed!\nThe location for this run is: ***{self.location}***."
-            await self.afkmsg.edit(embed=embed)
+            await self.client.editor.edit(self.afkmsg, embed=embed, urgent=True)
             await self.cpmsg.remove_reaction("🗺️", payload.member)
             await self.cpmsg.remove_reaction("🗺️", self.client.user)
             await self.ctx.send(f"Location has been revealed by {payload.member.mention}!")
@@ -298,11 +299,8 @@ class AfkCheck:
         msg = await member.send(desc)
         await msg.add_reaction(emoji)
 
-        def check(react, user):
-            return not user.bot and react.message.id == msg.id and str(react.emoji) == emoji
-
         try:
-            reaction, usr = await self.client.wait_for('reaction_add', timeout=20, check=check)
+            await self.client.router.wait_for_reaction(msg.id, member.id, [emoji], timeout=20)
         except asyncio.TimeoutError:
             return await member.send("Timed out! Please re-confirm key on the AFK message.")
 
@@ -311,8 +309,8 @@ class AfkCheck:
 
         if rush:
             if self.numrushers >= self.maxrushers:
-                return await usr.send("We already have enough rushers for this run! You can ask the rl for location if extra rushers "
-                                      "may be needed.")
+                return await member.send("We already have enough rushers for this run! You can ask the rl for location if extra rushers "
+                                         "may be needed.")
 
             mstring = str(member.mention)
             if self.vetraiderrole and self.vetraiderrole in member.roles:
@@ -326,7 +324,7 @@ class AfkCheck:
             if member not in self.userswloc:
                 self.userswloc.append(member)
 
-            await member.send(f"Confirmed {emoji}. The location for this run is:\n***{self.location}***\nPlease get to the location soon.")
+            await self.client.dispatcher.critical(member.send(f"Confirmed {emoji}. The location for this run is:\n***{self.location}***\nPlease get to the location soon."))
         elif confirm_emoji:
             mstring = str(member.mention)
             if self.vetraiderrole and self.vetraiderrole in member.roles:
@@ -343,15 +341,15 @@ class AfkCheck:
             if len(confirm_list) >= 2:
                 return await member.send(f"There are already enough {name} for this run. Please wait for RL to call location.")
             else:
-                await member.send(f"Confirmed {emoji}. The location for this run is:\n***{self.location}***\nPlease get to the location and "
-                                  f"trade `{self.ctx.author.display_name}`.")
+                await self.client.dispatcher.critical(member.send(f"Confirmed {emoji}. The location for this run is:\n***{self.location}***\nPlease get to the "
+                                                                  f"location and trade `{self.ctx.author.display_name}`."))
                 if member not in self.userswloc:
                     self.userswloc.append(member)
             confirm_list.append(member)
 
         # TODO: add 🌟 emoji to name if key popper / rune popper role
         if key or vial or helm or shield or sword or confirm_emoji or rush:
-            cp = self.cpmsg.embeds[0]
+            cp = self.cp_embed
             add = 1 if self.confirmreactions else 0
             add += 1 if self.rusher_emojis else 0
             if key:
@@ -389,20 +387,20 @@ class AfkCheck:
                 name = "Confirmed Tricksters" if self.dungeontitle == "Oryx 3" else "Confirmed Rushers"
                 cp.set_field_at(2 + add, name=name, value=s, inline=False)
 
-            await self.cpmsg.edit(embed=cp)
+            await self.client.editor.edit(self.cpmsg, embed=cp)
 
     async def wait_for_end(self):
         await asyncio.sleep(480)  # Wait 8 minutes
         await self.post_afk(True)
 
     async def post_afk(self, automatic: bool, ended: discord.Member = None):
-        await self.vcchannel.set_permissions(self.raiderrole, connect=False, view_channel=True, speak=False)
+        await self.client.dispatcher.critical(self.vcchannel.set_permissions(self.raiderrole, connect=False, view_channel=True, speak=False))
         seconds_left = 30
-        for m in self.vcchannel.members:
-            if m.id not in self.raiderids and not m.bot and m.top_role < self.rlrole:
-                await m.edit(voice_channel=None)
+        kick = [m for m in self.vcchannel.members if m.id not in self.raiderids and not m.bot and m.top_role < self.rlrole]
+        async for _ in self.client.dispatcher.move(kick, None):
+            pass
 
-        cpembd = self.cpmsg.embeds[0]
+        cpembd = self.cp_embed
         cpembd.remove_field(len(cpembd.fields) - 1)
         if ended:
             cpembd.description = f"**AFK Check Ended by** {ended.mention} | Raid running in `{self.vcchannel.name}`"
@@ -410,7 +408,7 @@ class AfkCheck:
             cpembd.description = f"**AFK Check Ended Automatically** | Raid running in `{self.vcchannel.name}`"
         cpembd.set_footer(text="AFK Check Ended at ")
         cpembd.timestamp = datetime.utcnow()
-        await self.cpmsg.edit(embed=cpembd)
+        await self.client.editor.edit(self.cpmsg, embed=cpembd, urgent=True)
         await self.cpmsg.clear_reactions()
 
         if not automatic:
@@ -419,7 +417,7 @@ class AfkCheck:
 
         while seconds_left > 0:
             embed = embeds.post_afk(seconds_left, len(self.raiderids), self.emojis, self.afk_color)
-            await self.afkmsg.edit(content="Last chance to join the run!", embed=embed)
+            await self.client.editor.edit(self.afkmsg, content="Last chance to join the run!", embed=embed)
             seconds_left -= 5
             await asyncio.sleep(5)
         await self.end_afk(automatic, ended)
@@ -438,7 +436,7 @@ class AfkCheck:
                             f"This raid ran with {len(self.raiderids)} members.\nPlease wait for the next AFK-Check to begin."
         embed.set_footer(text="Raid ended at")
         embed.timestamp = datetime.utcnow()
-        await self.afkmsg.edit(content="", embed=embed)
+        await self.client.editor.edit(self.afkmsg, content="", embed=embed, urgent=True)
         try:
             del self.client.raid_db[self.ctx.guild.id]['afk'][self.afkmsg.id]
             del self.client.raid_db[self.ctx.guild.id]['cp'][self.cpmsg.id]
@@ -467,28 +465,22 @@ class AfkCheck:
         await self.afkmsg.clear_reactions()
         await self.afkmsg.unpin()
         embed = embeds.aborted_afk(self.dungeontitle, ended_by, self.afk_img)
-        await self.afkmsg.edit(content="", embed=embed)
+        await self.client.editor.edit(self.afkmsg, content="", embed=embed, urgent=True)
 
-        cpembd = self.cpmsg.embeds[0]
+        cpembd = self.cp_embed
         cpembd.remove_field(len(cpembd.fields) - 1)
         cpembd.description = f"**AFK Check Aborted by** {ended_by.mention}"
         cpembd.set_footer(text="AFK Check Aborted at ")
         cpembd.timestamp = datetime.utcnow()
-        await self.cpmsg.edit(embed=cpembd)
+        await self.client.editor.edit(self.cpmsg, embed=cpembd, urgent=True)
         await self.cpmsg.clear_reactions()
 
-        await self.vcchannel.set_permissions(self.raiderrole, connect=False, view_channel=True, speak=False)
+        await self.client.dispatcher.critical(self.vcchannel.set_permissions(self.raiderrole, connect=False, view_channel=True, speak=False))
 
     async def add_emojis(self):
-        for e in self.emojis:
-            await self.afkmsg.add_reaction(e)
-        for e in self.confirmreactions:
-            await self.afkmsg.add_reaction(e)
-        for e in self.rusher_emojis:
-            await self.afkmsg.add_reaction(e)
-        await self.afkmsg.add_reaction('<:shard:682365548465487965>')
-        await self.afkmsg.add_reaction('<:patreon:736944176469508118>')
-        await self.afkmsg.add_reaction('❌')
+        emojis = [*self.emojis, *self.confirmreactions, *self.rusher_emojis, '<:shard:682365548465487965>', '<:patreon:736944176469508118>', '❌']
+        for e in emojis:
+            await self.client.dispatcher.cosmetic(self.afkmsg.add_reaction(e))
 
     async def convert_from_headcount(self, hcmsg, dungeoninfo, dungeontitle, emojis, raidnum, inraiding, invet, inevents, raiderrole,
                                      rlrole, hcchannel, vcchannel):
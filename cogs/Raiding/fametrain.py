@@ -44,18 +44,14 @@ class FameTrain:
             await self.setup_msg.add_reaction(r)
 
 
-        def world_check(reaction, user):
-            return user == self.ctx.author and reaction.message.id == self.setup_msg.id and str(reaction.emoji) in self.numbers
-
-
         try:
-            reaction, user = await self.client.wait_for('reaction_add', timeout=60, check=world_check)
+            payload = await self.client.router.wait_for_reaction(self.setup_msg.id, self.ctx.author.id, self.numbers, timeout=60)
         except asyncio.TimeoutError:
             mapembed = discord.Embed(title="Timed out!", description="You didn't choose a world in time!", color=discord.Color.red())
             await self.setup_msg.clear_reactions()
             return await self.setup_msg.edit(embed=mapembed)
 
-        index = self.numbers.index(str(reaction.emoji))
+        index = self.numbers.index(str(payload.emoji))
         self.world_num = 1 if index == 0 else 3 if index == 1 else 10 if index == 2 else 12
 
         await self.setup_msg.delete()
@@ -30,12 +30,10 @@ class Headcount:
     async def start(self):
         await self.setup_msg.edit(embed=self.dungeonembed)
 
-        def dungeon_check(m):
-            return m.author == self.ctx.author and m.channel == self.ctx.channel and m.content.isdigit()
-
         while True:
             try:
-                msg = await self.client.wait_for('message', timeout=60, check=dungeon_check)
+                msg = await self.client.router.wait_for_message(self.ctx.channel.id, self.ctx.author.id, timeout=60,
+                                                                check=lambda m: m.content.isdigit())
             except asyncio.TimeoutError:
                 embed = discord.Embed(title="Timed out!", description="You didn't choose a dungeon in time!", color=discord.Color.red())
                 await self.setup_msg.clear_reactions()
@@ -30,6 +30,7 @@ class LogRun:
         self.leader = runleader if runleader else author
         self.converter = utils.MemberLookupConverter()
         self.confirmedLogs = []
+        self.runlogs = []
         self.pkeymember = None
         self.numbers = ['1️⃣', '2️⃣', '3️⃣', '4️⃣', '5️⃣', '6️⃣', '7️⃣', '8️⃣', '9️⃣', "🔟"]
         self.startembed = discord.Embed(title=f"Log this Run: {author.display_name}",
@@ -49,16 +50,8 @@ class LogRun:
         await self.msg.add_reaction("📝")
         await self.msg.add_reaction("🗑️")
 
-        def check(payload):
-            # if str(payload.emoji) == "📝" and payload.channel_id == 687436051001638935:
-            #     print("logrun check")
-            #     print(f"Author: {self.author.display_name} | ID {self.author.id}")
-            #     print(f"Reacted UserID: {payload.user_id}")
-            #     print(payload.user_id == self.author.id and payload.message_id == self.msg.id and (str(payload.emoji) == "📝" or str(payload.emoji) == '🗑️'))
-            return payload.user_id == self.author.id and payload.message_id == self.msg.id and (str(payload.emoji) == "📝" or str(payload.emoji) == '🗑️')
-
         try:
-            payload = await self.client.wait_for('raw_reaction_add', check=check, timeout=7000)  # Wait
+            payload = await self.client.router.wait_for_reaction(self.msg.id, self.author.id, ["📝", "🗑️"], timeout=7000)  # Wait
         except asyncio.TimeoutError:
             print("TIMED OUT IN LOGGING CHECK")
             print(f"Author of timeout: {self.author}")
@@ -155,12 +148,9 @@ class LogRun:
                 emojis.append("🔄")
                 emojis.append("❌")
                 asyncio.get_event_loop().create_task(self.add_emojis(self.msg, emojis))
-                def check(react, usr):
-                    return usr == self.author and react.message.id == self.msg.id and (str(react.emoji) in self.numbers or
-                                                                                           str(react.emoji) == '🔄' or str(react.emoji) == "❌")
-
                 try:
-                    reaction, user = await self.client.wait_for('reaction_add', timeout=7200, check=check)  # Wait 1 hr max
+                    payload = await self.client.router.wait_for_reaction(self.msg.id, self.author.id, self.numbers + ["🔄", "❌"],
+                                                                         timeout=7200)  # Wait 1 hr max
                 except asyncio.TimeoutError:
                     if self.author.id in self.client.raid_db[self.guild.id]['leaders']:
                         self.client.raid_db[self.guild.id]['leaders'].remove(self.author.id)
@@ -168,20 +158,18 @@ class LogRun:
                     await self.msg.clear_reactions()
                     return await self.msg.edit(embed=embed)
 
-                if str(reaction.emoji) == '❌':
+                if str(payload.emoji) == '❌':
                     num = 0
-                elif str(reaction.emoji) in self.numbers:
-                    num = self.numbers.index(str(reaction.emoji))
+                elif str(payload.emoji) in self.numbers:
+                    num = self.numbers.index(str(payload.emoji))
                 else:
                     embed = discord.Embed(title='Specify # of Chains', description='Please send the number of chains completed.',
                                           color=discord.Color.gold())
                     await self.msg.edit(embed=embed)
 
-                    def number_check(m):
-                        return m.author == self.author and m.channel == self.channel
                     while True:
                         try:
-                            msg = await self.client.wait_for('message', timeout=7200, check=number_check)
+                            msg = await self.client.router.wait_for_message(self.channel.id, self.author.id, timeout=7200)
                         except asyncio.TimeoutError:
                             if self.author.id in self.client.raid_db[self.guild.id]['leaders']:
                                 self.client.raid_db[self.guild.id]['leaders'].remove(self.author.id)
@@ -212,12 +200,9 @@ class LogRun:
                         await self.msg.add_reaction("✅")
                         await self.msg.add_reaction("❌")
 
-                        def check(react, usr):
-                            return usr == self.author and react.message.id == self.msg.id and (
-                                        str(react.emoji) == "✅" or str(react.emoji) == "❌")
-
                         try:
-                            reaction, user = await self.client.wait_for('reaction_add', timeout=7200, check=check)  # Wait 1 hr max
+                            payload = await self.client.router.wait_for_reaction(self.msg.id, self.author.id, ["✅", "❌"],
+                                                                                 timeout=7200)  # Wait 1 hr max
                         except asyncio.TimeoutError:
                             if self.author.id in self.client.raid_db[self.guild.id]['leaders']:
                                 self.client.raid_db[self.guild.id]['leaders'].remove(self.author.id)
@@ -225,7 +210,7 @@ class LogRun:
                             await self.msg.clear_reactions()
                             return await self.msg.edit(embed=embed)
 
-                        if str(reaction.emoji) == '✅':
+                        if str(payload.emoji) == '✅':
                             await sql.log_runs(self.client.pool, self.guild.id, self.pkeymember.id, sql.log_cols.eventkeys, num)
                             index = self.confirmedLogs.index((self.emojis[1], f"{self.pkeymember.mention}"))
                             del self.confirmedLogs[index]
@@ -243,7 +228,7 @@ class LogRun:
                             embed.description += f"\nPlease enter the member that popped key {i+1}/{num+1}."
                             await self.memberlog(embed, self.keyreacts, sql.log_cols.eventkeys, self.emojis[1])
 
-                await sql.log_runs(self.client.pool, self.guild.id, self.author.id, sql.log_cols.eventled, number=num+1)
+                self.runlogs.append((self.author.id, sql.log_cols.eventled, num+1))
                 self.numruns = num + 1
             else:
                 await self.msg.clear_reactions()
@@ -251,11 +236,8 @@ class LogRun:
                 await self.msg.add_reaction("✅")
                 await self.msg.add_reaction("❌")
 
-                def check(payload):
-                    return payload.user_id == self.author.id and payload.message_id == self.msg.id and (str(payload.emoji) == "✅" or str(payload.emoji) == "❌")
-
                 try:
-                    payload = await self.client.wait_for('raw_reaction_add', timeout=7200, check=check)  # Wait 1 hr max
+                    payload = await self.client.router.wait_for_reaction(self.msg.id, self.author.id, ["✅", "❌"], timeout=7200)  # Wait 1 hr max
                 except asyncio.TimeoutError:
                     if self.author.id in self.client.raid_db[self.guild.id]['leaders']:
                         self.client.raid_db[self.guild.id]['leaders'].remove(self.author.id)
@@ -264,11 +246,11 @@ class LogRun:
                     return await self.msg.edit(embed=embed)
 
                 col = sql.log_cols.srunled if str(payload.emoji) == "✅" else sql.log_cols.frunled
-                await sql.log_runs(self.client.pool, self.guild.id, self.leader.id, col, self.numruns)
+                self.runlogs.append((self.leader.id, col, self.numruns))
                 self.confirmedLogs.append(("Run Successful", str(payload.emoji)))
 
-            embed = discord.Embed(title="Logging...", description="Please wait while the run is logged in the database. "
-                                  "This can take up to a minute at full run capacity.", color=discord.Color.orange())
+            embed = discord.Embed(title="Logging...", description="Please wait while the run is logged in the database.",
+                                  color=discord.Color.orange())
             embed.set_thumbnail(url="https://i.imgur.com/nLRgnZf.gif")
 
             await self.msg.clear_reactions()
@@ -281,8 +263,9 @@ class LogRun:
                 m = self.guild.get_member(m)
                 if m:
                     if m.top_role >= self.rlrole:
-                        await sql.log_runs(self.client.pool, self.guild.id, m.id, col1, self.numruns)
-                    await sql.log_runs(self.client.pool, self.guild.id, m.id, col2, self.numruns)
+                        self.runlogs.append((m.id, col1, self.numruns))
+                    self.runlogs.append((m.id, col2, self.numruns))
+            await sql.log_runs_batch(self.client.pool, self.guild.id, self.runlogs)
 
             desc = "Log Status:\n"
             for r in self.confirmedLogs:
@@ -315,11 +298,8 @@ class LogRun:
         emojis.append("❌")
         asyncio.get_event_loop().create_task(self.add_emojis(self.msg, emojis))
 
-        def check(payload):
-            return payload.user_id == self.author.id and payload.message_id == self.msg.id and str(payload.emoji) in emojis
-
         try:
-            payload = await self.client.wait_for('raw_reaction_add', timeout=7000, check=check)  # Wait ~2 hr max
+            payload = await self.client.router.wait_for_reaction(self.msg.id, self.author.id, emojis, timeout=7000)  # Wait ~2 hr max
         except asyncio.TimeoutError:
             if self.author.id in self.client.raid_db[self.guild.id]['leaders']:
                 self.client.raid_db[self.guild.id]['leaders'].remove(self.author.id)
@@ -338,12 +318,9 @@ class LogRun:
             await self.msg.clear_reactions()
             self.otheremebed.title = f"Log Other member {self.author.display_name} for {emoji}"
             await self.msg.edit(embed=self.otheremebed)
-            def member_check(m):
-                return m.author == self.author and m.channel == self.channel
-
             while True:
                 try:
-                    msg = await self.client.wait_for('message', timeout=7200, check=member_check)
+                    msg = await self.client.router.wait_for_message(self.channel.id, self.author.id, timeout=7200)
                 except asyncio.TimeoutError:
                     if self.author.id in self.client.raid_db[self.guild.id]['leaders']:
                         self.client.raid_db[self.guild.id]['leaders'].remove(self.author.id)
@@ -385,5 +362,5 @@ class LogRun:
 
     async def add_emojis(self, msg, emojis):
         for e in emojis:
-            await msg.add_reaction(e)
+            await self.client.dispatcher.cosmetic(msg.add_reaction(e))
 
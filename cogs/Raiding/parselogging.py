@@ -1,17 +1,11 @@
 import asyncio
-import functools
-import io
-import re
-from difflib import get_close_matches
 
-import cv2
 import discord
-import numpy as np
 from discord.ext import commands
-from pytesseract import pytesseract
 
 import sql
 import utils
+from ocr import MAX_IMAGES, OcrBusy
 
 
 class ParseLog:
@@ -46,11 +40,8 @@ class ParseLog:
         await self.msg.add_reaction("📝")
         await self.msg.add_reaction("🗑️")
 
-        def check(payload):
-            return payload.user_id == self.author.id and payload.message_id == self.msg.id and (str(payload.emoji) == "📝" or str(payload.emoji) == '🗑️')
-
         try:
-            payload = await self.client.wait_for('raw_reaction_add', check=check, timeout=7000)  # Wait
+            payload = await self.client.router.wait_for_reaction(self.msg.id, self.author.id, ["📝", "🗑️"], timeout=7000)  # Wait
         except asyncio.TimeoutError:
             if self.author.id in self.client.raid_db[self.guild.id]['leaders']:
                 self.client.raid_db[self.guild.id]['leaders'].remove(self.author.id)
@@ -107,17 +98,15 @@ class ParseLog:
 
 
         embed = discord.Embed(title=f"Member Completion: {self.author.display_name}", description="Please send a screenshot containing **only** the /who of members which "
-                                    "completed the raid.\n\nIf you don't have a screenshot and a raider cannot take one either - send `SKIP`")
+                                    "completed the raid. If the list is too long for one screenshot, attach up to "
+                                    f"{MAX_IMAGES} in the same message.\n\nIf you don't have a screenshot and a raider cannot take one either - send `SKIP`")
         await self.msg.clear_reactions()
         await self.msg.edit(embed=embed)
 
-        def member_check(m):
-            return m.author == self.author and m.channel == self.channel
-
         members = []
         while True:
             try:
-                msg = await self.client.wait_for('message', timeout=7200, check=member_check)
+                msg = await self.client.router.wait_for_message(self.channel.id, self.author.id, timeout=7200)
             except asyncio.TimeoutError:
                 if self.author.id in self.client.raid_db[self.guild.id]['leaders']:
                     self.client.raid_db[self.guild.id]['leaders'].remove(self.author.id)
@@ -133,19 +122,26 @@ class ParseLog:
                 if not msg.attachments:
                     await self.channel.send("Please attach an image containing only the result of the /who command!", delete_after=10)
                     continue
-                if len(msg.attachments) > 1:
-                    await self.channel.send("Please only attach 1 image.", delete_after=10)
+                if len(msg.attachments) > MAX_IMAGES:
+                    await self.channel.send(f"Please only attach up to {MAX_IMAGES} images.", delete_after=10)
                     continue
-                attachment = msg.attachments[0]
-                if not ".jpg" in attachment.filename and not ".png" in attachment.filename:
-                    await self.channel.send("Please only attach an image of type 'png' or 'jpg'.", delete_after=10)
+                if any(".jpg" not in a.filename and ".png" not in a.filename for a in msg.attachments):
+                    await self.channel.send("Please only attach images of type 'png' or 'jpg'.", delete_after=10)
+                    continue
+                images = [await a.read() for a in msg.attachments]
+                cleaned_members = who_candidates(self.all_members)
+                ahead = f" ({self.client.ocr.pending} ahead of you)" if self.client.ocr.pending else ""
+                pmsg = await self.channel.send(f"Parsing image{ahead}. This may take a minute...")
+                try:
+                    result = await self.client.ocr.parse(images, cleaned_members.keys(), lower=True)
+                except OcrBusy:
+                    await pmsg.delete()
+                    await self.channel.send("Too many images are being parsed right now, please try again in a minute.", delete_after=10)
+                    await msg.delete()
                     continue
-                image = io.BytesIO()
-                await attachment.save(image, seek_begin=True)
-                pmsg = await self.channel.send("Parsing image. This may take a minute...")
-                members = await self.client.loop.run_in_executor(None, functools.partial(parse_image, image, self.all_members))
-                print('done parsing image')
                 await pmsg.delete()
+                # A member's main and alt names can both be in the /who, only count them once
+                members = list({m.id: m for m in (cleaned_members[match] for _, match in result.matches if match is not None)}.values())
                 if not members:
                     embed = discord.Embed(title="Error!", description="Could not find the /who command in the image you provided.\nPlease send a new message"
                                                                       "with an image that shows the results of `/who`. If you don't have a better image, say `SKIP`.",
@@ -162,11 +158,8 @@ class ParseLog:
         await self.msg.add_reaction("✅")
         await self.msg.add_reaction("❌")
 
-        def check(payload):
-            return payload.user_id == self.author.id and payload.message_id == self.msg.id and (str(payload.emoji) == "✅" or str(payload.emoji) == "❌")
-
         try:
-            payload = await self.client.wait_for('raw_reaction_add', timeout=7200, check=check)  # Wait 1 hr max
+            payload = await self.client.router.wait_for_reaction(self.msg.id, self.author.id, ["✅", "❌"], timeout=7200)  # Wait 1 hr max
         except asyncio.TimeoutError:
             if self.author.id in self.client.raid_db[self.guild.id]['leaders']:
                 self.client.raid_db[self.guild.id]['leaders'].remove(self.author.id)
@@ -175,35 +168,27 @@ class ParseLog:
             return await self.msg.edit(embed=embed)
 
         col = sql.log_cols.srunled if str(payload.emoji) == "✅" else sql.log_cols.frunled
-        await sql.log_runs(self.client.pool, self.guild.id, self.author.id, col, 1)
+        runlogs = [(self.author.id, col, 1)]
         self.confirmedLogs.append(("Run Successful", str(payload.emoji)))
 
-        embed = discord.Embed(title="Logging...", description="Please wait while the run is logged in the database. "
-                                                              "This can take up to a minute at full run capacity.", color=discord.Color.orange())
+        embed = discord.Embed(title="Logging...", description="Please wait while the run is logged in the database.", color=discord.Color.orange())
         embed.set_thumbnail(url="https://i.imgur.com/nLRgnZf.gif")
         await self.msg.clear_reactions()
         await self.msg.edit(content=None, embed=embed)
 
-        print(members)
         for m in members:
-            print(m)
             if m.top_role >= self.rlrole:
-                print('logging rl')
-                await sql.log_runs(self.client.pool, self.guild.id, m.id, sql.log_cols.runsassisted, 1)
-            await sql.log_runs(self.client.pool, self.guild.id, m.id, sql.log_cols.ocompletes, 1)
-
-        print('done logging 1')
+                runlogs.append((m.id, sql.log_cols.runsassisted, 1))
+            runlogs.append((m.id, sql.log_cols.ocompletes, 1))
 
         attempted = 0
-        print(self.all_members)
-        attempted_members = [m for m in self.all_members if m not in members]
-        print(attempted_members)
-        if attempted_members:
-            for m in attempted_members:
-                attempted += 1
-                await sql.log_runs(self.client.pool, self.guild.id, m.id, sql.log_cols.oattempts, 1)
-
-        print('done logging 2')
+        completed = {m.id for m in members}
+        attempted_members = [m for m in self.all_members if m.id not in completed]
+        for m in attempted_members:
+            attempted += 1
+            runlogs.append((m.id, sql.log_cols.oattempts, 1))
+
+        await sql.log_runs_batch(self.client.pool, self.guild.id, runlogs)
         desc = "Log Status:\n"
         for r in self.confirmedLogs:
             desc += r[0] + " - " + str(r[1]) + "\n"
@@ -235,11 +220,8 @@ class ParseLog:
         emojis.append("❌")
         asyncio.get_event_loop().create_task(self.add_emojis(self.msg, emojis))
 
-        def check(payload):
-            return payload.user_id == self.author.id and payload.message_id == self.msg.id and str(payload.emoji) in emojis
-
         try:
-            payload = await self.client.wait_for('raw_reaction_add', timeout=7000, check=check)  # Wait ~2 hr max
+            payload = await self.client.router.wait_for_reaction(self.msg.id, self.author.id, emojis, timeout=7000)  # Wait ~2 hr max
         except asyncio.TimeoutError:
             if self.author.id in self.client.raid_db[self.guild.id]['leaders']:
                 self.client.raid_db[self.guild.id]['leaders'].remove(self.author.id)
@@ -259,12 +241,9 @@ class ParseLog:
             self.otheremebed.title = f"Log Other member {self.author.display_name} for {emoji}"
             await self.msg.edit(embed=self.otheremebed)
 
-            def member_check(m):
-                return m.author == self.author and m.channel == self.channel
-
             while True:
                 try:
-                    msg = await self.client.wait_for('message', timeout=7200, check=member_check)
+                    msg = await self.client.router.wait_for_message(self.channel.id, self.author.id, timeout=7200)
                 except asyncio.TimeoutError:
                     if self.author.id in self.client.raid_db[self.guild.id]['leaders']:
                         self.client.raid_db[self.guild.id]['leaders'].remove(self.author.id)
@@ -301,76 +280,14 @@ class ParseLog:
 
     async def add_emojis(self, msg, emojis):
         for e in emojis:
-            await msg.add_reaction(e)
-
-
-def parse_image(image, member_list):
-    file_bytes = np.asarray(bytearray(image.read()), dtype=np.uint8)
-    img = cv2.imdecode(file_bytes, cv2.IMREAD_COLOR)
-    width = img.shape[:2][1]
-    factor = 700 / width
-    img = cv2.resize(img, None, fx=factor, fy=factor, interpolation=cv2.INTER_CUBIC)
-    hsv = cv2.cvtColor(img, cv2.COLOR_BGR2HSV)
-
-    # define range of yellow color in HSV
-    lower = np.array([27, 130, 180])
-    upper = np.array([31, 255, 255])
-    # Threshold the HSV image to get only yellow colors
-    mask = cv2.inRange(hsv, lower, upper)
-    # cv2.imwrite("mask.jpg", mask)
-    # invert the mask to get yellow letters on white background
-    res = cv2.bitwise_not(mask)
-    # cv2.imwrite("res.jpg", res)
-    kernel = np.ones((2, 2), np.uint8)
-    res = cv2.erode(res, kernel, iterations=1)
-    blur = cv2.GaussianBlur(res, (3, 3), 0)
-
-    str = pytesseract.image_to_string(blur, lang='eng')
-    str = str.replace("\n", " ")
-    str = str.replace("}", ")")
-    str = str.replace("{", "(")
-    str = str.replace(";", ":")
-    split_str = re.split(r'(.*)(Players online \([0-9]+\): )', str)
-    if len(split_str) < 4:
-        print("ERROR - Parsed String: " + str)
-        print("INFO - Split String: ")
-        print(split_str)
-        return []
-
-    print("INFO - Split String: ")
-    print(split_str)
-
-    names = split_str[3].split(", ")
-    cleaned_members = {}
-    def clean_member(m):
-        if " | " in m:
-            names = m.split(" | ")
-            for i, name in enumerate(names):
-                    cleaned_members[clean_name(name)] = m
-        else:
-            cleaned_members[clean_name(m)] = m
+            await self.client.dispatcher.cosmetic(msg.add_reaction(e))
 
-    def clean_name(n):
-        return "".join(c for c in n if c.isalpha()).lower()
 
+def who_candidates(member_list):
+    """Map of cleaned, lowercased names (every name in `Name | Alt` nicknames) to the member"""
+    cleaned_members = {}
     for m in member_list:
         if not m.bot:
-            clean_member(m.display_name)
-
-    print('done cleaning member names')
-
-    completed = []
-    for name in names:
-        if " " in name:
-            names = name.split(" ")
-            name = names[0]
-        if name.strip().lower() not in cleaned_members:
-            matches = get_close_matches(name.strip().lower(), cleaned_members.keys(), n=1, cutoff=0.6)
-            if len(matches) != 0:
-                if matches[0] in cleaned_members:
-                    completed.append(cleaned_members[matches[0]])
-        else:
-            completed.append(cleaned_members[name.strip().lower()])
-
-
-    return completed
+            for name in m.display_name.split(" | "):
+                cleaned_members["".join(c for c in name if c.isalpha()).lower()] = m
+    return cleaned_members
@@ -34,6 +34,8 @@ class QAfk:
         self.raiderids.add(ctx.author.id)
         self.nitroboosters = []
         self.patreons = []
+        self.early_loc = None
+        self.class_counts = {}
         self.last_edited = datetime.utcnow()
         self.awaiting_confirmations = set()
 
@@ -108,7 +110,7 @@ class QAfk:
 
         class_embed = discord.Embed(description="Please react below to indicate what class you are bringing to the run!")
         self.class_message = await self.hcchannel.send(embed=class_embed)
-        asyncio.get_event_loop().create_task(self.add_emojis(self.class_message, self.class_emojis))
+        asyncio.get_event_loop().create_task(self.seed_classes())
 
         # Create Raid VC
         overwrites = self.category.overwrites
@@ -147,6 +149,7 @@ class QAfk:
 
         self.client.raid_db[self.ctx.guild.id]['afk'][self.raid_msg.id] = self
         self.client.raid_db[self.ctx.guild.id]['cp'][self.cp_msg.id] = self
+        self.client.raid_db[self.ctx.guild.id]['classes'][self.class_message.id] = self
 
         self.update_task = asyncio.get_event_loop().create_task(self.update_embeds())
 
@@ -159,48 +162,39 @@ class QAfk:
 
     async def dequeue(self):
         print('in dequeue')
+        await self.reconcile_classes()
+        self.client.raid_db[self.ctx.guild.id]['classes'].pop(self.class_message.id, None)
         await self.class_message.delete()
-        task = asyncio.get_event_loop().create_task(self.move_members())
         await self.raid_msg.clear_reactions()
-        while not task.done():
-            num = len(self.raid_vc.members)
-            capacity_bar = utils.textProgressBar(num, self.max_members, prefix="", percent_suffix=" Moved", suffix="", decimals=0, length=13)
+        await self.move_members()
+        await self.end_afk()
+
+
+    async def move_members(self):
+        print('moving members')
+        queue = self.client.queues[self.queuechannel.id]
+        capacity = self.max_members - len(self.raid_vc.members)
+        # Priority members first (in confirmation order), then confirmed raiders by queue position. The whole order is
+        # passed on so members who left voice or fail to move are backfilled from further down the queue.
+        ordered = [m for id, m in self.confirmed_priority.items() if id in queue]
+        ordered += [self.confirmed_raiders[id] for id in queue.head(eligible=lambda id: id in self.confirmed_raiders
+                                                                    and id not in self.confirmed_priority)]
+
+        async for progress in self.client.dispatcher.move(ordered, self.raid_vc, capacity):
+            if progress.ok:
+                self.raiderids.add(progress.member.id)
+                self.client.active_raiders[progress.member.id] = self.raid_vc.id
+            capacity_bar = utils.textProgressBar(len(progress.moved), max(progress.total, 1), prefix="", percent_suffix=" Moved", suffix="", decimals=0,
+                                                 length=13)
             embed = discord.Embed(title="Moving Members...", description=capacity_bar, color=discord.Color.orange())
-            await self.raid_msg.edit(embed=embed)
+            await self.client.editor.edit(self.raid_msg, embed=embed)
             nvc = len(self.raid_vc.members)
             n_capacity_bar = utils.textProgressBar(nvc, self.max_members, prefix="", percent_suffix=" Full", suffix="", decimals=0, length=13)
             info_str = f"Moving Members...\n\n**{nvc}** Slots Filled in VC\n{n_capacity_bar}"
+            if progress.failed:
+                info_str += f"\n**{len(progress.failed)}** moves failed"
             self.cp_embed.set_field_at(4, name="Info:", value=info_str)
-            await self.cp_msg.edit(embed=self.cp_embed)
-            await asyncio.sleep(1.5)
-
-        await self.end_afk()
-
-
-    async def move_members(self):
-        print('moving priority')
-        for id in self.confirmed_priority:
-            if len(self.raid_vc.members) >= self.max_members:
-                break
-            if id in self.client.queues[self.queuechannel.id]:
-                member = self.confirmed_priority[id]
-                if member.voice:
-                    await member.move_to(self.raid_vc)
-                    if member.id not in self.raiderids:
-                        self.raiderids.add(member.id)
-                    self.client.active_raiders[member.id] = self.raid_vc.id
-
-        print('moving confirmed')
-        for id in self.confirmed_raiders:
-            if len(self.raid_vc.members) >= self.max_members:
-                break
-            if id in self.client.queues[self.queuechannel.id]:
-                member = self.confirmed_raiders[id]
-                if member.voice:
-                    await member.move_to(self.raid_vc)
-                    if member.id not in self.raiderids:
-                        self.raiderids.add(member.id)
-                    self.client.active_raiders[member.id] = self.raid_vc.id
+            await self.client.editor.edit(self.cp_msg, embed=self.cp_embed)
         print('done moving')
 
 
@@ -215,62 +209,45 @@ class QAfk:
         embed.set_thumbnail(url=self.dungeon_boss_image)
         embed.set_author(name=f"{self.dungeontitle} Raid is currently runnning!", icon_url=self.dungeon_image)
 
-        classes = ""
-        for c in self.class_emojis[:3]:
-            num = next((r.count for r in self.class_message.reactions if str(r.emoji) == c), 0)
-            bar = utils.textProgressBar(num, self.max_members, prefix="", percent_suffix=" Full", suffix="", decimals=0, length=10, fullisred=False)
-            classes += f"{c} - {bar}\n"
-        embed.add_field(name="Class Reactions (1):", value=classes, inline=False)
-        classes = ""
-        for c in self.class_emojis[3:]:
-            num = next((r.count for r in self.class_message.reactions if str(r.emoji) == c), 0)
-            bar = utils.textProgressBar(num, self.max_members, prefix="", percent_suffix=" Full", suffix="", decimals=0, length=10, fullisred=True)
-            classes += f"{c} - {bar}\n"
-        embed.add_field(name="Class Reactions (2):", value=classes, inline=False)
+        embed.add_field(name="Class Reactions (1):", value=self.class_bars(self.class_emojis[:3], " Full", False), inline=False)
+        embed.add_field(name="Class Reactions (2):", value=self.class_bars(self.class_emojis[3:], " Full", True), inline=False)
         embed.set_footer(text="Raid Started ")
         embed.timestamp = datetime.utcnow()
 
-        await self.raid_msg.edit(content="", embed=embed)
+        await self.client.editor.edit(self.raid_msg, content="", embed=embed, urgent=True)
 
         del self.client.raid_db[self.ctx.guild.id]['afk'][self.raid_msg.id]
 
         # Update cp with class info
         self.cp_embed.description += "\n\nPlease go to location ASAP & wait for bot to tell you when to call!"
         self.cp_embed.set_field_at(1, name="Run Location:", value=self.location)
-        await self.cp_msg.edit(embed=self.cp_embed)
+        await self.client.editor.edit(self.cp_msg, embed=self.cp_embed, urgent=True)
 
         print("before update cp")
 
 
         print('dming members')
         # DM MEMBERS
-        for i in self.required_items:
-            for m in self.required_items[i]['confirmed']:
-                await m.send(f"The location is: {self.location}.\nYou have 15 seconds before location is called for everyone.")
-
-        for m in self.patreons:
-            await m.send(f"The location is: {self.location}.\nYou have 15 seconds before location is called for everyone.")
-
-        for m in self.nitroboosters:
-            await m.send(f"The location is: {self.location}.\nYou have 15 seconds before location is called for everyone.")
-
-
+        early = [m for i in self.required_items for m in self.required_items[i]['confirmed']] + list(self.patreons) + list(self.nitroboosters)
+        self.early_loc = await self.client.dispatcher.fan_out(early, f"The location is: {self.location}.\nYou have 15 seconds before location is called for "
+                                                                     f"everyone.")
         print('print done sending dms')
 
-        self.cp_embed.description += "\nLocation has been sent to all members with required items."
-        await self.cp_msg.edit(embed=self.cp_embed)
+        # Early location window starts once delivery is done
+        self.cp_embed.description += f"\nLocation has been sent to members with required items. {self.early_loc.summary()}"
+        await self.client.editor.edit(self.cp_msg, embed=self.cp_embed, urgent=True)
         await asyncio.sleep(15)
 
 
-        await self.ctx.author.send(f"CALL NOW: `{self.location}`\n{self.ctx.author.mention}")
+        await self.client.dispatcher.critical(self.ctx.author.send(f"CALL NOW: `{self.location}`\n{self.ctx.author.mention}"))
         self.cp_embed.description = f"QAFK [**Control Panel**]({self.raid_msg.jump_url}) for **{self.dungeontitle}** | Started by {self.ctx.author.mention}\n\n" \
                                     "__**CALL LOCATION NOW!**__"
-        await self.cp_msg.edit(embed=self.cp_embed)
+        await self.client.editor.edit(self.cp_msg, embed=self.cp_embed, urgent=True)
         await asyncio.sleep(5)
 
         self.cp_embed.description = f"QAFK [**Control Panel**]({self.raid_msg.jump_url}) for **{self.dungeontitle}** | Started by {self.ctx.author.mention}\n\n" \
                                     "Press the 🔓 emoji to unlock the raid vc.\nPress the 📤 button when you are done with the run."
-        await self.cp_msg.edit(embed=self.cp_embed)
+        await self.client.editor.edit(self.cp_msg, embed=self.cp_embed, urgent=True)
         await self.cp_msg.add_reaction('🔓')
         await self.cp_msg.add_reaction('<:gray:736515579103543336>')
         await self.cp_msg.add_reaction('📤')
@@ -300,7 +277,7 @@ class QAfk:
 
         self.cp_embed.description = f"QAFK [**Control Panel**]({self.raid_msg.jump_url}) for **{self.dungeontitle}** | Started by {self.ctx.author.mention}\n\n" \
                                     "\nPress the 📤 button when you are done with the run."
-        await self.cp_msg.edit(embed=self.cp_embed)
+        await self.client.editor.edit(self.cp_msg, embed=self.cp_embed, urgent=True)
 
 
 
@@ -323,7 +300,7 @@ class QAfk:
         await self.cp_msg.clear_reactions()
         self.cp_embed.description = f"QAFK [**Control Panel**]({self.raid_msg.jump_url}) for **{self.dungeontitle}** | Started by {self.ctx.author.mention}\n\n" \
                                     "\nThe run has completed. Thank you for leading."
-        await self.cp_msg.edit(embed=self.cp_embed)
+        await self.client.editor.edit(self.cp_msg, embed=self.cp_embed, urgent=True)
 
         voice = discord.utils.get(self.client.voice_clients, guild=self.ctx.guild)
 
@@ -355,18 +332,19 @@ class QAfk:
         for r in self.raiderids:
             self.client.active_raiders.pop(r, None)
 
+        self.client.raid_db[self.ctx.guild.id]['classes'].pop(self.class_message.id, None)
         await self.class_message.delete()
 
         await self.raid_msg.clear_reactions()
         await self.raid_msg.unpin()
         embed = embeds.aborted_afk(self.dungeontitle, ended_by, self.dungeon_boss_image)
-        await self.raid_msg.edit(content="", embed=embed)
+        await self.client.editor.edit(self.raid_msg, content="", embed=embed, urgent=True)
 
         self.cp_embed.remove_field(len(self.cp_embed.fields) - 1)
         self.cp_embed.description = f"**AFK Check Aborted by** {ended_by.mention}"
         self.cp_embed.set_footer(text="AFK Check Aborted at ")
         self.cp_embed.timestamp = datetime.utcnow()
-        await self.cp_msg.edit(embed=self.cp_embed)
+        await self.client.editor.edit(self.cp_msg, embed=self.cp_embed, urgent=True)
         await self.cp_msg.clear_reactions()
 
         await self.raid_vc.delete(reason="Afk Check Aborted!")
@@ -455,11 +433,8 @@ class QAfk:
                             f"this & not bringing to the run it is a suspendable offense.**")
             await msg.add_reaction(emoji)
 
-            def check(react, usr):
-                return not usr.bot and react.message.id == msg.id and str(react.emoji) == emoji
-
             try:
-                await self.client.wait_for('reaction_add', timeout=15, check=check)
+                await self.client.router.wait_for_reaction(msg.id, member.id, [emoji], timeout=15)
             except asyncio.TimeoutError:
                 if member.id in self.awaiting_confirmations:
                     self.awaiting_confirmations.remove(member.id)
@@ -503,8 +478,9 @@ class QAfk:
             self.required_items[emoji]['confirmed'].append(member)
             if len(self.required_items[emoji]['confirmed']) >= self.required_items[emoji]['max']:
                 await self.raid_msg.clear_reaction(emoji)
-            await member.send(f"The Meetup Location for this run is:\n ***{self.meetup}**\nPlease get to the location and trade `{self.ctx.author.display_name}` if you are "
-                              f"bringing an item. If you are bringing a class, don't trade the RL.")
+            await self.client.dispatcher.critical(member.send(f"The Meetup Location for this run is:\n ***{self.meetup}**\nPlease get to the location and trade "
+                                                              f"`{self.ctx.author.display_name}` if you are bringing an item. If you are bringing a class, "
+                                                              f"don't trade the RL."))
 
         await self.update_start_embed(update_msg=True)
         await self.update_cp_embed(update_msg=True)
@@ -513,7 +489,7 @@ class QAfk:
         print(reason)
         if member.id in self.awaiting_confirmations:
             self.awaiting_confirmations.remove(member.id)
-        await member.move_to(self.raid_vc, reason=reason)
+        await self.client.dispatcher.critical(member.move_to(self.raid_vc, reason=reason))
         if member.id in self.confirmed_priority:
             del self.confirmed_priority[member.id]
         elif member.id in self.confirmed_raiders:
@@ -552,7 +528,7 @@ class QAfk:
         self.raid_start_embed.set_footer(text=f"{nvc}/{self.max_members} Slots Filled | Queue Started at ")
 
         if update_msg:
-            await self.raid_msg.edit(embed=self.raid_start_embed)
+            await self.client.editor.edit(self.raid_msg, embed=self.raid_start_embed)
 
 
     # Update Control Panel Embed
@@ -577,28 +553,42 @@ class QAfk:
                    "Start the AFK once you have confirmed enough reactions.\nReact to the 📥 emoji to start, 🛑 to abort."
         self.cp_embed.set_field_at(4, name="Info:", value=info_str, inline=False)
 
-        self.class_message = await self.hcchannel.fetch_message(self.class_message.id)
-        classes = ""
-        for c in self.class_emojis[:3]:
-            num = next((r.count for r in self.class_message.reactions if str(r.emoji) == c), 1)-1
-            bar = utils.textProgressBar(num, self.max_members, prefix="", percent_suffix=" ", suffix="", decimals=0, length=10, fullisred=False)
-            classes += f"{c} - {bar}\n"
-        self.cp_embed.set_field_at(5, name="Class Reactions (1):", value=classes, inline=False)
+        self.cp_embed.set_field_at(5, name="Class Reactions (1):", value=self.class_bars(self.class_emojis[:3], " ", False), inline=False)
+        self.cp_embed.set_field_at(6, name="Class Reactions (2):", value=self.class_bars(self.class_emojis[3:], " ", False), inline=False)
+
+        if update_msg:
+            await self.client.editor.edit(self.cp_msg, embed=self.cp_embed)
+
+
+
+    # Class reaction tallies, kept up to date from raw reaction events instead of refetching the message
+    def class_bars(self, emojis, percent_suffix, fullisred):
         classes = ""
-        for c in self.class_emojis[3:]:
-            num = next((r.count for r in self.class_message.reactions if str(r.emoji) == c), 1)-1
-            bar = utils.textProgressBar(num, self.max_members, prefix="", percent_suffix=" ", suffix="", decimals=0, length=10, fullisred=False)
+        for c in emojis:
+            bar = utils.textProgressBar(self.class_counts.get(c, 0), self.max_members, prefix="", percent_suffix=percent_suffix, suffix="", decimals=0,
+                                        length=10, fullisred=fullisred)
             classes += f"{c} - {bar}\n"
-        self.cp_embed.set_field_at(6, name="Class Reactions (2):", value=classes, inline=False)
+        return classes
 
-        if update_msg:
-            await self.cp_msg.edit(embed=self.cp_embed)
+    async def class_reaction_handler(self, payload, added):
+        emote = str(payload.emoji)
+        if emote in self.class_emojis:
+            self.class_counts[emote] = max(self.class_counts.get(emote, 0) + (1 if added else -1), 0)
 
+    async def seed_classes(self):
+        await self.add_emojis(self.class_message, self.class_emojis)
+        await self.reconcile_classes()
 
+    async def reconcile_classes(self):
+        try:
+            msg = await self.hcchannel.fetch_message(self.class_message.id)
+        except discord.NotFound:
+            return
+        self.class_counts = {str(r.emoji): r.count - (1 if r.me else 0) for r in msg.reactions if str(r.emoji) in self.class_emojis}
 
     async def add_emojis(self, msg, emojis):
         for e in emojis:
-            await msg.add_reaction(e)
+            await self.client.dispatcher.cosmetic(msg.add_reaction(e))
 
 
 
@@ -3,7 +3,6 @@ import bisect
 import io
 import json
 from datetime import datetime
-from difflib import get_close_matches
 
 import discord
 import matplotlib
@@ -12,6 +11,16 @@ from matplotlib.patches import Circle
 
 import embeds
 import utils
+from fuzzy import FuzzyIndex
+
+
+EVENT_TYPES = {'ava': 'Avatar of the Forgotten King', 'avatar': 'Avatar of the Forgotten King', 'cube': 'Cube God',
+               'cubegod': 'Cube God', 'gship': 'Ghost Ship', 'sphinx': 'Grand Sphinx', 'hermit': 'Hermit God', 'herm': 'Hermit God',
+               'lotll': 'Lord of the Lost Lands', 'lord': 'Lord of the Lost Lands', 'pent': 'Pentaract', 'penta': 'Pentaract',
+               'drag': 'Rock Dragon', 'rock': 'Rock Dragon', 'skull': 'Skull Shrine', 'shrine': 'Skull Shrine',
+               'skullshrine': 'Skull Shrine', 'miner': 'Dwarf Miner', 'dwarf': 'Dwarf Miner', 'sentry': 'Lost Sentry',
+               'nest': 'Killer Bee Nest', 'statues': 'Jade and Garnet Statues'}
+EVENT_INDEX = FuzzyIndex(EVENT_TYPES)
 
 
 class RealmClear:
@@ -59,17 +68,14 @@ class RealmClear:
         for r in self.numbers:
             await self.setup_msg.add_reaction(r)
 
-        def world_check(reaction, user):
-            return user == self.ctx.author and reaction.message.id == self.setup_msg.id and str(reaction.emoji) in self.numbers
-
         try:
-            reaction, user = await self.client.wait_for('reaction_add', timeout=60, check=world_check)
+            payload = await self.client.router.wait_for_reaction(self.setup_msg.id, self.ctx.author.id, self.numbers, timeout=60)
         except asyncio.TimeoutError:
             mapembed = discord.Embed(title="Timed out!", description="You didn't choose a world in time!", color=discord.Color.red())
             await self.setup_msg.clear_reactions()
             return await self.setup_msg.edit(embed=mapembed)
 
-        self.world_num = self.numbers.index(str(reaction.emoji))+1
+        self.world_num = self.numbers.index(str(payload.emoji))+1
         self.world_data = self.world_data[f"world_{self.world_num}.png"]
 
         await self.setup_msg.delete()
@@ -274,16 +280,11 @@ class RealmClear:
         await self.cpmsg.edit(embed=embed)
 
     def event_type(self, run_type):
-        event_types = {'ava': 'Avatar of the Forgotten King', 'avatar': 'Avatar of the Forgotten King', 'cube': 'Cube God',
-                       'cubegod': 'Cube God', 'gship': 'Ghost Ship', 'sphinx': 'Grand Sphinx', 'hermit': 'Hermit God', 'herm': 'Hermit God',
-                       'lotll': 'Lord of the Lost Lands', 'lord': 'Lord of the Lost Lands', 'pent': 'Pentaract', 'penta': 'Pentaract',
-                       'drag': 'Rock Dragon', 'rock': 'Rock Dragon', 'skull': 'Skull Shrine', 'shrine': 'Skull Shrine',
-                       'skullshrine': 'Skull Shrine', 'miner': 'Dwarf Miner', 'dwarf': 'Dwarf Miner', 'sentry': 'Lost Sentry',
-                       'nest': 'Killer Bee Nest', 'statues': 'Jade and Garnet Statues'}
-        result = event_types.get(run_type, None)
+        result = EVENT_TYPES.get(run_type, None)
         if result is None:
-            matches = get_close_matches(run_type, event_types.keys(), n=1, cutoff=0.8)
-            if len(matches) == 0:
+            match = EVENT_INDEX.best(run_type, cutoff=0.8)
+            if match is None:
                 return None
-            return event_types.get(matches[0]), True, matches[0]
-        return result, False
\ No newline at end of file
+            return EVENT_TYPES.get(match), True, match
+        return result, False
+
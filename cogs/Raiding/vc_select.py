@@ -111,12 +111,8 @@ class VCSelect:
             return await self.ctx.send("You need to use this command in a proper bot-commands channel!", delete_after=5)
 
 
-        def location_check(react, usr):
-            return usr == self.ctx.author and react.message.id == self.setup_msg.id and react.emoji in ['1️⃣', '2️⃣', '3️⃣', '4️⃣']
-
-
         try:
-            reaction, user = await self.client.wait_for('reaction_add', timeout=60, check=location_check)
+            payload = await self.client.router.wait_for_reaction(self.setup_msg.id, self.ctx.author.id, ['1️⃣', '2️⃣', '3️⃣', '4️⃣'], timeout=60)
         except asyncio.TimeoutError:
             try:
                 embed = discord.Embed(title="Timed out!", description="You didn't choose a channel in time!", color=discord.Color.red())
@@ -129,15 +125,15 @@ class VCSelect:
             if self.inraiding:
                 self.raiderrole = self.guild_db.get(sql.gld_cols.raiderroleid)
                 self.rlrole = self.guild_db.get(sql.gld_cols.rlroleid)
-                if reaction.emoji == "1️⃣":
+                if str(payload.emoji) == "1️⃣":
                     self.raidnum = 0
                     self.hcchannel = self.guild_db.get(sql.gld_cols.raidhc1)
                     self.vcchannel = self.guild_db.get(sql.gld_cols.raidvc1)
-                elif reaction.emoji == "2️⃣":
+                elif str(payload.emoji) == "2️⃣":
                     self.raidnum = 1
                     self.hcchannel = self.guild_db.get(sql.gld_cols.raidhc2)
                     self.vcchannel = self.guild_db.get(sql.gld_cols.raidvc2)
-                elif reaction.emoji == "3️⃣":
+                elif str(payload.emoji) == "3️⃣":
                     self.raidnum = 2
                     self.hcchannel = self.guild_db.get(sql.gld_cols.raidhc3)
                     self.vcchannel = self.guild_db.get(sql.gld_cols.raidvc3)
@@ -148,15 +144,15 @@ class VCSelect:
             elif self.invet:
                 self.raiderrole = self.guild_db.get(sql.gld_cols.vetroleid)
                 self.rlrole = self.guild_db.get(sql.gld_cols.vetrlroleid)
-                if reaction.emoji == "1️⃣":
+                if str(payload.emoji) == "1️⃣":
                     self.raidnum = 0
                     self.hcchannel = self.guild_db.get(sql.gld_cols.vethc1)
                     self.vcchannel = self.guild_db.get(sql.gld_cols.vetvc1)
-                elif reaction.emoji == "2️⃣":
+                elif str(payload.emoji) == "2️⃣":
                     self.raidnum = 1
                     self.hcchannel = self.guild_db.get(sql.gld_cols.vethc2)
                     self.vcchannel = self.guild_db.get(sql.gld_cols.vetvc2)
-                elif reaction.emoji == "3️⃣":
+                elif str(payload.emoji) == "3️⃣":
                     self.raidnum = 2
                     self.hcchannel = self.guild_db.get(sql.gld_cols.vethc3)
                     self.vcchannel = self.guild_db.get(sql.gld_cols.vetvc3)
@@ -168,15 +164,15 @@ class VCSelect:
                 self.raiderrole = self.guild_db.get(sql.gld_cols.eventraiderroleid) if self.guild_db.get(sql.gld_cols.eventraiderroleid) else\
                     self.guild_db.get(sql.gld_cols.raiderroleid)
                 self.rlrole = self.guild_db.get(sql.gld_cols.eventrlid)
-                if reaction.emoji == "1️⃣":
+                if str(payload.emoji) == "1️⃣":
                     self.raidnum = 0
                     self.hcchannel = self.guild_db.get(sql.gld_cols.eventhc1)
                     self.vcchannel = self.guild_db.get(sql.gld_cols.eventvc1)
-                elif reaction.emoji == "2️⃣":
+                elif str(payload.emoji) == "2️⃣":
                     self.raidnum = 1
                     self.hcchannel = self.guild_db.get(sql.gld_cols.eventhc2)
                     self.vcchannel = self.guild_db.get(sql.gld_cols.eventvc2)
-                elif reaction.emoji == "3️⃣":
+                elif str(payload.emoji) == "3️⃣":
                     self.raidnum = 2
                     self.hcchannel = self.guild_db.get(sql.gld_cols.eventhc3)
                     self.vcchannel = self.guild_db.get(sql.gld_cols.eventvc3)
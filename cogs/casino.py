@@ -185,14 +185,9 @@ class Casino(commands.Cog):
             raise commands.BadArgument('You cannot pay yourself or bots!')
         if amount <= 0:
             return await ctx.send("Please specify a number larger than 0.")
-        data = await sql.get_casino_player(self.client.pool, ctx.author.id)
-        balance1 = data[sql.casino_cols.balance]
-        if balance1 < amount:
+        paid, balance1, _ = await sql.transfer(self.client.pool, ctx.guild.id, ctx.author.id, member.id, amount)
+        if not paid:
             return await ctx.send(f"You don't have enough credits! Available balance: {balance1:,}")
-        data = await sql.get_casino_player(self.client.pool, member.id)
-        balance2 = data[sql.casino_cols.balance]
-        await sql.change_balance(self.client.pool, ctx.guild.id, ctx.author.id, balance1-amount)
-        await sql.change_balance(self.client.pool, ctx.guild.id, member.id, balance2 + amount)
         embed = discord.Embed(title=":money_with_wings:",color=discord.Color.green())
         embed.add_field(name=f"{ctx.author.display_name} -> {member.display_name}",
                         value=f"Payment of **{amount:,}** credits sent to {member.mention}.")
@@ -223,17 +218,24 @@ class Casino(commands.Cog):
         p1_bal = p1_data[sql.casino_cols.balance]
         if p1_bal < 0:
             return await ctx.send(f"You're in debt and can't steal! Current balance: **{p1_bal:,}** credits.", delete_after=10)
-        p2_data = await sql.get_casino_player(self.client.pool, member.id)
-        if not p2_data:
-            return await ctx.send(f"{member.mention} Hasn't played the casino yet!")
-        p2_bal = p2_data[sql.casino_cols.balance]
-        if p2_bal < 1000:
+        num = 0
+
+        def steal_amount(p2_bal, p1_bal):
+            # Worked out on the locked balances, so a game finishing mid-steal can't skew it
+            nonlocal num
+            if p1_bal < 0 or p2_bal < 1000:
+                return None
+            amount = int((p2_bal+p1_bal)*0.1)
+            num = random.randint((-amount), amount)
+            num = -2000 if num < -2000 else int(p2_bal/2) if num > int(p2_bal/2) else num
+            return num
+
+        stolen, p2_bal, p1_bal = await sql.transfer(self.client.pool, ctx.guild.id, member.id, ctx.author.id, steal_amount,
+                                                    check_funds=False)
+        if not stolen:
+            if p1_bal < 0:
+                return await ctx.send(f"You're in debt and can't steal! Current balance: **{p1_bal:,}** credits.", delete_after=10)
             return await ctx.send(f"{member.mention} is too poor to be stolen from! Their bank account has **{p2_bal:,}** credits in it.")
-        amount = int((p2_bal+p1_bal)*0.1)
-        num = random.randint((-amount), amount)
-        num = -2000 if num < -2000 else int(p2_bal/2) if num > int(p2_bal/2) else num
-        await sql.change_balance(self.client.pool, ctx.guild.id, ctx.author.id, (p1_bal+num))
-        await sql.change_balance(self.client.pool, ctx.guild.id, member.id, (p2_bal - num))
         await sql.update_cooldown(self.client.pool, ctx.author.id, sql.casino_cols.stealcooldown)
         embed = discord.Embed().set_author(name=ctx.author.display_name, icon_url=ctx.author.avatar_url)
         if num < 0:
@@ -241,15 +243,15 @@ class Casino(commands.Cog):
             embed.add_field(name="Steal", value=f"{ctx.author.mention} tried to steal from {member.mention} but was caught!\n"
                                                 f"{ctx.author.display_name} was fined **{num:,}** credits – which"
                                                 f" were sent to {member.display_name}", inline=False)\
-                .add_field(name="Balances", value=f"{ctx.author.mention}: **{(p1_bal+num):,}** credits\n"
-                                                  f"{member.mention}: **{(p2_bal-num):,}** credits", inline=False)
+                .add_field(name="Balances", value=f"{ctx.author.mention}: **{p1_bal:,}** credits\n"
+                                                  f"{member.mention}: **{p2_bal:,}** credits", inline=False)
             await self.steal_caught(ctx, embed, member)
         else:
             embed.color = discord.Color.green()
             embed.add_field(name="Steal", value=f"{ctx.author.mention} stole **{num:,}** credits from {member.mention}!\n"
                                                 f"Are you going to let them get away with that?!", inline=False)\
-                .add_field(name="Balances", value=f"{ctx.author.mention}: **{(p1_bal+num):,}** credits\n"
-                                                  f"{member.mention}: **{(p2_bal-num):,}** credits", inline=False)
+                .add_field(name="Balances", value=f"{ctx.author.mention}: **{p1_bal:,}** credits\n"
+                                                  f"{member.mention}: **{p2_bal:,}** credits", inline=False)
             await ctx.send(content=member.mention, embed=embed)
 
     async def steal_caught(self, ctx, embed, member):
@@ -258,7 +260,7 @@ class Casino(commands.Cog):
         while i < 6:
             i += 1
             embed.color = discord.Color.red() if i %2 == 0 else discord.Color.blue()
-            await msg.edit(embed=embed)
+            await self.client.dispatcher.cosmetic(msg.edit(embed=embed))
             await asyncio.sleep(1)
 
     @commands.command(usage="top", description="Get the top 10 balances on this server.")
@@ -267,19 +269,12 @@ class Casino(commands.Cog):
             await ctx.message.delete()
         except discord.NotFound:
             pass
-        data = await sql.get_top_balances(self.client.pool, ctx.guild.id)
-        top = ""
-        for i, r in enumerate(data[1:]):
-            if r is None:
-                if int((i / 2)) + 1 != 10:
-                    top += f"#{int((i/2))+1}-10. No data."
-                else:
-                    top += "#10. No data."
-                break
-            if i % 2 == 0:
-                top += f"#{int((i/2))+1}. <@{r}> - "
-            else:
-                top += f"**{r:,}** credits.\n"
+        data = sql.casino_top.top(ctx.guild.id)
+        top = "".join(f"#{i+1}. <@{uid}> - **{bal:,}** credits.\n" for i, (uid, bal) in enumerate(data))
+        if len(data) < 9:
+            top += f"#{len(data)+1}-10. No data."
+        elif len(data) == 9:
+            top += "#10. No data."
         embed = discord.Embed(color=discord.Color.orange()).set_author(name=ctx.guild.name, icon_url=ctx.guild.icon_url)\
                             .add_field(name="Top 10 Balances", value=top)
         await ctx.send(embed=embed)
@@ -320,11 +315,8 @@ class Casino(commands.Cog):
             embed.add_field(name="You have already collected your daily credits!", value=f"Next in: {hours}:{minutes}:{seconds}")
             embed.set_footer(text="Use !cooldowns to check your cooldown timers.")
             return await ctx.send(embed=embed, delete_after=10)
-        if ctx.author.id in self.client.patreon_ids:
-            balance = data[sql.casino_cols.balance] + 20000
-        else:
-            balance = data[sql.casino_cols.balance] + 7500
-        await sql.change_balance(self.client.pool, ctx.guild.id, ctx.author.id, balance)
+        money = 20000 if ctx.author.id in self.client.patreon_ids else 7500
+        _, _, balance = await sql.transfer(self.client.pool, ctx.guild.id, None, ctx.author.id, money)
         await sql.update_cooldown(self.client.pool, ctx.author.id, sql.casino_cols.dailycooldown)
         embed.set_author(name=ctx.author.display_name, icon_url=ctx.author.avatar_url)
         embed.color = discord.Color.green()
@@ -348,8 +340,7 @@ class Casino(commands.Cog):
             return await ctx.send(embed=embed, delete_after=10)
         amounts = [500, 750, 800, 1000, 1200, 1300, 1400, 1500, 1700, 2000, 2500, 3000, 5000]
         money = random.choice(amounts)
-        balance = data[sql.casino_cols.balance] + money
-        await sql.change_balance(self.client.pool, ctx.guild.id, ctx.author.id, balance)
+        _, _, balance = await sql.transfer(self.client.pool, ctx.guild.id, None, ctx.author.id, money)
         await sql.update_cooldown(self.client.pool, ctx.author.id, sql.casino_cols.workcooldown)
         embed.set_author(name=ctx.author.display_name, icon_url=ctx.author.avatar_url)
         embed.add_field(name="Work",value=get_job(money),inline=False)
@@ -374,8 +365,7 @@ class Casino(commands.Cog):
             return await ctx.send(embed=embed, delete_after=10)
         amounts = [75, 80, 100, 120, 150, 175, 200, 250, 300, 350, 400]
         money = random.choice(amounts)
-        balance = data[sql.casino_cols.balance] + money
-        await sql.change_balance(self.client.pool, ctx.guild.id, ctx.author.id, balance)
+        _, _, balance = await sql.transfer(self.client.pool, ctx.guild.id, None, ctx.author.id, money)
         await sql.update_cooldown(self.client.pool, ctx.author.id, sql.casino_cols.searchcooldown)
         embed.set_author(name=ctx.author.display_name, icon_url=ctx.author.avatar_url)
         embed.add_field(name="Search", value=f"You found **{money:,}** credits just lying around!", inline=False)
@@ -119,10 +119,8 @@ class Core(commands.Cog):
 
         while True:
             imageb = None
-            def member_check(m):
-                return m.author.id == ctx.author.id and m.channel == msg.channel
             try:
-               issuemsg = await self.client.wait_for('message', timeout=1800, check=member_check)
+               issuemsg = await self.client.router.wait_for_message(msg.channel.id, ctx.author.id, timeout=1800)
             except asyncio.TimeoutError:
                 embed = discord.Embed(title="Timed out!", description="You didn't write your report in time!", color=discord.Color.red())
                 await msg.edit(embed=embed)
@@ -235,6 +233,7 @@ class Core(commands.Cog):
     @commands.Cog.listener()
     async def on_guild_join(self, guild):
         """Add prefix & entry in rotmg.guilds table on guild join"""
+        self.client.ign_index.build(guild)
         with open('data/prefixes.json', 'r') as file:
             prefixes = json.load(file)
         prefixes.update({guild.id: '!'})
@@ -402,8 +401,17 @@ class Core(commands.Cog):
             embed.add_field(name=cog.qualified_name + " Commands", value=cmds, inline=False)
         await ctx.send(embed=embed)
 
+    @commands.Cog.listener()
+    async def on_member_join(self, member):
+        self.client.ign_index.add(member)
+
+    @commands.Cog.listener()
+    async def on_member_remove(self, member):
+        self.client.ign_index.remove(member)
+
     @commands.Cog.listener()
     async def on_member_update(self, before, after):
+        self.client.ign_index.update(before, after)
         if after.guild.id == 660344559074541579:
             name = "".join([c for c in after.display_name if c.isalpha()])
             if self.client.patreon_role in after.roles and self.client.patreon_role not in before.roles:
@@ -471,45 +479,64 @@ class Core(commands.Cog):
         self.client.queues[channel_id].remove(member_id)
 
 
+    @commands.Cog.listener()
+    async def on_raw_reaction_remove(self, payload):
+        if payload.guild_id is None or payload.user_id == self.client.user.id:
+            return
+        raid_db = self.client.raid_db.get(payload.guild_id)
+        if raid_db and payload.message_id in raid_db['classes']:
+            await raid_db['classes'][payload.message_id].class_reaction_handler(payload, False)
+
+
     @commands.Cog.listener()
     async def on_raw_reaction_add(self, payload):
         if payload.user_id == self.client.user.id:
             return
 
-        user_data = await get_user(self.client.pool, payload.user_id)
-        user = self.client.get_user(payload.user_id)
-
         # check if reaction is in dm's or in guild
         if payload.guild_id is not None:
-            guild = self.client.get_guild(payload.guild_id)
-            guild_data = await get_guild(self.client.pool, guild.id)
-            verify_message_id = guild_data[gld_cols.verificationid]
-            subverify_1_msg_id = guild_data[gld_cols.subverify1id]
-            subverify_2_msg_id = guild_data[gld_cols.subverify2id]
-
-            if payload.message_id in self.client.raid_db[guild.id]['afk']:
-                afk = self.client.raid_db[guild.id]['afk'][payload.message_id]
-                await afk.reaction_handler(payload)
-            elif payload.message_id in self.client.raid_db[guild.id]['cp']:
-                afk = self.client.raid_db[guild.id]['cp'][payload.message_id]
-                await afk.cp_handler(payload)
-
-            elif payload.message_id == verify_message_id and str(payload.emoji) == '✅':  # handles verification reacts
-                blacklisted = await sql.get_blacklist(self.client.pool, user.id, payload.guild_id, 'verification')
-                if blacklisted:
-                    return await user.send("You have been blacklisted from verifying in this server! Contact a security+ if you believe this to be a mistake!")
-                return await guild_verify_react_handler(Verification(self.client), payload, user_data, guild_data, user, guild,
-                                                        verify_message_id)
-            elif payload.message_id == subverify_1_msg_id and (
-                    str(payload.emoji) == '✅' or str(payload.emoji) == '❌'):  # handles subverification 1
-                return await subverify_react_handler(Verification(self.client), payload, 1, guild_data, user, guild, subverify_1_msg_id)
-            elif payload.message_id == subverify_2_msg_id and (
-                    str(payload.emoji) == '✅' or str(payload.emoji) == '❌'):  # handles subverification 2
-                return await subverify_react_handler(Verification(self.client), payload, 2, guild_data, user, guild, subverify_2_msg_id)
-            elif payload.channel_id == guild_data[gld_cols.manualverifychannel]:  # handles manual verificaions
+            raid_db = self.client.raid_db.get(payload.guild_id)
+            if raid_db:
+                if payload.message_id in raid_db['afk']:
+                    afk = raid_db['afk'][payload.message_id]
+                    return await afk.reaction_handler(payload)
+                elif payload.message_id in raid_db['cp']:
+                    afk = raid_db['cp'][payload.message_id]
+                    return await afk.cp_handler(payload)
+                elif payload.message_id in raid_db['classes']:
+                    afk = raid_db['classes'][payload.message_id]
+                    return await afk.class_reaction_handler(payload, True)
+
+            # Only hit the DB once the reaction is known to target a verification message
+            target = self.client.reaction_index.get(payload.message_id)
+            if target and target[0] == payload.guild_id:
+                column = target[1]
+                if column == gld_cols.verificationid and str(payload.emoji) != '✅':
+                    return
+                if column != gld_cols.verificationid and str(payload.emoji) not in ['✅', '❌']:
+                    return
+                user = self.client.get_user(payload.user_id)
+                guild = self.client.get_guild(payload.guild_id)
+                guild_data = await get_guild(self.client.pool, guild.id)
+
+                if column == gld_cols.verificationid:  # handles verification reacts
+                    blacklisted = await sql.get_blacklist(self.client.pool, user.id, payload.guild_id, 'verification')
+                    if blacklisted:
+                        return await user.send("You have been blacklisted from verifying in this server! Contact a security+ if you believe this to be a mistake!")
+                    user_data = await get_user(self.client.pool, payload.user_id)
+                    return await guild_verify_react_handler(Verification(self.client), payload, user_data, guild_data, user, guild, payload.message_id)
+                elif column == gld_cols.subverify1id:  # handles subverification 1
+                    return await subverify_react_handler(Verification(self.client), payload, 1, guild_data, user, guild, payload.message_id)
+                else:  # handles subverification 2
+                    return await subverify_react_handler(Verification(self.client), payload, 2, guild_data, user, guild, payload.message_id)
+
+            guild_db = self.client.guild_db.get(payload.guild_id)
+            manualverifychannel = guild_db[gld_cols.manualverifychannel] if guild_db else None
+            if manualverifychannel and payload.channel_id == manualverifychannel.id:  # handles manual verificaions
                 if str(payload.emoji) in ['✅', '❌']:
-                    channel = guild.get_channel(payload.channel_id)
-                    msg = await channel.fetch_message(payload.message_id)
+                    user = self.client.get_user(payload.user_id)
+                    guild = self.client.get_guild(payload.guild_id)
+                    msg = await manualverifychannel.fetch_message(payload.message_id)
                     uid = msg.content.split(": ")[1]
                     if str(payload.emoji) == '✅':
                         return await moderation.manual_verify_ext(self.client.pool, guild, uid, user)
@@ -517,8 +544,10 @@ class Core(commands.Cog):
                         return await moderation.manual_verify_deny_ext(self.client.pool, guild, uid, user)
 
         elif str(payload.emoji) in ['✅', '👍', '❌']:  # handles verification DM reactions
+            user_data = await get_user(self.client.pool, payload.user_id)
             if user_data is not None:
                 if payload.message_id == user_data[usr_cols.verifyid]:
+                    user = self.client.get_user(payload.user_id)
                     return await dm_verify_react_handler(Verification(self.client), payload, user_data, user)
 
 
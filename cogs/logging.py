@@ -63,12 +63,10 @@ class Logging(commands.Cog):
         except discord.NotFound:
             pass
         r_msg = await ctx.send(embed=embeds.dungeon_select(manual_log=True))
-        def dungeon_check(m):
-            return m.author == ctx.author and m.channel == ctx.channel and m.content.isdigit()
 
         while True:
             try:
-                msg = await self.client.wait_for('message', timeout=60, check=dungeon_check)
+                msg = await self.client.router.wait_for_message(ctx.channel.id, ctx.author.id, timeout=60, check=lambda m: m.content.isdigit())
             except asyncio.TimeoutError:
                 embed = discord.Embed(title="Timed out!", description="You didn't choose a dungeon in time!", color=discord.Color.red())
                 await r_msg.clear_reactions()
@@ -122,71 +120,40 @@ async def update_leaderboard(client, guild_id):
     zerorunschannel = client.guild_db.get(guild_id)[sql.gld_cols.zerorunchannel]
     rlrole = client.guild_db.get(guild_id)[sql.gld_cols.rlroleid]
 
-    top_runs = await sql.get_top_10_logs(client.pool, guild_id, sql.log_cols.weeklyruns, False)
-    top_runs = clean_rl_data(top_runs, guild, rlrole)
-    top_assists = await sql.get_top_10_logs(client.pool, guild_id, sql.log_cols.weeklyassists, False)
-    top_assists = clean_rl_data(top_assists, guild, rlrole)
+    rl_ids = rl_member_ids(guild, rlrole)
+
+    top_runs = await sql.get_top_logs(client.pool, guild_id, sql.log_cols.weeklyruns, uids=rl_ids)
+    top_assists = await sql.get_top_logs(client.pool, guild_id, sql.log_cols.weeklyassists, uids=rl_ids)
     if guild_id != 660344559074541579:
-        top_keys = await sql.get_top_10_logs(client.pool, guild_id, sql.log_cols.pkey)
+        top_keys = await sql.get_top_logs(client.pool, guild_id, sql.log_cols.pkey)
     else:
-        helmrunes = await sql.get_top_10_logs(client.pool, guild_id, sql.log_cols.helmrunes)
-        swordrunes = await sql.get_top_10_logs(client.pool, guild_id, sql.log_cols.swordrunes)
-        shieldrunes = await sql.get_top_10_logs(client.pool, guild_id, sql.log_cols.shieldrunes)
-        top_runes = {}
-        for r in helmrunes:
-            top_runes[r[0]] = (r[0], r[sql.log_cols.helmrunes])
-        for r in swordrunes:
-            if r[0] in top_runes:
-                top_runes[r[0]] = (r[0], top_runes[r[0]][1]+r[sql.log_cols.swordrunes])
-            else:
-                top_runes[r[0]] = (r[0], r[sql.log_cols.swordrunes])
-        for r in shieldrunes:
-            if r[0] in top_runes:
-                top_runes[r[0]] = (r[0], top_runes[r[0]][1]+r[sql.log_cols.shieldrunes])
-            else:
-                top_runes[r[0]] = (r[0], r[sql.log_cols.shieldrunes])
-        ten_runes = list(top_runes.values())
-        def get_num(elem):
-            return elem[1]
-        ten_runes.sort(key=get_num, reverse=True)
-        ten_runes = ten_runes[:10]
-
-
+        ten_runes = await sql.get_top_runes(client.pool, guild_id)
 
     embed = discord.Embed(title="Top Runs Led This Week", color=discord.Color.gold())
-    embed.add_field(name="Runs Led:", value=format_top_data(top_runs, sql.log_cols.weeklyruns)).add_field(name="Runs Assisted:",
-                                                                                                          value=format_top_data(top_assists,
-                                                                                                                                sql.log_cols.weeklyassists))
+    embed.add_field(name="Runs Led:", value=format_top_data(top_runs, 1)).add_field(name="Runs Assisted:",
+                                                                                   value=format_top_data(top_assists, 1))
     await leaderboardchannel.send(embed=embed)
     if guild_id != 660344559074541579:
         embed = discord.Embed(title="Top Keys Popped", color=discord.Color.gold())
-        embed.add_field(name="Keys Popped:", value=format_top_data(top_keys, sql.log_cols.pkey))
+        embed.add_field(name="Keys Popped:", value=format_top_data(top_keys, 1))
     else:
         embed = discord.Embed(title="Top Runes Popped", color=discord.Color.gold())
         embed.add_field(name="Runes Popped:", value=format_top_data(ten_runes, 1))
     await leaderboardchannel.send(embed=embed)
 
-    zero_runs = await sql.get_0_runs(client.pool, guild_id)
-    zero_runs = clean_rl_data(zero_runs, guild, rlrole, False)
+    zero_runs = await sql.get_0_runs(client.pool, guild_id, rl_ids)
 
     if zero_runs:
-        desc = "".join("<@" + str(r[0]) + "> - (Assists: " + str(r[sql.log_cols.weeklyassists]) + ")\n" for r in zero_runs)
+        desc = "".join("<@" + str(r[0]) + "> - (Assists: " + str(r[1]) + ")\n" for r in zero_runs)
     else:
         desc = "All rl's completed at least 1 run this week."
     embed = discord.Embed(title="RL's With 0 Runs", description=desc, color=discord.Color.orange())
     await zerorunschannel.send(embed=embed)
             
 
-def clean_rl_data(data, guild, rlrole, truncate=True):
-    temp = []
-    for i, r in enumerate(data):
-        member = guild.get_member(r[0])
-        if member:
-            if member.top_role >= rlrole:
-                temp.append(r)
-    if truncate:
-        temp = temp[:10]
-    return temp
+def rl_member_ids(guild, rlrole):
+    """Ids of every member whose top role is at least the RL role"""
+    return {m.id for m in guild.members if m.top_role >= rlrole}
 
 
 def format_top_data(data, col):
@@ -31,11 +31,8 @@ class Mail(commands.Cog):
         embed = discord.Embed(title="Name", description="Please type the name of the modmail category.", color=discord.Color.gold())
         msg = await ctx.send(embed=embed)
 
-        def check(m):
-            return m.author.id == ctx.author.id and msg.channel.id == m.channel.id
-
         try:
-            namemsg = await self.client.wait_for('message', timeout=1800, check=check)
+            namemsg = await self.client.router.wait_for_message(msg.channel.id, ctx.author.id, timeout=1800)
         except asyncio.TimeoutError:
             embed = discord.Embed(title="Timed out!", description="You didn't choose a name in time!", color=discord.Color.red())
             await msg.delete()
@@ -57,11 +54,8 @@ class Mail(commands.Cog):
 
         await msg.add_reaction("✅")
 
-        def check(react, usr):
-            return usr.id == ctx.author.id and react.message.id == msg.id and str(react.emoji) in ["✅", "❌"]
-
         try:
-            reaction, user = await self.client.wait_for('reaction_add', timeout=1800, check=check)  # Wait 1/2 hr max
+            await self.client.router.wait_for_reaction(msg.id, ctx.author.id, ["✅", "❌"], timeout=1800)  # Wait 1/2 hr max
         except asyncio.TimeoutError:
             embed = discord.Embed(title="Timed out!", description="You didn't configure the category in time! Please configure the category as soon as you get a chance, "
                                                                   "then sync the log channel's permissions to the category.",
@@ -108,10 +102,8 @@ class Mail(commands.Cog):
             if not msg:
                 msg = await ctx.send(embed=msgembed)
 
-            def member_check(m):
-                return m.author.id == ctx.author.id and m.channel == ctx.channel
             try:
-                mailmsg = await self.client.wait_for('message', timeout=1800, check=member_check)
+                mailmsg = await self.client.router.wait_for_message(ctx.channel.id, ctx.author.id, timeout=1800)
             except asyncio.TimeoutError:
                 embed = discord.Embed(title="Timed out!", description="You didn't write your response in time!", color=discord.Color.red())
                 return await msg.edit(embed=embed)
@@ -170,11 +162,8 @@ class Mail(commands.Cog):
             await msg.add_reaction("✅")
             await msg.add_reaction("🔄")
 
-            def check(react, usr):
-                return usr.id == ctx.author.id and react.message.id == msg.id and str(react.emoji) in ["✅", "🔄"]
-
             try:
-                reaction, user = await self.client.wait_for('reaction_add', timeout=1800, check=check)  # Wait 1/2 hr max
+                payload = await self.client.router.wait_for_reaction(msg.id, ctx.author.id, ["✅", "🔄"], timeout=1800)  # Wait 1/2 hr max
             except asyncio.TimeoutError:
                 embed = discord.Embed(title="Timed out!", description="You didn't choose an option in time!",
                                       color=discord.Color.red())
@@ -182,7 +171,7 @@ class Mail(commands.Cog):
                 return await ctx.author.send(embed=embed)
 
             await msg.clear_reactions()
-            if str(reaction.emoji) == '✅':
+            if str(payload.emoji) == '✅':
                 break
             else:
                 await msg.edit(embed=msgembed)
@@ -193,11 +182,8 @@ class Mail(commands.Cog):
         await msg.add_reaction("✅")
         await msg.add_reaction("❌")
 
-        def check(react, usr):
-            return usr.id == ctx.author.id and react.message.id == msg.id and str(react.emoji) in ["✅", "❌"]
-
         try:
-            reaction, user = await self.client.wait_for('reaction_add', timeout=1800, check=check)  # Wait 1/2 hr max
+            payload = await self.client.router.wait_for_reaction(msg.id, ctx.author.id, ["✅", "❌"], timeout=1800)  # Wait 1/2 hr max
         except asyncio.TimeoutError:
             embed = discord.Embed(title="Timed out!", description="You didn't choose an option in time!",
                                   color=discord.Color.red())
@@ -205,7 +191,7 @@ class Mail(commands.Cog):
             return await ctx.author.send(embed=embed)
 
         await msg.clear_reactions()
-        if str(reaction.emoji) == '✅':
+        if str(payload.emoji) == '✅':
             anonymous = True
         else:
             anonymous = False
@@ -299,18 +285,16 @@ class ModmailMessage:
                 for e in self.numbers[:len(servers)]:
                     await msg.add_reaction(e)
 
-                def check(react, usr):
-                    return usr.id == self.ctx.author.id and react.message.id == msg.id and str(react.emoji) in self.numbers[:len(servers)]
-
                 try:
-                    reaction, user = await self.client.wait_for('reaction_add', timeout=1800, check=check)  # Wait 1/2 hr max
+                    payload = await self.client.router.wait_for_reaction(msg.id, self.ctx.author.id, self.numbers[:len(servers)],
+                                                                         timeout=1800)  # Wait 1/2 hr max
                 except asyncio.TimeoutError:
                     embed = discord.Embed(title="Timed out!", description="You didn't choose a server in time!",
                                           color=discord.Color.red())
                     await msg.delete()
                     return await self.ctx.author.send(embed=embed)
 
-                server = servers[self.numbers.index(str(reaction.emoji))]
+                server = servers[self.numbers.index(str(payload.emoji))]
                 await msg.delete()
             else:
                 server = servers[0]
@@ -350,11 +334,8 @@ class ModmailMessage:
         await msg.add_reaction("✅")
         await msg.add_reaction("❌")
 
-        def check(react, usr):
-            return usr.id == self.ctx.author.id and react.message.id == msg.id and str(react.emoji) in ["✅", "❌"]
-
         try:
-            reaction, user = await self.client.wait_for('reaction_add', timeout=1800, check=check)  # Wait 1/2 hr max
+            payload = await self.client.router.wait_for_reaction(msg.id, self.ctx.author.id, ["✅", "❌"], timeout=1800)  # Wait 1/2 hr max
         except asyncio.TimeoutError:
             embed = discord.Embed(title="Timed out!", description="You didn't choose an option in time!",
                                   color=discord.Color.red())
@@ -363,19 +344,16 @@ class ModmailMessage:
 
         await msg.delete()
 
-        if str(reaction.emoji) == '✅':
+        if str(payload.emoji) == '✅':
             embed = discord.Embed(title="Please choose a member.", description="To select a member, use one of these formats:\n1. ROTMG IGN\n2.Discord ID\n3. Discord tag & "
                                                                                "descriminator (ex: Darkmatter#7321).", colour=discord.Color.gold())
             msg = await self.ctx.author.send(embed=embed)
 
             converter = utils.MemberLookupConverter()
 
-            def member_check(m):
-                return m.author.id == self.ctx.author.id and m.channel == dmchannel
-
             while True:
                 try:
-                    membermsg = await self.client.wait_for('message', timeout=1800, check=member_check)
+                    membermsg = await self.client.router.wait_for_message(dmchannel.id, self.ctx.author.id, timeout=1800)
                 except asyncio.TimeoutError:
                     embed = discord.Embed(title="Timed out!", description="You didn't choose a member in time!", color=discord.Color.red())
                     await msg.delete()
@@ -401,10 +379,8 @@ class ModmailMessage:
         while True:
             images = []
             txt_file = None
-            def member_check(m):
-                return m.author.id == self.ctx.author.id and m.channel == dmchannel
             try:
-                mailmsg = await self.client.wait_for('message', timeout=1800, check=member_check)
+                mailmsg = await self.client.router.wait_for_message(dmchannel.id, self.ctx.author.id, timeout=1800)
             except asyncio.TimeoutError:
                 embed = discord.Embed(title="Timed out!", description="You didn't write your modmail in time!", color=discord.Color.red())
                 await msg.delete()
@@ -454,18 +430,15 @@ class ModmailMessage:
             await msg.add_reaction("✅")
             await msg.add_reaction("🔄")
 
-            def check(react, usr):
-                return usr.id == self.ctx.author.id and react.message.id == msg.id and str(react.emoji) in ["✅", "🔄"]
-
             try:
-                reaction, user = await self.client.wait_for('reaction_add', timeout=1800, check=check)  # Wait 1/2 hr max
+                payload = await self.client.router.wait_for_reaction(msg.id, self.ctx.author.id, ["✅", "🔄"], timeout=1800)  # Wait 1/2 hr max
             except asyncio.TimeoutError:
                 embed = discord.Embed(title="Timed out!", description="You didn't choose an option in time!",
                                       color=discord.Color.red())
                 await msg.delete()
                 return await self.ctx.author.send(embed=embed)
 
-            if str(reaction.emoji) == '✅':
+            if str(payload.emoji) == '✅':
                 break
             else:
                 await msg.delete()
@@ -147,7 +147,7 @@ class Moderation(commands.Cog):
                                 color=discord.Color.green())
         return await ctx.send(embed=embed)
 
-    @commands.command(usage='addalt <member> <altname>', description="Add an alternate account to a user (limit 2).")
+    @commands.command(usage='addalt <member> <altname>', description=f"Add an alternate account to a user (limit {sql.max_alts}).")
     @commands.guild_only()
     @checks.is_security_or_higher_check()
     async def addalt(self, ctx, member: utils.MemberLookupConverter, altname):
@@ -167,7 +167,8 @@ class Moderation(commands.Cog):
         cleaned_name = str(data["player"])
         res = await sql.add_alt_name(self.client.pool, member.id, cleaned_name)
         if not res:
-            embed = discord.Embed(title="Error!", description="The user specified already has 2 alts added!", color=discord.Color.red())
+            embed = discord.Embed(title="Error!", description=f"The user specified already has {sql.max_alts} alts added, or `{cleaned_name}` "
+                                                              "is linked to another account!", color=discord.Color.red())
             return await ctx.send(embed=embed)
 
         name = member.display_name
@@ -139,11 +139,8 @@ class Patreon(commands.Cog):
         while True:
             imageb = None
 
-            def member_check(m):
-                return m.author.id == ctx.author.id and m.channel == msg.channel
-
             try:
-                issuemsg = await self.client.wait_for('message', timeout=1800, check=member_check)
+                issuemsg = await self.client.router.wait_for_message(msg.channel.id, ctx.author.id, timeout=1800)
             except asyncio.TimeoutError:
                 embed = discord.Embed(title="Timed out!", description="You didn't write your report in time!", color=discord.Color.red())
                 await msg.edit(embed=embed)
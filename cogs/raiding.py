@@ -1,14 +1,6 @@
-import functools
-import io
-import re
-from difflib import get_close_matches
-
-import cv2
 import discord
-import numpy as np
 from discord.ext import commands
 from discord.ext.commands import BucketType
-from pytesseract import pytesseract
 
 import checks
 import sql
@@ -19,6 +11,7 @@ from cogs.Raiding.headcount import Headcount
 from cogs.Raiding.queue_afk import QAfk
 from cogs.Raiding.realmclear import RealmClear
 from cogs.Raiding.vc_select import VCSelect
+from ocr import MAX_IMAGES, OcrBusy
 
 
 class Raiding(commands.Cog):
@@ -65,8 +58,8 @@ class Raiding(commands.Cog):
 
         index = None
         for id in self.client.queues:
-            if ctx.author.id in self.client.queues[id]:
-                index = self.client.queues[id].index(ctx.author.id)+1
+            index = self.client.queues[id].position(ctx.author.id)
+            if index:
                 channel_id = id
                 break
         if index:
@@ -108,20 +101,18 @@ class Raiding(commands.Cog):
         hc = Headcount(self.client, ctx, hcchannel, vcchannel, setup_msg, raidnum, inraiding, invet, inevents, raiderrole, rlrole)
         await hc.start()
 
-    @commands.command(usage="parse (Attach an image of /who list with this command)",
+    @commands.command(usage="parse (Attach up to 4 images of the /who list with this command)",
                       description="Parse through members in the run to find crashers.")
     @commands.guild_only()
     @checks.is_rl_or_higher_check()
     async def parse(self, ctx):
         if not ctx.message.attachments:
             return await ctx.send("Please attach an image containing only the result of the /who command!", delete_after=10)
-        if len(ctx.message.attachments) > 1:
-            return await ctx.send("Please only attach 1 image.", delete_after=10)
-        attachment = ctx.message.attachments[0]
-        if not ".jpg" in attachment.filename and not ".png" in attachment.filename:
-            return await ctx.send("Please only attach an image of type 'png' or 'jpg'.", delete_after=10)
-        image = io.BytesIO()
-        await attachment.save(image, seek_begin=True)
+        if len(ctx.message.attachments) > MAX_IMAGES:
+            return await ctx.send(f"Please only attach up to {MAX_IMAGES} images.", delete_after=10)
+        if any(".jpg" not in a.filename and ".png" not in a.filename for a in ctx.message.attachments):
+            return await ctx.send("Please only attach images of type 'png' or 'jpg'.", delete_after=10)
+        images = [await a.read() for a in ctx.message.attachments]
         if ctx.author.voice:
             vcchannel = ctx.author.voice.channel
         else:
@@ -132,10 +123,16 @@ class Raiding(commands.Cog):
             else:
                 return
             await setup_msg.delete()
-        msg = await ctx.send("Parsing image. This may take a minute...")
-        embed = await self.client.loop.run_in_executor(None, functools.partial(parse_image, ctx.author, image, vcchannel))
+        cleaned_members, alts = who_candidates(vcchannel)
+        ahead = f" ({self.client.ocr.pending} ahead of you)" if self.client.ocr.pending else ""
+        msg = await ctx.send(f"Parsing image{ahead}. This may take a minute...")
+        try:
+            result = await self.client.ocr.parse(images, cleaned_members, consume=True)
+        except OcrBusy:
+            await msg.delete()
+            return await ctx.send("Too many images are being parsed right now, please try again in a minute.", delete_after=10)
         await msg.delete()
-        await ctx.send(embed=embed)
+        await ctx.send(embed=parse_embed(ctx.author, vcchannel, result, alts))
 
     @commands.command(usage='addrusher <name>', description="Adds the rusher role to someone.")
     @commands.guild_only()
@@ -213,14 +210,11 @@ class Raiding(commands.Cog):
 
             await vcchannel.set_permissions(raiderrole, connect=False, view_channel=True, speak=False)
 
-            for member in vcchannel.members:
-                if member.top_role < rlrole:
-                    if member.voice:
-                        await member.move_to(channel=None)
+            async for _ in self.client.dispatcher.move([m for m in vcchannel.members if m.top_role < rlrole], None):
+                pass
 
-        for member in vcchannel.members:
-            if member.voice:
-                await member.move_to(channel=None)
+        async for _ in self.client.dispatcher.move(vcchannel.members, None):
+            pass
 
         embed = discord.Embed(title="Done Cleaning!", description=f"{vcchannel.name} has been cleaned and locked.",
                               color=discord.Color.green())
@@ -323,90 +317,41 @@ class Raiding(commands.Cog):
 def setup(client):
     client.add_cog(Raiding(client))
 
-def parse_image(author, image, vc):
-    file_bytes = np.asarray(bytearray(image.read()), dtype=np.uint8)
-    img = cv2.imdecode(file_bytes, cv2.IMREAD_COLOR)
-    width = img.shape[:2][1]
-    factor = 700 / width
-    img = cv2.resize(img, None, fx=factor, fy=factor, interpolation=cv2.INTER_CUBIC)
-    hsv = cv2.cvtColor(img, cv2.COLOR_BGR2HSV)
-
-    # define range of yellow color in HSV
-    lower = np.array([27, 130, 180])
-    upper = np.array([31, 255, 255])
-    # Threshold the HSV image to get only yellow colors
-    mask = cv2.inRange(hsv, lower, upper)
-    # cv2.imwrite("mask.jpg", mask)
-    # invert the mask to get yellow letters on white background
-    res = cv2.bitwise_not(mask)
-    # cv2.imwrite("res.jpg", res)
-    kernel = np.ones((2, 2), np.uint8)
-    res = cv2.erode(res, kernel, iterations=1)
-    blur = cv2.GaussianBlur(res, (3, 3), 0)
-
-    str = pytesseract.image_to_string(blur, lang='eng')
-    str = str.replace("\n", " ")
-    str = str.replace("}", ")")
-    str = str.replace("{", "(")
-    str = str.replace(";", ":")
-    split_str = re.split(r'(.*)(Players online \([0-9]+\): )', str)
-    if len(split_str) < 4:
-        print("ERROR - Parsed String: " + str)
-        print("INFO - Split String: ")
-        print(split_str)
-        embed = discord.Embed(title="Error!", description="Could not find the who command in the image you provided.\nPlease re-run the "
-                            "command with an image that shows the results of `/who`.", color=discord.Color.red())
-        return embed
-    names = split_str[3].split(", ")
+def clean_name(n):
+    return "".join(c for c in n if c.isalpha())
+
+
+def who_candidates(vc):
+    """Cleaned names of the non-bot members in vc, split into main names and alts (for `Name | Alt` nicknames)"""
     cleaned_members = []
     alts = []
-    def clean_member(m):
-        if " | " in m:
-            names = m.split(" | ")
-            for i, name in enumerate(names):
-                if i == 0:
-                    cleaned_members.append(clean_name(name))
-                else:
-                    alts.append(clean_name(name))
-        else:
-            cleaned_members.append(clean_name(m))
-    def clean_name(n):
-        return "".join(c for c in n if c.isalpha())
-
     for m in vc.members:
-        if not m.bot:
-            clean_member(m.display_name)
-
-    crashing = []
-    possible_alts = []
-    fixed_names = []
+        if m.bot:
+            continue
+        for i, name in enumerate(m.display_name.split(" | ")):
+            (cleaned_members if i == 0 else alts).append(clean_name(name))
+    return cleaned_members, alts
+
+
+def parse_embed(author, vc, result, alts):
+    """Build the parse results embed from an ocr.WhoResult matched (with consume=True) against who_candidates(vc)"""
+    if result.names is None:
+        return discord.Embed(title="Error!", description="Could not find the who command in the image you provided.\nPlease re-run the "
+                             "command with an image that shows the results of `/who`.", color=discord.Color.red())
+    alts = set(alts)
     author = clean_name(author.display_name)
-    for name in names:
-        if " " in name:
-            names = name.split(" ")
-            name = names[0]
-        if name.strip() not in cleaned_members:
-            matches = get_close_matches(name.strip(), cleaned_members, n=1, cutoff=0.6)
-            if len(matches) == 0:
-                if name.strip() not in alts:
-                    crashing.append(name.strip())
-            else:
-                if matches[0] not in cleaned_members:
-                    fixed_names.append((name.strip(), matches[0]))
-                else:
-                    cleaned_members.remove(matches[0])
-        else:
-            cleaned_members.remove(name.strip())
-
-    for m in cleaned_members:
-        if m != author:
-            possible_alts.append(m)
+    crashing = [name for name, match in result.matches if match is None and name not in alts]
+    possible_alts = [m for m in result.leftover if m != author]
+    # Names OCR misread that were matched to a member anyway
+    fixed_names = [(name, match) for name, match in result.matches if match is not None and name != match]
 
     kicklist = "".join("`/kick " + m + "`\n" for m in crashing)
     if not kicklist:
         kicklist = "No members crashing!"
     if fixed_names:
-        fixedlist = "     Fixed Name | Original Parse".join("`/kick " + fixed + "` | (" + orig + ")\n" for (orig, fixed) in fixed_names)
+        fixedlist = "Fixed Name | Original Parse\n" + "".join("`/kick " + fixed + "` | (" + orig + ")\n" for (orig, fixed) in fixed_names)
+        if len(fixedlist) > 1024:
+            fixedlist = "Too many characters (>1024)!"
     if possible_alts:
         altlist = "".join("`" + name + "`\n" for name in possible_alts)
     if len(kicklist) > 2000:
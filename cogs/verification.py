@@ -7,7 +7,7 @@ import discord
 from discord.ext import commands
 
 import embeds
-from sql import get_guild, get_user, update_user, ign_exists, update_guild, add_new_user, usr_cols, gld_cols
+from sql import get_guild, get_user, update_user, ign_exists, update_guild, add_new_user, get_alts, set_ign_alias, usr_cols, gld_cols
 
 
 class Verification(commands.Cog):
@@ -143,7 +143,7 @@ class Verification(commands.Cog):
                         verified = True
                 if verified:
                     await complete_verification(self.client.pool, guild, guild_data, member, name, user_data, reverify,
-                                                user_data[usr_cols.alt1], user_data[usr_cols.alt2])
+                                                await get_alts(self.client.pool, user_id))
                     await channel.send(f"{member.mention} has completed verification.")
                 else:
                     embed = embeds.verification_bad_reqs(guild_data[gld_cols.reqsmsg], fame_passed, maxed_passed, stars_passed,
@@ -177,7 +177,7 @@ class Verification(commands.Cog):
             pass
 
         # Save verification message id for later to check reacts with
-        await update_guild(self.client.pool, ctx.guild.id, "verificationid", message.id)
+        await update_guild(self.client.pool, ctx.guild.id, "verificationid", message.id, self.client)
 
 
     @commands.command(usage="add_first_subverify", description="Add the first sub-verification message to channel.")
@@ -210,7 +210,7 @@ async def subverify_helper(self, ctx, n):
     await ctx.message.delete()
 
     # Save verification message id for later to check reacts with
-    await update_guild(self.client.pool, ctx.guild.id, f"subverify{n}id", message.id)
+    await update_guild(self.client.pool, ctx.guild.id, f"subverify{n}id", message.id, self.client)
 
 
 async def step_1_verify(pool, user, ign):
@@ -224,16 +224,10 @@ async def step_1_verify(pool, user, ign):
     await update_user(pool, user.id, "verifyid", msg.id)
 
 
-async def complete_verification(pool, guild, guild_data, member, name, user_data, reverify, alt1=None, alt2=None):
+async def complete_verification(pool, guild, guild_data, member, name, user_data, reverify, alts=()):
     role = discord.utils.get(guild.roles, id=guild_data[gld_cols.verifiedroleid])
     tag = member.name
-    alts = ""
-    if alt1:
-        alts += f" | {alt1}"
-    if alt2:
-        alts += f" | {alt2}"
-
-    tag += alts
+    tag += "".join(f" | {alt}" for alt in alts)
     try:
         await member.add_roles(role)
         if tag.lower() == name.lower():
@@ -258,6 +252,7 @@ async def complete_verification(pool, guild, guild_data, member, name, user_data
     await update_user(pool, member.id, "verifiedguilds", ','.join(guilds))
     if not reverify:
         await update_user(pool, member.id, "ign", name)
+        await set_ign_alias(pool, member.id, name)
     await update_user(pool, member.id, "verifykey", None)
     await update_user(pool, member.id, "verifyid", None)
     await update_user(pool, member.id, "verifyguild", None)
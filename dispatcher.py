@@ -0,0 +1,201 @@
+import asyncio
+import time
+
+import discord
+
+
+CRITICAL = 0
+COSMETIC = 1
+
+
+class Lane:
+    """Queue and wait statistics for one priority level."""
+    __slots__ = ('name', 'priority', 'queue', 'active', 'completed', 'total_wait', 'max_wait')
+
+    def __init__(self, name, priority):
+        self.name = name
+        self.priority = priority
+        self.queue = asyncio.Queue()
+        self.active = 0
+        self.completed = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+
+    @property
+    def depth(self):
+        return self.queue.qsize()
+
+    @property
+    def busy(self):
+        return self.active > 0 or not self.queue.empty()
+
+    @property
+    def avg_wait(self):
+        return self.total_wait / self.completed if self.completed else 0.0
+
+    def stats(self):
+        return {'depth': self.depth, 'active': self.active, 'completed': self.completed,
+                'avg_wait': round(self.avg_wait, 3), 'max_wait': round(self.max_wait, 3)}
+
+
+class FanOutResult:
+    """Who a fan-out reached and who it didn't (member -> reason)."""
+    __slots__ = ('delivered', 'failed', 'elapsed')
+
+    def __init__(self):
+        self.delivered = []
+        self.failed = {}
+        self.elapsed = 0.0
+
+    def summary(self):
+        s = f"Delivered to **{len(self.delivered)}/{len(self.delivered) + len(self.failed)}** members."
+        if self.failed:
+            s += " Failed: " + ", ".join(f"{m.mention} ({r})" for m, r in self.failed.items())
+        return s
+
+
+class MoveProgress:
+    """Progress event yielded by ActionDispatcher.move after every finished voice move."""
+    __slots__ = ('member', 'ok', 'moved', 'failed', 'total')
+
+    def __init__(self, member, ok, moved, failed, total):
+        self.member = member
+        self.ok = ok
+        self.moved = moved
+        self.failed = failed
+        self.total = total
+
+    @property
+    def done(self):
+        return len(self.moved) >= self.total
+
+
+class ActionDispatcher:
+    """Runs Discord REST actions in priority lanes so raid-critical calls never queue behind cosmetic ones.
+
+    Every lane has its own workers. A lane only starts new work while every higher priority lane is idle, so voice
+    moves, location DMs and permission changes preempt reaction seeding, embed flashing and other cosmetic traffic
+    that shares the same rate limit budget."""
+
+    def __init__(self, client, workers=None):
+        self.client = client
+        self.lanes = {CRITICAL: Lane('critical', CRITICAL), COSMETIC: Lane('cosmetic', COSMETIC)}
+        self.workers = workers or {CRITICAL: 5, COSMETIC: 2}
+        self.idle = {p: asyncio.Event() for p in self.lanes}
+        for e in self.idle.values():
+            e.set()
+        self.tasks = []
+
+    def _start(self):
+        for priority, n in self.workers.items():
+            for _ in range(n):
+                self.tasks.append(self.client.loop.create_task(self._worker(self.lanes[priority])))
+
+    def submit(self, coro, lane=COSMETIC):
+        """Queue a coroutine on a lane and return a future for its result."""
+        if not self.tasks:
+            self._start()
+        future = self.client.loop.create_future()
+        self.idle[lane].clear()
+        self.lanes[lane].queue.put_nowait((coro, future, time.monotonic()))
+        return future
+
+    async def run(self, coro, lane=COSMETIC):
+        """Queue a coroutine on a lane and wait for it to finish, raising whatever it raises."""
+        return await self.submit(coro, lane)
+
+    async def critical(self, coro):
+        return await self.run(coro, CRITICAL)
+
+    async def cosmetic(self, coro):
+        return await self.run(coro, COSMETIC)
+
+    async def fan_out(self, members, content, deadline=10, lane=CRITICAL):
+        """DM content to every member concurrently (bounded by the lane's workers) and wait at most deadline seconds.
+
+        Duplicate members are only messaged once. Returns a FanOutResult; members whose DM didn't go through before
+        the deadline are recorded as timed out."""
+        start = time.monotonic()
+        result = FanOutResult()
+        futures = {}
+        for m in members:
+            if m.id not in futures:
+                futures[m.id] = (m, self.submit(m.send(content), lane))
+        if futures:
+            await asyncio.wait([f for _, f in futures.values()], timeout=deadline)
+        for m, f in futures.values():
+            if not f.done():
+                f.cancel()
+                result.failed[m] = "timed out"
+            elif f.cancelled():
+                result.failed[m] = "cancelled"
+            elif isinstance(f.exception(), discord.Forbidden):
+                result.failed[m] = "DMs closed"
+            elif f.exception():
+                result.failed[m] = "error"
+            else:
+                result.delivered.append(m)
+        result.elapsed = time.monotonic() - start
+        return result
+
+    async def move(self, members, channel, capacity=None, concurrency=5, lane=CRITICAL):
+        """Move members (in priority order) into channel, or disconnect them if channel is None.
+
+        At most capacity members are moved; if a move fails the next member in order takes its slot, so the cutoff
+        always respects the order given. Members that aren't connected to voice are skipped. Moves run concurrently,
+        up to concurrency at a time on the given lane, and a MoveProgress is yielded as each one finishes."""
+        connected = [m for m in members if m.voice]
+        candidates = iter(connected)
+        total = len(connected) if capacity is None else max(min(len(connected), capacity), 0)
+        moved, failed = [], []
+        inflight = {}
+
+        def refill():
+            while len(inflight) < concurrency and len(moved) + len(inflight) < total:
+                member = next(candidates, None)
+                if member is None:
+                    return
+                inflight[self.submit(member.move_to(channel), lane)] = member
+
+        refill()
+        while inflight:
+            finished, _ = await asyncio.wait(list(inflight), return_when=asyncio.FIRST_COMPLETED)
+            for f in finished:
+                member = inflight.pop(f)
+                ok = not f.cancelled() and f.exception() is None
+                (moved if ok else failed).append(member)
+                refill()
+                yield MoveProgress(member, ok, moved, failed, total)
+
+    def stats(self):
+        return {lane.name: lane.stats() for lane in self.lanes.values()}
+
+    async def _wait_for_higher(self, lane):
+        for p, other in self.lanes.items():
+            if p < lane.priority:
+                while other.busy:
+                    await self.idle[p].wait()
+
+    async def _worker(self, lane):
+        while True:
+            coro, future, queued = await lane.queue.get()
+            await self._wait_for_higher(lane)
+            lane.active += 1
+            waited = time.monotonic() - queued
+            lane.total_wait += waited
+            lane.max_wait = max(lane.max_wait, waited)
+            try:
+                if future.cancelled():
+                    coro.close()
+                else:
+                    result = await coro
+                    if not future.done():
+                        future.set_result(result)
+            except Exception as e:
+                if not future.done():
+                    future.set_exception(e)
+            finally:
+                lane.active -= 1
+                lane.completed += 1
+                if not lane.busy:
+                    self.idle[lane.priority].set()
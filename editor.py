@@ -0,0 +1,160 @@
+import asyncio
+from collections import OrderedDict
+
+import discord
+
+import dispatcher
+
+
+class _EditState:
+    """Pending and last-sent edit for a single message."""
+    __slots__ = ('message', 'interval', 'pending', 'last_sent', 'last_flush', 'task', 'future', 'lock')
+
+    def __init__(self, message, interval):
+        self.message = message
+        self.interval = interval
+        self.pending = None
+        self.last_sent = None
+        self.last_flush = 0.0
+        self.task = None
+        self.future = None
+        self.lock = asyncio.Lock()
+
+
+class EditScheduler:
+    """Coalesces message edits so hot embeds (afk checks, control panels, countdowns) don't burn the channel rate limit.
+
+    Only the latest pending content/embed per message is kept, edits that render the same as what was last sent are
+    dropped, and each message is flushed at most once every `interval` seconds. Urgent edits flush immediately and
+    replace anything still pending. Once a message is edited through the scheduler, all of its edits should be.
+
+    A flush sends whatever is pending when it actually runs, not when it was queued, and sends for one message never
+    overlap, so an older edit can't land after a newer one. Background flushes go through the cosmetic lane but are
+    promoted to the critical one after `max_delay` seconds, so progress doesn't freeze during long critical bursts."""
+
+    def __init__(self, client, interval=1.5, max_tracked=500, max_delay=5.0):
+        self.client = client
+        self.interval = interval
+        self.max_delay = max_delay
+        self.max_tracked = max_tracked
+        self.states = OrderedDict()
+        self.sent = 0
+        self.skipped = 0
+        self.coalesced = 0
+
+    @staticmethod
+    def _render(fields):
+        rendered = {}
+        if 'content' in fields:
+            rendered['content'] = fields['content']
+        if 'embed' in fields:
+            rendered['embed'] = fields['embed'].to_dict() if fields['embed'] else None
+        return rendered
+
+    def _state(self, message, interval):
+        state = self.states.get(message.id)
+        if state is None:
+            state = _EditState(message, self.interval if interval is None else interval)
+            self.states[message.id] = state
+            while len(self.states) > self.max_tracked:
+                mid, old = next(iter(self.states.items()))
+                if old.task:
+                    old.task.cancel()
+                del self.states[mid]
+        else:
+            state.message = message
+            if interval is not None:
+                state.interval = interval
+            self.states.move_to_end(message.id)
+        return state
+
+    async def edit(self, message, *, urgent=False, interval=None, **fields):
+        """Schedule message.edit(**fields). Non-urgent edits return immediately and are flushed in the background.
+
+        Only content and embed are supported. Urgent edits are sent before returning and raise like message.edit."""
+        state = self._state(message, interval)
+        if fields.get('embed'):
+            fields['embed'] = fields['embed'].copy()
+        rendered = self._render(fields)
+
+        if rendered == state.last_sent:
+            if state.pending is not None:
+                state.pending = None
+                self._cancel(state)
+            self.skipped += 1
+            return
+        if state.pending is not None:
+            self.coalesced += 1
+        state.pending = (fields, rendered)
+
+        if urgent:
+            self._cancel(state)
+            await self._flush(state)
+        elif state.task is None:
+            wait = max(state.interval - (self.client.loop.time() - state.last_flush), 0)
+            state.task = self.client.loop.create_task(self._flush_later(state, wait))
+
+    async def flush(self, message):
+        """Immediately send whatever is pending for message."""
+        state = self.states.get(message.id)
+        if state and state.pending is not None:
+            self._cancel(state)
+            await self._flush(state)
+
+    def forget(self, message):
+        """Drop any pending edit and stop tracking message."""
+        state = self.states.pop(message.id, None)
+        if state:
+            self._cancel(state)
+
+    @property
+    def pending(self):
+        return sum(1 for s in self.states.values() if s.pending is not None)
+
+    @staticmethod
+    def _cancel(state):
+        if state.task:
+            state.task.cancel()
+            state.task = None
+        if state.future and not state.future.done():
+            state.future.cancel()
+        state.future = None
+
+    async def _send(self, state):
+        async with state.lock:
+            if state.pending is None:
+                return
+            fields, rendered = state.pending
+            state.pending = None
+            await state.message.edit(**fields)
+            state.last_sent = rendered
+            self.sent += 1
+
+    async def _flush(self, state, lane=dispatcher.CRITICAL, timeout=None):
+        state.last_flush = self.client.loop.time()
+        future = self.client.dispatcher.submit(self._send(state), lane)
+        try:
+            if timeout is None:
+                await future
+                return
+            # Shielded so a timeout leaves the send queued, remember it so an urgent edit can drop it
+            state.future = future
+            try:
+                await asyncio.wait_for(asyncio.shield(future), timeout)
+            except asyncio.TimeoutError:
+                # Still queued behind critical work, cancel it and wait our turn there instead
+                future.cancel()
+                await self.client.dispatcher.submit(self._send(state), dispatcher.CRITICAL)
+        except discord.NotFound:
+            self.states.pop(state.message.id, None)
+
+    async def _flush_later(self, state, wait):
+        await asyncio.sleep(wait)
+        try:
+            await self._flush(state, dispatcher.COSMETIC, self.max_delay)
+        except discord.HTTPException as e:
+            print(f"Scheduled edit of message {state.message.id} failed: {e}")
+        state.task = None
+        # Edited again while the flush was in flight
+        if state.pending is not None and state.message.id in self.states:
+            state.task = self.client.loop.create_task(self._flush_later(state, state.interval))
@@ -0,0 +1,78 @@
+from collections import defaultdict
+from difflib import SequenceMatcher
+
+
+def ngrams(s, n=3):
+    """Padded character n-grams of s, so short names still produce a few grams"""
+    s = f"{' ' * (n - 1)}{s} "
+    return {s[i:i + n] for i in range(len(s) - n + 1)}
+
+
+class FuzzyIndex:
+    """Trigram index for top-1 fuzzy name matching.
+
+    A query only scores candidates that share at least one trigram with it and whose length could still reach the
+    cutoff. The best `limit` of those (by shared trigrams) are re-ranked with the same SequenceMatcher ratio that
+    difflib.get_close_matches uses, so results match difflib's cutoffs without comparing against every candidate.
+    See fuzzybench.py for a quality/speed comparison."""
+
+    def __init__(self, candidates=(), n=3, limit=20):
+        self.n = n
+        self.limit = limit
+        self.grams = defaultdict(set)
+        self.candidates = set()
+        for c in candidates:
+            self.add(c)
+
+    def __contains__(self, s):
+        return s in self.candidates
+
+    def __len__(self):
+        return len(self.candidates)
+
+    def add(self, s):
+        if s in self.candidates:
+            return
+        self.candidates.add(s)
+        for g in ngrams(s, self.n):
+            self.grams[g].add(s)
+
+    def remove(self, s):
+        if s not in self.candidates:
+            return
+        self.candidates.discard(s)
+        for g in ngrams(s, self.n):
+            bucket = self.grams.get(g)
+            if bucket is not None:
+                bucket.discard(s)
+                if not bucket:
+                    del self.grams[g]
+
+    def best(self, query, cutoff=0.6):
+        """Closest candidate to query with a ratio >= cutoff, or None"""
+        if query in self.candidates:
+            return query
+        shared = defaultdict(int)
+        for g in ngrams(query, self.n):
+            for c in self.grams.get(g, ()):
+                shared[c] += 1
+        if not shared:
+            return None
+
+        qlen = len(query)
+        # ratio = 2*matches / total length, and matches can't exceed the shorter string
+        eligible = [c for c in shared if 2 * min(qlen, len(c)) >= cutoff * (qlen + len(c))]
+        eligible.sort(key=lambda c: shared[c], reverse=True)
+
+        matcher = SequenceMatcher()
+        matcher.set_seq2(query)
+        best, best_score = None, cutoff
+        for c in eligible[:self.limit]:
+            matcher.set_seq1(c)
+            if matcher.real_quick_ratio() < best_score or matcher.quick_ratio() < best_score:
+                continue
+            score = matcher.ratio()
+            # Same tie-break as get_close_matches: highest score, then the larger string
+            if score > best_score or (score == best_score and (best is None or c > best)):
+                best, best_score = c, score
+        return best
@@ -0,0 +1,59 @@
+# Compares fuzzy.FuzzyIndex against difflib.get_close_matches on synthetic /who lists with OCR-style noise.
+# Usage: python fuzzybench.py
+import random
+import string
+import time
+from difflib import get_close_matches
+
+from fuzzy import FuzzyIndex
+
+random.seed(1)
+# Common tesseract confusions on the /who font
+CONFUSIONS = {'l': 'i', 'i': 'l', 'o': 'a', 'e': 'c', 'n': 'm', 'm': 'n', 'u': 'v', 'h': 'b'}
+
+
+def random_name():
+    return "".join(random.choice(string.ascii_lowercase) for _ in range(random.randint(4, 10)))
+
+
+def ocr_noise(name):
+    chars = list(name)
+    for _ in range(random.choice([0, 1, 1, 2])):
+        i = random.randrange(len(chars))
+        op = random.random()
+        if op < 0.6:
+            chars[i] = CONFUSIONS.get(chars[i], random.choice(string.ascii_lowercase))
+        elif op < 0.8 and len(chars) > 3:
+            del chars[i]
+        else:
+            chars.insert(i, random.choice(string.ascii_lowercase))
+    return "".join(chars)
+
+
+def run(num_candidates, num_queries, cutoff):
+    candidates = list({random_name() for _ in range(num_candidates)})
+    truth = random.sample(candidates, min(num_queries, len(candidates)))
+    queries = [ocr_noise(t) for t in truth]
+
+    start = time.perf_counter()
+    expected = [(get_close_matches(q, candidates, n=1, cutoff=cutoff) or [None])[0] for q in queries]
+    t_difflib = time.perf_counter() - start
+
+    start = time.perf_counter()
+    index = FuzzyIndex(candidates)
+    t_build = time.perf_counter() - start
+    start = time.perf_counter()
+    got = [index.best(q, cutoff) for q in queries]
+    t_index = time.perf_counter() - start
+
+    agree = sum(e == g for e, g in zip(expected, got)) / len(queries)
+    d_correct = sum(e == t for e, t in zip(expected, truth)) / len(queries)
+    i_correct = sum(g == t for g, t in zip(got, truth)) / len(queries)
+    print(f"{len(candidates):>6} candidates x {len(queries):>3} queries (cutoff {cutoff}): "
+          f"difflib {t_difflib * 1000:8.1f}ms ({d_correct:.1%} correct) | "
+          f"index {t_index * 1000:6.1f}ms + {t_build * 1000:5.1f}ms build ({i_correct:.1%} correct) | "
+          f"agreement {agree:.1%} | speedup {t_difflib / max(t_index + t_build, 1e-9):.1f}x")
+
+
+for n, q, cutoff in [(80, 80, 0.6), (500, 80, 0.6), (5000, 80, 0.75), (20000, 80, 0.75), (26, 80, 0.8)]:
+    run(n, q, cutoff)
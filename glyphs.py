@@ -0,0 +1,198 @@
+import string
+
+import cv2
+import numpy as np
+
+# Template height and width. Glyphs are scaled by the line's x-height, not stretched to fit, so size and vertical
+# position (`.` vs `'`, `,` vs `-`) are part of the template.
+SIZE = (24, 16)
+# The cell spans this many x-heights above and below the baseline, enough for caps, ascenders and descenders
+ABOVE, BELOW = 1.8, 0.7
+# A gap wider than this many x-heights between two glyphs is a space
+SPACE = 0.55
+# Every character an IGN or the /who header can contain, an atlas has to have templates for all of them
+CHARSET = frozenset(string.ascii_letters + string.digits + "(),:")
+
+
+def yellow_mask(img):
+    """White where the BGR image has the /who list's yellow text"""
+    hsv = cv2.cvtColor(img, cv2.COLOR_BGR2HSV)
+    return cv2.inRange(hsv, np.array([27, 130, 180]), np.array([31, 255, 255]))
+
+
+def text_region(img, width=320):
+    """(x, y, w, h) of the /who text block in a BGR screenshot, or None if there's no yellow text.
+
+    Found on a copy downscaled to `width` pixels: glyphs, words and wrapped lines are smeared together into blobs and the
+    blob with the most yellow pixels wins, so the game world around the chat costs next to nothing."""
+    height, full = img.shape[:2]
+    factor = min(width / full, 1.0)
+    small = cv2.resize(img, None, fx=factor, fy=factor, interpolation=cv2.INTER_NEAREST)
+    mask = yellow_mask(small)
+    if not mask.any():
+        return None
+    blobs = cv2.dilate(mask, np.ones((5, 9), np.uint8))
+    n, labels, stats, _ = cv2.connectedComponentsWithStats(blobs, connectivity=8)
+    ink = np.bincount(labels[mask > 0], minlength=n)
+    x, y, w, h = stats[int(ink[1:].argmax()) + 1, :4]
+    # The dilation already pads the blob, map it back with a couple of small pixels more for rounding
+    margin = int(np.ceil(2 / factor))
+    x0, y0 = max(int(x / factor) - margin, 0), max(int(y / factor) - margin, 0)
+    x1, y1 = min(int((x + w) / factor) + margin, full), min(int((y + h) / factor) + margin, height)
+    return x0, y0, x1 - x0, y1 - y0
+
+
+def line_height(mask):
+    """Median height of the text lines in a mask, or None if it's empty"""
+    bands = _bands(mask)
+    return float(np.median([b - t for t, b in bands])) if bands else None
+
+
+def first_line(mask):
+    """(top, bottom) rows of the first text line in a mask, or None if it's empty"""
+    bands = _bands(mask)
+    return bands[0] if bands else None
+
+
+def _bands(mask):
+    """(top, bottom) row ranges of each text line"""
+    ink = np.flatnonzero(mask.any(axis=1))
+    if not len(ink):
+        return []
+    breaks = np.flatnonzero(np.diff(ink) > 1)
+    bands = list(zip(ink[np.r_[0, breaks + 1]], ink[np.r_[breaks, len(ink) - 1]] + 1))
+    # A band much shorter than the rest is stray dots/accents, fold it into the line below it
+    tallest = max(b - t for t, b in bands)
+    merged = []
+    for top, bottom in bands:
+        if merged and merged[-1][1] - merged[-1][0] < 0.4 * tallest:
+            top = merged.pop()[0]
+        merged.append((top, bottom))
+    return merged
+
+
+def segment(mask):
+    """Split a text mask into lines of glyph boxes.
+
+    Returns [(baseline, xheight, [(x, y, w, h), ...])] per line, boxes left to right. Connected components that overlap
+    horizontally (the dot of an i, the halves of a colon) are merged into one glyph."""
+    lines = []
+    for top, bottom in _bands(mask):
+        _, _, stats, _ = cv2.connectedComponentsWithStats(mask[top:bottom], connectivity=8)
+        comps = sorted((tuple(s[:4]) for s in stats[1:] if s[4] >= 3), key=lambda s: s[0])
+        if not comps:
+            continue
+        boxes = []
+        for x, y, w, h in comps:
+            if boxes:
+                px, py, pw, ph = boxes[-1]
+                if min(px + pw, x + w) - max(px, x) >= 0.5 * min(pw, w):
+                    nx, ny = min(px, x), min(py, y)
+                    boxes[-1] = (nx, ny, max(px + pw, x + w) - nx, max(py + ph, y + h) - ny)
+                    continue
+            boxes.append((x, y, w, h))
+        boxes = [(x, y + top, w, h) for x, y, w, h in boxes]
+        # Most glyphs sit on the baseline, and most of them are lowercase
+        bottoms = np.array([y + h for _, y, _, h in boxes])
+        heights = np.array([h for _, _, _, h in boxes])
+        baseline = int(np.median(bottoms))
+        tall = heights[heights > 0.5 * heights.max()]
+        xheight = max(float(np.percentile(tall, 25)), 1.0)
+        lines.append((baseline, xheight, boxes))
+    return lines
+
+
+def cells(mask, baseline, xheight, boxes):
+    """Cut every box out of the mask into a SIZE cell, as an (n, height * width) float32 array"""
+    height, width = SIZE
+    top = int(round(baseline - ABOVE * xheight))
+    span = (ABOVE + BELOW) * xheight
+    scale = height / span
+    out = np.zeros((len(boxes), height, width), np.float32)
+    bottom = int(round(top + span))
+    # Screenshots cropped tight to the text can cut into the cell, pad those lines back out
+    band = np.pad(mask[max(top, 0):bottom], ((max(-top, 0), max(bottom - mask.shape[0], 0)), (0, 0)))
+    for i, (x, _, w, _) in enumerate(boxes):
+        crop = band[:, x:x + w]
+        cw = min(max(int(round(w * scale)), 1), width)
+        cell = cv2.resize(crop, (cw, height), interpolation=cv2.INTER_AREA)
+        left = (width - cw) // 2
+        out[i, :, left:left + cw] = cell
+    return out.reshape(len(boxes), -1)
+
+
+def _normalize(v):
+    """Zero-mean, unit-length rows, so a dot product is normalized cross-correlation"""
+    v = v - v.mean(axis=1, keepdims=True)
+    return v / np.maximum(np.linalg.norm(v, axis=1, keepdims=True), 1e-6)
+
+
+class GlyphAtlas:
+    """Labelled glyph templates for the game's /who font, matched all at once with one matrix product.
+
+    Built from screenshots whose text is known (see ocrbench.py --build) and stored in data/glyphs.npz."""
+
+    def __init__(self, labels, templates):
+        # Grouped by label so every label's best template can be found with one reduceat
+        order = np.argsort(np.asarray(labels), kind='stable')
+        self.labels = np.asarray(labels)[order]
+        self.templates = _normalize(np.asarray(templates, np.float32)[order])
+        self.classes, self.starts = np.unique(self.labels, return_index=True)
+
+    @classmethod
+    def build(cls, samples):
+        """Atlas from [(BGR image, text)] samples. Each image's glyphs must line up one to one with its text, and
+        together the samples must cover CHARSET."""
+        labels, templates = [], []
+        for img, text in samples:
+            mask = yellow_mask(img)
+            lines = segment(mask)
+            chars = [c for c in text if not c.isspace()]
+            found = sum(len(boxes) for _, _, boxes in lines)
+            if found != len(chars):
+                raise ValueError(f"Found {found} glyphs but the text has {len(chars)} characters: {text!r}")
+            for baseline, xheight, boxes in lines:
+                templates.append(cells(mask, baseline, xheight, boxes))
+            labels.extend(chars)
+        atlas = cls(labels, np.concatenate(templates))
+        if atlas.missing():
+            raise ValueError(f"The samples have no {''.join(sorted(atlas.missing()))}, add screenshots that show them")
+        return atlas
+
+    @classmethod
+    def load(cls, path='data/glyphs.npz'):
+        with np.load(path) as f:
+            return cls(f['labels'], f['templates'])
+
+    def save(self, path='data/glyphs.npz'):
+        np.savez_compressed(path, labels=self.labels, templates=self.templates)
+
+    def __len__(self):
+        return len(self.labels)
+
+    def missing(self):
+        """Characters of CHARSET the atlas has no template for"""
+        return CHARSET - set(self.classes.tolist())
+
+    def classify(self, glyphs):
+        """Best label for every row of glyphs, and by how much its correlation beats the runner-up label's"""
+        scores = np.maximum.reduceat(_normalize(glyphs) @ self.templates.T, self.starts, axis=1)
+        if scores.shape[1] < 2:
+            return self.classes[scores.argmax(axis=1)], scores.max(axis=1)
+        second, best = np.partition(scores, -2, axis=1)[:, -2:].T
+        return self.classes[scores.argmax(axis=1)], best - second
+
+    def read(self, mask):
+        """OCR a text mask (see yellow_mask). Returns (text, confidence), confidence being the smallest margin any
+        glyph won by (see classify)."""
+        words, worst = [], 1.0
+        for baseline, xheight, boxes in segment(mask):
+            labels, margins = self.classify(cells(mask, baseline, xheight, boxes))
+            worst = min(worst, float(margins.min()))
+            line = [labels[0]]
+            for (px, _, pw, _), (x, _, _, _), label in zip(boxes, boxes[1:], labels[1:]):
+                if x - (px + pw) > SPACE * xheight:
+                    line.append(" ")
+                line.append(label)
+            words.append("".join(line))
+        return " ".join(words), (worst if words else 0.0)
@@ -6,13 +6,19 @@ import os
 import pickle
 from sys import modules
 
-import aiomysql
 import discord
 import urllib3
 from discord.ext import commands
 from dotenv import load_dotenv
 
 import sql
+import sqlbackend
+import utils
+from dispatcher import ActionDispatcher
+from editor import EditScheduler
+from ocr import OcrService
+from raidqueue import QueueJournal, RaidQueue
+from router import EventRouter
 from cogs import punishments
 from cogs.logging import update_leaderboards
 
@@ -51,13 +57,28 @@ bot.owner_id = 196282885601361920
 bot.gh_token = gh_token
 with open('data/variables.json', 'r') as file:
     bot.maintenance_mode = json.load(file).get("maintenance_mode")
+bot.router = EventRouter(bot)
+bot.add_listener(bot.router.on_raw_reaction_add, 'on_raw_reaction_add')
+bot.add_listener(bot.router.on_message, 'on_message')
+bot.dispatcher = ActionDispatcher(bot)
+bot.editor = EditScheduler(bot)
+# Filled in on_ready, but exists from the start so member events during startup have something to update
+bot.ign_index = utils.IgnIndex()
+# Fork the OCR workers now, before the event loop and database threads exist
+bot.ocr = OcrService(engine=os.getenv('OCR_ENGINE', 'auto'))
+bot.ocr.start()
+# Connect to the database while the gateway connects instead of after
+if os.getenv('DB_BACKEND', 'mysql').lower() == 'sqlite':
+    bot.pool_task = bot.loop.create_task(sqlbackend.create_pool('sqlite', path=os.getenv('SQLITE_PATH', 'data/rotmg.db')))
+else:
+    bot.pool_task = bot.loop.create_task(sqlbackend.create_pool('mysql', host=os.getenv("MYSQL_HOST"), port=3306, user='root',
+                                                                password=os.getenv("MYSQL_PASSWORD"), db='mysql', loop=bot.loop))
 
 
 @bot.event
 async def on_ready():
     """Wait until bot has connected to discord"""
-    bot.pool = await aiomysql.create_pool(host=os.getenv("MYSQL_HOST"), port=3306, user='root', password=os.getenv("MYSQL_PASSWORD"),
-                                          db='mysql', loop=bot.loop)
+    bot.pool = await bot.pool_task
     bot.start_time = datetime.datetime.now()
     bot.raid_db = {}
     bot.mapmarkers = {}
@@ -65,8 +86,14 @@ async def on_ready():
     bot.active_raiders = {}
     bot.serverwleaderboard = [666063675416641539, 703987028567523468, 660344559074541579, 713655609760940044, 719406991117647893, 691607211046076471]
     await build_guild_db()
+    await sql.create_alias_table(bot.pool)
+    await sql.create_log_key(bot.pool)
+    await sql.create_log_indexes(bot.pool)
+    await load_casino_top()
+    for g in bot.guilds:
+        bot.ign_index.build(g)
     for g in bot.guild_db:
-        bot.raid_db[g] = {"afk": {}, "cp": {}, "leaders": []}
+        bot.raid_db[g] = {"afk": {}, "cp": {}, "classes": {}, "leaders": []}
 
     if bot.maintenance_mode:
         await bot.change_presence(status=discord.Status.idle, activity=discord.Game("IN MAINTENANCE MODE!"))
@@ -105,6 +132,10 @@ async def on_ready():
 
 async def build_guild_db():
     bot.guild_db = await sql.construct_guild_database(bot.pool, bot)
+    bot.reaction_index = sql.build_reaction_index(bot.guild_db)
+
+async def load_casino_top():
+    await sql.casino_top.load(bot.pool, {g.id: [m.id for m in g.members] for g in bot.guilds})
 
 # Link queue to raiding category (queue_channel, category)
 # 1. Dungeoneer (oryx raiding `Queue`)
@@ -112,16 +143,27 @@ queue_links = [(660347818061332481, 660347478620766227), (736226011733033041, 73
 def init_queues():
     bot.queue_links = {}
     bot.queues = {}
-    if os.path.isfile('data/queues.pkl'):
+    if getattr(bot, 'queue_journal', None):
+        bot.queue_journal.close()
+    bot.queue_journal = QueueJournal('data/queues')
+    saved = {}
+    if bot.queue_journal.exists():
+        saved = bot.queue_journal.load()
+        print('Loaded queue from journal')
+    elif os.path.isfile('data/queues.pkl'):
         with open('data/queues.pkl', 'rb') as file:
-            bot.queues = pickle.load(file)
+            saved = {k: list(q) for k, q in pickle.load(file).items()}
         print('Loaded queue from file')
-    else:
-        for i in queue_links:
-            queue = bot.get_channel(i[0])
-            bot.queues[i[0]] = []
-            for m in queue.members:
-                bot.queues[i[0]].append(m.id)
+    for i in queue_links:
+        queue = bot.get_channel(i[0])
+        # Keep saved positions for members still in the queue vc, then add anyone new in vc order
+        in_vc = [m.id for m in queue.members]
+        present = set(in_vc)
+        ids = [id for id in saved.get(i[0], []) if id in present]
+        kept = set(ids)
+        ids += [id for id in in_vc if id not in kept]
+        bot.queues[i[0]] = RaidQueue(ids)
+    bot.queue_journal.attach(bot.queues)
     for i in queue_links:
         queue = bot.get_channel(i[0])
         category = bot.get_channel(i[1])
@@ -160,11 +202,20 @@ async def reload(ctx, extension):
     """Reload specified cog"""
     extension = extension.lower()
     if extension == 'guilds':
-        await build_guild_db()
-        extension = 'Guild Database'
+        if ctx.guild:
+            await sql.construct_guild_database(bot.pool, bot, ctx.guild.id)
+            bot.reaction_index = sql.build_reaction_index(bot.guild_db)
+            extension = f'Guild Database ({ctx.guild.name})'
+        else:
+            await build_guild_db()
+            extension = 'Guild Database'
     elif extension == 'all':
         import sql
+        # Reloading sql replaces its in-memory stores, so persist them first and reseed the leaderboards after
+        await sql.casino_store.flush()
+        await sql.casino_top.flush()
         importlib.reload(sql)
+        await load_casino_top()
         import utils
         importlib.reload(utils)
         import checks
@@ -211,7 +262,11 @@ async def reload(ctx, extension):
         bot.reload_extension('cogs.verification')
     elif extension == 'utils':
         import sql
+        # Same as 'all': persist the in-memory stores before the reload replaces them, then reseed the leaderboards
+        await sql.casino_store.flush()
+        await sql.casino_top.flush()
         importlib.reload(sql)
+        await load_casino_top()
         import utils
         importlib.reload(utils)
         import checks
@@ -298,8 +353,8 @@ async def maintenance(ctx):
     else:
         bot.maintenance_mode = True
         await bot.change_presence(status=discord.Status.idle, activity=discord.Game("IN MAINTENANCE MODE!"))
-        with open('data/queues.pkl', 'wb') as file:
-            pickle.dump(bot.queues, file, pickle.HIGHEST_PROTOCOL)
+        bot.queue_journal.compact()
+        await sql.casino_store.flush()
 
         print('Saved queue to file')
         await ctx.send("Maintenance mode has been turned on!")
@@ -310,6 +365,28 @@ async def maintenance(ctx):
         json.dump(data, f)
         f.truncate()
 
+@bot.command(usage="botstats")
+@commands.is_owner()
+async def botstats(ctx):
+    embed = discord.Embed(title="Internal Stats", color=discord.Color.blue())
+    embed.add_field(name="User Cache", value="\n".join(f"{k}: {v}" for k, v in sql.user_cache.stats().items()))
+    embed.add_field(name="Casino Store", value="\n".join(f"{k}: {v}" for k, v in sql.casino_store.stats().items()))
+    embed.add_field(name="OCR", value="\n".join(f"{k}: {v}" for k, v in bot.ocr.stats().items()))
+    for lane, s in bot.dispatcher.stats().items():
+        embed.add_field(name=f"Lane: {lane}", value="\n".join(f"{k}: {v}" for k, v in s.items()))
+    await ctx.send(embed=embed)
+
+async def close():
+    """Persist buffered casino writes before disconnecting"""
+    try:
+        await sql.casino_store.flush()
+        await sql.casino_top.flush()
+    except Exception as e:
+        print(f"Failed to flush casino data on shutdown: {e}")
+    bot.ocr.shutdown()
+    await commands.Bot.close(bot)
+bot.close = close
+
 for filename in os.listdir('./cogs/'):
     if filename.endswith('.py'):
         bot.load_extension(f'cogs.{filename[:-3]}')
@@ -321,24 +398,23 @@ async def syncm(ctx):
     verified_role = bot.guild_db.get(ctx.guild.id)[sql.gld_cols.verifiedroleid]
     m_names = []
     #(id, ign, 'verified', ctx.guild.name, alt1, alt2)
+    aliases = []
     async for m in ctx.guild.fetch_members():
         if verified_role in m.roles:
             if m.nick:
                 name = None
-                alt1 = None
-                alt2 = None
+                alts = []
                 if " | " in m.nick:
                     ns = m.nick.split(" | ")
                     for n in ns:
                         if not name:
                             name = "".join([c for c in n if c.isalpha()])
-                        elif not alt1:
-                            alt1 = "".join([c for c in n if c.isalpha()])
-                        elif not alt2:
-                            alt2 = "".join([c for c in n if c.isalpha()])
+                        elif len(alts) < sql.max_alts:
+                            alts.append("".join([c for c in n if c.isalpha()]))
                 else:
                     name = "".join([c for c in m.nick if c.isalpha()])
-                m_names.append((m.id, name, 'verified', ctx.guild.name, alt1, alt2))
+                m_names.append((m.id, name, 'verified', ctx.guild.name, *(alts + [None, None])[:2]))
+                aliases.append((m.id, name, alts))
 
     await ctx.send(f'Created {len(m_names)} member profiles... Awaiting insertion into DB...')
 
@@ -347,6 +423,8 @@ async def syncm(ctx):
             s = f"Replace INTO rotmg.users (id, ign, status, verifiedguilds, alt1, alt2) VALUES (%s, %s, %s, %s, %s, %s)"
             await cursor.executemany(s, m_names)
             await conn.commit()
+    await sql.replace_aliases(bot.pool, aliases)
+    sql.user_cache.clear()
 
     await ctx.send(f'Inserted {len(m_names)} members into DB. Success.')
 
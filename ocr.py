@@ -0,0 +1,429 @@
+import asyncio
+import hashlib
+import multiprocessing
+import os
+import re
+import time
+from collections import Counter, OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+import cv2
+import numpy as np
+from pytesseract import pytesseract
+
+from fuzzy import FuzzyIndex
+from glyphs import GlyphAtlas, first_line, line_height, text_region, yellow_mask
+
+STAGES = ('decode', 'threshold', 'ocr', 'match')
+# Screenshots one parse can be split across, a full 80 person /who usually fits in two
+MAX_IMAGES = 4
+# Glyph reads where some character's best template beats the runner-up character's by less than this go to tesseract
+# instead. Misreads (d/o, c/e) win by a few hundredths, a clean read of the atlas' own font by 0.1 or more.
+MIN_MARGIN = 0.05
+# Line height (in pixels) text is scaled to before tesseract reads it
+TEXT_HEIGHT = 20
+# Two screenshots whose text fingerprints differ in at most this many of their 256 bits, whose text blocks are the same
+# size and whose "Players online (N)" lines agree are taken to be the same /who, e.g. a screenshot re-sent after Discord
+# re-encoded it
+FINGERPRINT_DISTANCE = 24
+
+
+class OcrBusy(Exception):
+    """Raised when too many screenshots are already waiting to be parsed"""
+
+
+class WhoResult:
+    """What a worker read from a /who screenshot. names is None if no /who output was found.
+
+    matches is [(name as read, matched candidate or None)] in screenshot order. With consume=True each candidate can
+    only be matched once and leftover holds the candidates nobody matched. engine is 'glyph', 'tesseract' or 'cache', and
+    header is False for a screenshot of the rest of a long /who list that doesn't show the "Players online" line, and
+    count is the N that line gives."""
+    __slots__ = ('names', 'matches', 'leftover', 'timings', 'engine', 'header', 'fingerprint', 'count')
+
+    def __init__(self, names, matches=(), leftover=(), timings=None, engine=None, header=True, fingerprint=None, count=None):
+        self.names = names
+        self.matches = list(matches)
+        self.leftover = list(leftover)
+        self.timings = timings or {}
+        self.engine = engine
+        self.header = header
+        self.fingerprint = fingerprint
+        self.count = count
+
+
+class ResultCache:
+    """LRU cache of what OCR read from screenshots (names only, matching always re-runs against the current members).
+
+    Looked up by a hash of the attachment bytes first. Re-encoded copies of a screenshot have different bytes, so entries
+    are also kept by fingerprint() and player count, and workers check new screenshots against those before reading
+    them (see read_who)."""
+
+    def __init__(self, size=128):
+        self.size = size
+        self.entries = OrderedDict()  # digest -> WhoResult
+        self.hits = 0
+        self.near_hits = 0
+
+    @staticmethod
+    def digest(data):
+        return hashlib.blake2b(data, digest_size=16).digest()
+
+    def get(self, digest):
+        result = self.entries.get(digest)
+        if result is not None:
+            self.entries.move_to_end(digest)
+            self.hits += 1
+        return result
+
+    def near(self, fingerprint):
+        """The cached result for a screenshot with exactly this fingerprint (as found by a worker), or None"""
+        for digest, result in reversed(self.entries.items()):
+            if result.fingerprint == fingerprint:
+                self.entries.move_to_end(digest)
+                self.near_hits += 1
+                return result
+        return None
+
+    def fingerprints(self):
+        """[(fingerprint, player count)] of the entries a near hit can be confirmed for"""
+        return [(r.fingerprint, r.count) for r in self.entries.values() if r.fingerprint is not None and r.count is not None]
+
+    def put(self, digest, result):
+        self.entries[digest] = WhoResult(result.names, engine=result.engine, header=result.header,
+                                         fingerprint=result.fingerprint, count=result.count)
+        self.entries.move_to_end(digest)
+        while len(self.entries) > self.size:
+            self.entries.popitem(last=False)
+
+
+## Worker side (runs in the OCR processes)
+
+_atlas = None
+
+
+def atlas():
+    """This process's glyph atlas, or None if data/glyphs.npz hasn't been built or can't read every IGN"""
+    global _atlas
+    if _atlas is None:
+        try:
+            _atlas = GlyphAtlas.load()
+        except FileNotFoundError:
+            _atlas = False
+        else:
+            if _atlas.missing():
+                # Any name with a character it lacks would be misread with full confidence, leave it all to tesseract
+                print(f"Glyph atlas has no {''.join(sorted(_atlas.missing()))}, using tesseract only")
+                _atlas = False
+    return _atlas or None
+
+
+def tesseract_image(img, mask):
+    """Scale the text crop so lines are TEXT_HEIGHT tall and keep only the yellow /who text, as dark text on white"""
+    factor = TEXT_HEIGHT / (line_height(mask) or TEXT_HEIGHT)
+    img = cv2.resize(img, None, fx=factor, fy=factor, interpolation=cv2.INTER_CUBIC if factor > 1 else cv2.INTER_AREA)
+    # invert the mask to get yellow letters on white background
+    res = cv2.bitwise_not(yellow_mask(img))
+    kernel = np.ones((2, 2), np.uint8)
+    res = cv2.erode(res, kernel, iterations=1)
+    return cv2.GaussianBlur(res, (3, 3), 0)
+
+
+def _clean(text):
+    return text.replace("\n", " ").replace("}", ")").replace("{", "(").replace(";", ":")
+
+
+def who_count(text):
+    """N from the "Players online (N):" line of OCR'd /who output, or None if it isn't there"""
+    found = re.search(r'Players online \(([0-9]+)\):', _clean(text))
+    return int(found.group(1)) if found else None
+
+
+def split_who(text, header=True):
+    """Pull the player names out of OCR'd /who output, or None if it isn't there.
+
+    With header=False text without the "Players online" line is read as a continuation of the list."""
+    text = _clean(text)
+    split_str = re.split(r'(.*)(Players online \([0-9]+\): )', text)
+    if len(split_str) >= 4:
+        text = split_str[3]
+    elif header or not text.strip():
+        return None
+    names = []
+    for name in text.split(", "):
+        if " " in name:
+            name = name.split(" ")[0]
+        names.append(name.strip(" ,"))
+    return names
+
+
+def match_names(names, candidates, cutoff=0.6, consume=False, lower=False):
+    remaining = Counter(candidates)
+    index = FuzzyIndex(remaining)
+    matches = []
+    for name in names:
+        query = name.lower() if lower else name
+        match = query if query in index else index.best(query, cutoff)
+        matches.append((name, match))
+        if consume and match is not None:
+            remaining[match] -= 1
+            if not remaining[match]:
+                index.remove(match)
+    leftover = list((+remaining).elements()) if consume else []
+    return matches, leftover
+
+
+def fingerprint(img, region):
+    """Perceptual hash of a screenshot's text: (256 bit difference hash of the text mask, text block width, height).
+
+    Only the yellow text counts, so the game world moving behind the chat doesn't change it, but re-encoding only flips
+    a few bits."""
+    x, y, w, h = region
+    small = cv2.resize(yellow_mask(img[y:y + h, x:x + w]), (17, 16), interpolation=cv2.INTER_AREA).astype(np.int16)
+    bits = np.packbits(small[:, 1:] > small[:, :-1])
+    return int.from_bytes(bits.tobytes(), 'big'), int(w), int(h)
+
+
+def same_text(a, b):
+    """Whether two fingerprints could be of the same /who text: close hashes and exactly the same text block size.
+
+    Lists that differ by one similar looking name can still pass, so confirm with read_count() before trusting it."""
+    return bin(a[0] ^ b[0]).count('1') <= FINGERPRINT_DISTANCE and a[1:] == b[1:]
+
+
+def read_count(img, region, engine='auto'):
+    """The player count of a screenshot, from OCR of only the first line of its text block. None if it can't be read."""
+    x, y, w, h = region
+    img = img[y:y + h, x:x + w]
+    mask = yellow_mask(img)
+    line = first_line(mask)
+    if line is None:
+        return None
+    top, bottom = line
+    if engine != 'tesseract' and atlas():
+        text, margin = atlas().read(mask[top:bottom])
+        if margin >= MIN_MARGIN or engine == 'glyph':
+            return who_count(text)
+    if engine == 'glyph':
+        return None
+    img = cv2.copyMakeBorder(tesseract_image(img[top:bottom], mask[top:bottom]), 8, 8, 8, 8, cv2.BORDER_CONSTANT, value=255)
+    try:
+        return who_count(pytesseract.image_to_string(img, lang='eng'))
+    except (pytesseract.TesseractError, pytesseract.TesseractNotFoundError) as e:
+        print(f"ERROR - tesseract failed: {e}")
+        return None
+
+
+def read_text(img, engine='auto', timings=None):
+    """OCR the /who list out of a BGR screenshot. Returns (text, engine used).
+
+    Only the text block found by text_region() is thresholded at full resolution and read. engine 'glyph' only uses the
+    template atlas, 'tesseract' only tesseract, and 'auto' tries the atlas first and falls back to tesseract when it
+    isn't built, isn't confident, or didn't find the /who output."""
+    timings = {} if timings is None else timings
+    start = time.perf_counter()
+    region = text_region(img)
+    if region is None:
+        timings['threshold'] = time.perf_counter() - start
+        return "", 'tesseract' if engine == 'tesseract' or not atlas() else 'glyph'
+    x, y, w, h = region
+    img = img[y:y + h, x:x + w]
+    mask = yellow_mask(img)
+    timings['threshold'] = time.perf_counter() - start
+
+    if engine != 'tesseract' and atlas():
+        start = time.perf_counter()
+        text, margin = atlas().read(mask)
+        timings['ocr'] = timings.get('ocr', 0) + time.perf_counter() - start
+        if engine == 'glyph' or (margin >= MIN_MARGIN and split_who(text, header=False) is not None):
+            return text, 'glyph'
+    if engine == 'glyph':
+        return "", 'glyph'
+
+    start = time.perf_counter()
+    img = tesseract_image(img, mask)
+    timings['threshold'] += time.perf_counter() - start
+    start = time.perf_counter()
+    try:
+        text = pytesseract.image_to_string(img, lang='eng')
+    except (pytesseract.TesseractError, pytesseract.TesseractNotFoundError) as e:
+        # These don't survive the trip back from the worker process, report them here instead
+        print(f"ERROR - tesseract failed: {e}")
+        text = ""
+    timings['ocr'] = timings.get('ocr', 0) + time.perf_counter() - start
+    return text, 'tesseract'
+
+
+def read_who(data, engine='auto', known=()):
+    """Decode, threshold and OCR one screenshot (as bytes), timing every stage.
+
+    `known` holds the (fingerprint, player count) of screenshots already cached. If this one's fingerprint is the
+    same_text() as one of them and the count read from its first line agrees, the rest isn't read: the result's engine
+    is 'cache' and its fingerprint the known one it matched."""
+    timings = {}
+    start = time.perf_counter()
+    img = cv2.imdecode(np.frombuffer(data, dtype=np.uint8), cv2.IMREAD_COLOR)
+    if img is None:
+        timings['decode'] = time.perf_counter() - start
+        return WhoResult(None, timings=timings)
+    region = text_region(img)
+    fp = fingerprint(img, region) if region is not None else None
+    timings['decode'] = time.perf_counter() - start
+    near = [(k, count) for k, count in known if fp is not None and same_text(fp, k)]
+    if near:
+        start = time.perf_counter()
+        count = read_count(img, region, engine)
+        timings['ocr'] = time.perf_counter() - start
+        for k, known_count in near:
+            if count == known_count:
+                return WhoResult(None, timings=timings, engine='cache', fingerprint=k)
+
+    text, used = read_text(img, engine, timings)
+    names = split_who(text)
+    if names is not None:
+        return WhoResult(names, timings=timings, engine=used, fingerprint=fp, count=who_count(text))
+    names = split_who(text, header=False)
+    if names is None:
+        print("ERROR - Parsed String: " + text)
+    return WhoResult(names, timings=timings, engine=used, header=False, fingerprint=fp)
+
+
+def merge_names(results):
+    """Names from several screenshots of one /who list, in order with the overlap between screenshots dropped.
+
+    None unless at least one of them shows the "Players online" line."""
+    if not any(r.header and r.names is not None for r in results):
+        return None
+    # The screenshot with the header comes first, the rest continue the list in the order they were sent
+    results = sorted(results, key=lambda r: not r.header)
+    return list(dict.fromkeys(n for r in results if r.names for n in r.names if n))
+
+
+def _warm():
+    atlas()
+    return os.getpid()
+
+
+## Bot side
+
+class OcrService:
+    """Parses /who screenshots on a dedicated pool of OCR processes.
+
+    Workers are forked up front (call start() before the bot spawns threads) so the first parse doesn't pay for process
+    startup. Only plain data crosses the process boundary: image bytes and candidate names in, a WhoResult out. At most
+    one screenshot per worker is in flight; up to `max_pending` more wait their turn, beyond that parse() raises OcrBusy.
+    engine picks the OCR engine, see read_text(). What was read is kept in a ResultCache of `cache_size` screenshots."""
+
+    def __init__(self, workers=None, max_pending=8, engine='auto', cache_size=128):
+        self.workers = workers or os.cpu_count() or 1
+        self.max_pending = max_pending
+        self.engine = engine
+        self.cache = ResultCache(cache_size)
+        self.engines = Counter()
+        self.executor = None
+        self.slots = None
+        self.waiting = 0
+        self.parsed = 0
+        self.totals = dict.fromkeys(STAGES + ('queue',), 0.0)
+
+    def start(self):
+        self.executor = ProcessPoolExecutor(self.workers, mp_context=multiprocessing.get_context('fork'))
+        for _ in range(self.workers):
+            self.executor.submit(_warm)
+
+    @property
+    def pending(self):
+        """Screenshots waiting for a free worker"""
+        return self.waiting
+
+    async def _run(self, fn, *args):
+        """Run fn on a worker once one is free. Returns (result, seconds spent waiting)."""
+        queued = time.perf_counter()
+        self.waiting += 1
+        try:
+            await self.slots.acquire()
+        finally:
+            self.waiting -= 1
+        try:
+            wait = time.perf_counter() - queued
+            loop = asyncio.get_event_loop()
+            executor = self.executor
+            try:
+                return await loop.run_in_executor(executor, fn, *args), wait
+            except BrokenProcessPool:
+                # A worker died (e.g. tesseract crashed hard) and took every call in flight down with it. Only the first
+                # of them to get here replaces the pool, the rest retry once on the replacement.
+                if self.executor is executor:
+                    executor.shutdown(wait=False)
+                    self.start()
+                return await loop.run_in_executor(self.executor, fn, *args), wait
+        finally:
+            self.slots.release()
+
+    async def _read(self, data):
+        """Names in one screenshot, from the cache if it (or a re-encoded copy of it) was read before"""
+        digest = self.cache.digest(data)
+        cached = self.cache.get(digest)
+        if cached is not None:
+            return WhoResult(cached.names, engine='cache', header=cached.header), 0.0
+        result, wait = await self._run(read_who, data, self.engine, self.cache.fingerprints())
+        if result.engine == 'cache':
+            cached = self.cache.near(result.fingerprint)
+            if cached is None:
+                # Evicted while the worker was looking at it
+                result, wait = await self._run(read_who, data, self.engine)
+            else:
+                self.cache.put(digest, cached)
+                return WhoResult(cached.names, timings=result.timings, engine='cache', header=cached.header), wait
+        if result.names is not None:
+            self.cache.put(digest, result)
+        return result, wait
+
+    async def parse(self, images, candidates, cutoff=0.6, consume=False, lower=False):
+        """Read the names in one or more screenshots (bytes) of a /who list and match them against candidates (a list
+        of plain strings). Screenshots are read in parallel and their names merged before matching."""
+        if self.slots is None:
+            self.slots = asyncio.Semaphore(self.workers)
+        if self.executor is None:
+            self.start()
+        if self.slots.locked() and self.waiting + len(images) > self.max_pending:
+            raise OcrBusy(f"{self.waiting} screenshots are already waiting to be parsed")
+
+        reads = await asyncio.gather(*(self._read(data) for data in images))
+        # Screenshots are read side by side, so the slowest one is what the RL waits for
+        timings = {'queue': max(wait for _, wait in reads)}
+        for stage in STAGES[:3]:
+            timings[stage] = max(r.timings.get(stage, 0.0) for r, _ in reads)
+        names = merge_names([r for r, _ in reads])
+        engine = next((r.engine for r, _ in reads if r.engine and r.engine != 'cache'), reads[0][0].engine)
+        if names is None:
+            result = WhoResult(None, timings=timings, engine=engine)
+        else:
+            start = time.perf_counter()
+            (matches, leftover), _ = await self._run(match_names, names, list(candidates), cutoff, consume, lower)
+            timings['match'] = time.perf_counter() - start
+            result = WhoResult(names, matches, leftover, timings, engine)
+
+        self.parsed += 1
+        for r, _ in reads:
+            if r.engine:
+                self.engines[r.engine] += 1
+        for stage, t in result.timings.items():
+            self.totals[stage] = self.totals.get(stage, 0.0) + t
+        return result
+
+    def stats(self):
+        """Mean milliseconds per stage over every parse so far"""
+        s = {'workers': self.workers, 'pending': self.waiting, 'parsed': self.parsed}
+        for stage, total in self.totals.items():
+            s[f'{stage}_ms'] = round(total * 1000 / self.parsed, 1) if self.parsed else 0.0
+        for engine, count in self.engines.items():
+            s[f'{engine} parses'] = count
+        s['cache'] = f"{len(self.cache.entries)}/{self.cache.size} ({self.cache.hits} hits, {self.cache.near_hits} near)"
+        return s
+
+    def shutdown(self):
+        if self.executor:
+            self.executor.shutdown(wait=False)
+            self.executor = None
@@ -0,0 +1,92 @@
+# Compares the glyph-template OCR engine against tesseract on labelled /who screenshots (plus rescaled copies of them, and
+# copies pasted into a noisy 1080p frame to measure the cost of finding the text in a full game screenshot).
+# Usage: python ocrbench.py [--build] [image text]...
+# Samples default to the labelled screenshots listed in data/who_samples.json. --build first (re)builds data/glyphs.npz
+# from the samples, which between them have to show every character in glyphs.CHARSET; add screenshots to the list
+# until they do. Benchmarking on the screenshots the atlas was built from is optimistic, so pass other labelled
+# screenshots to see held-out accuracy.
+import json
+import statistics
+import sys
+import time
+from difflib import SequenceMatcher
+
+import cv2
+import numpy as np
+
+import ocr
+from glyphs import CHARSET, GlyphAtlas, text_region
+
+SCALES = (1.0, 0.75, 0.5, 1.3)
+
+
+def framed(img):
+    """img pasted into the bottom left of a 1920x1080 frame of dark noise, like chat in a full screenshot"""
+    frame = np.random.default_rng(1).integers(0, 120, (1080, 1920, 3), dtype=np.uint8)
+    h, w = min(img.shape[0], 1040), min(img.shape[1], 1880)
+    frame[1040 - h:1040, 20:20 + w] = img[:h, :w]
+    return frame
+
+
+def score(truth, text):
+    """Character similarity and the fraction of names read exactly"""
+    names = ocr.split_who(text) or []
+    expected = ocr.split_who(truth)
+    return SequenceMatcher(None, truth, " ".join(text.split())).ratio(), sum(n in names for n in expected) / len(expected)
+
+
+def bench(engine, img, truth, runs):
+    times = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        text, used = ocr.read_text(img, engine)
+        times.append((time.perf_counter() - start) * 1000)
+    chars, names = score(truth, text)
+    return statistics.mean(times), chars, names, used
+
+
+def load_samples(path='data/who_samples.json'):
+    with open(path) as f:
+        return [(s['image'], s['text']) for s in json.load(f)]
+
+
+def main():
+    args = sys.argv[1:]
+    build = '--build' in args
+    args = [a for a in args if a != '--build']
+    samples = list(zip(args[::2], args[1::2])) or load_samples()
+    images = [(cv2.imread(path), path, text) for path, text in samples]
+
+    if build:
+        missing = CHARSET - {c for _, _, text in images for c in text}
+        if missing:
+            return print(f"The samples never show {''.join(sorted(missing))}, add screenshots that do to data/who_samples.json.")
+        atlas = GlyphAtlas.build([(img, text) for img, _, text in images])
+        atlas.save()
+        print(f"Built data/glyphs.npz: {len(atlas)} templates, {len(atlas.classes)} characters")
+
+    engines = ['glyph', 'tesseract']
+    if not ocr.atlas():
+        engines.remove('glyph')
+        print("No complete glyph atlas, run with --build and samples covering glyphs.CHARSET first.")
+    try:
+        ocr.pytesseract.get_tesseract_version()
+    except Exception:
+        engines.remove('tesseract')
+        print("tesseract not installed.")
+    if not engines:
+        return
+
+    for img, path, truth in images:
+        variants = [(f"x{factor}", cv2.resize(img, None, fx=factor, fy=factor, interpolation=cv2.INTER_CUBIC)) for factor in SCALES]
+        variants.append(("1080p", framed(img)))
+        for label, variant in variants:
+            _, _, w, h = text_region(variant)
+            cropped = w * h / (variant.shape[0] * variant.shape[1])
+            for engine in engines:
+                mean, chars, names, _ = bench(engine, variant, truth, 3 if engine == 'tesseract' else 50)
+                print(f"{path} {label:<6} {engine:<9} {mean:8.1f}ms  chars {chars:6.1%}  names {names:6.1%}  "
+                      f"pixels read {cropped:6.1%}")
+
+
+main()
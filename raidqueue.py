@@ -0,0 +1,191 @@
+import json
+import os
+
+
+class RaidQueue:
+    """Ordered queue of member ids with an id -> slot index.
+
+    Every join gets the next slot number. Membership, join and leave are O(1) dict operations, and a Fenwick tree
+    over the slots counts how many members are still ahead of a slot, so position lookups are O(log n). Slots are
+    renumbered once the tree fills up, which keeps that cost amortized."""
+
+    def __init__(self, ids=(), journal=None, key=None):
+        self.slots = {}  # member id -> slot, in join order
+        self.size = 64
+        self.tree = [0] * (self.size + 1)
+        self.next_slot = 1
+        self.journal = None
+        self.key = key
+        for id in ids:
+            self.append(id)
+        self.journal = journal
+
+    def __len__(self):
+        return len(self.slots)
+
+    def __contains__(self, id):
+        return id in self.slots
+
+    def __iter__(self):
+        return iter(list(self.slots))
+
+    def __repr__(self):
+        return f"RaidQueue({list(self.slots)})"
+
+    def _update(self, slot, delta):
+        while slot <= self.size:
+            self.tree[slot] += delta
+            slot += slot & -slot
+
+    def _prefix(self, slot):
+        total = 0
+        while slot > 0:
+            total += self.tree[slot]
+            slot -= slot & -slot
+        return total
+
+    def _rebuild(self):
+        self.size = max(64, 2 * len(self.slots) + 1)
+        self.tree = [0] * (self.size + 1)
+        self.next_slot = 1
+        for id in self.slots:
+            self.slots[id] = self.next_slot
+            self._update(self.next_slot, 1)
+            self.next_slot += 1
+
+    def append(self, id):
+        """Add id to the back of the queue. Does nothing if it's already queued."""
+        if id in self.slots:
+            return
+        if self.next_slot > self.size:
+            self._rebuild()
+        self.slots[id] = self.next_slot
+        self._update(self.next_slot, 1)
+        self.next_slot += 1
+        if self.journal:
+            self.journal.record('j', self.key, id)
+
+    def remove(self, id):
+        """Remove id from the queue, raising ValueError if it isn't queued (like list.remove)."""
+        slot = self.slots.pop(id, None)
+        if slot is None:
+            raise ValueError(f"{id} is not in the queue")
+        self._update(slot, -1)
+        if self.journal:
+            self.journal.record('l', self.key, id)
+
+    def discard(self, id):
+        if id in self.slots:
+            self.remove(id)
+
+    def position(self, id):
+        """1-based position of id in the queue, or None if it isn't queued."""
+        slot = self.slots.get(id)
+        if slot is None:
+            return None
+        return self._prefix(slot)
+
+    def index(self, id):
+        """0-based index of id, raising ValueError if it isn't queued (like list.index)."""
+        pos = self.position(id)
+        if pos is None:
+            raise ValueError(f"{id} is not in the queue")
+        return pos - 1
+
+    def head(self, n=None, eligible=None):
+        """Yield up to n queued ids from the front that pass the eligible(id) predicate."""
+        count = 0
+        for id in list(self.slots):
+            if n is not None and count >= n:
+                return
+            if eligible is None or eligible(id):
+                count += 1
+                yield id
+
+    def clear(self):
+        for id in list(self.slots):
+            self.remove(id)
+        self._rebuild()
+
+    def __getstate__(self):
+        return {'ids': list(self.slots), 'key': self.key}
+
+    def __setstate__(self, state):
+        self.__init__(state['ids'], key=state.get('key'))
+
+
+class QueueJournal:
+    """Append-only log of queue joins/leaves with periodic snapshots, so queue positions survive crashes and restarts.
+
+    Each change is a single appended line ("j <queue> <member>" or "l <queue> <member>"), flushed to the OS straight
+    away. Every `compact_every` events the current queues are written to a snapshot (atomically, via os.replace) and
+    the journal is truncated. Loading replays the journal on top of the last snapshot."""
+
+    def __init__(self, path='data/queues', compact_every=500, fsync=False):
+        self.snapshot_path = path + '.snapshot.json'
+        self.journal_path = path + '.journal'
+        self.compact_every = compact_every
+        self.fsync = fsync
+        self.queues = None
+        self.events = 0
+        self.file = None
+
+    def exists(self):
+        return os.path.isfile(self.snapshot_path) or os.path.isfile(self.journal_path)
+
+    def load(self):
+        """Rebuild {queue channel id: [member ids]} from the snapshot and journal."""
+        state = {}
+        if os.path.isfile(self.snapshot_path):
+            with open(self.snapshot_path, 'r') as f:
+                state = {int(k): {id: None for id in v} for k, v in json.load(f).items()}
+        if os.path.isfile(self.journal_path):
+            with open(self.journal_path, 'r') as f:
+                for line in f:
+                    parts = line.split()
+                    if len(parts) != 3 or not line.endswith('\n'):
+                        continue  # Partially written line from a crash
+                    op, key, id = parts[0], int(parts[1]), int(parts[2])
+                    queue = state.setdefault(key, {})
+                    if op == 'j':
+                        queue.setdefault(id, None)
+                    elif op == 'l':
+                        queue.pop(id, None)
+        return {k: list(v) for k, v in state.items()}
+
+    def attach(self, queues):
+        """Start journaling changes to queues ({channel id: RaidQueue}), beginning with a fresh snapshot."""
+        self.queues = queues
+        for key, queue in queues.items():
+            queue.key = key
+            queue.journal = self
+        self.compact()
+
+    def record(self, op, key, id):
+        if self.file is None:
+            self.file = open(self.journal_path, 'a')
+        self.file.write(f"{op} {key} {id}\n")
+        self.file.flush()
+        if self.fsync:
+            os.fsync(self.file.fileno())
+        self.events += 1
+        if self.events >= self.compact_every:
+            self.compact()
+
+    def compact(self):
+        """Write a snapshot of every attached queue and truncate the journal."""
+        tmp = self.snapshot_path + '.tmp'
+        with open(tmp, 'w') as f:
+            json.dump({str(k): list(q) for k, q in self.queues.items()}, f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, self.snapshot_path)
+        if self.file is not None:
+            self.file.close()
+        self.file = open(self.journal_path, 'w')
+        self.events = 0
+
+    def close(self):
+        if self.file is not None:
+            self.file.close()
+            self.file = None
@@ -0,0 +1,90 @@
+import asyncio
+
+
+class _Session:
+    """A single pending wait registered with the router."""
+    __slots__ = ('future', 'check', 'keys')
+
+    def __init__(self, future, check, keys):
+        self.future = future
+        self.check = check
+        self.keys = keys
+
+
+class EventRouter:
+    """Routes reaction and message events to the interactive flow waiting on them.
+
+    Sessions are stored under (message_id, user_id, emoji) for reactions and (channel_id, author_id) for messages,
+    with None acting as a wildcard. Dispatching an event is a handful of dict lookups no matter how many paginators,
+    DM confirmations or games are open, unlike client.wait_for which runs every pending check on every event."""
+
+    def __init__(self, client):
+        self.client = client
+        self.reactions = {}
+        self.messages = {}
+        self.live = set()
+
+    @property
+    def live_sessions(self):
+        """Number of flows currently waiting on an event."""
+        return len(self.live)
+
+    async def wait_for_reaction(self, message_id, user_id=None, emojis=None, timeout=None, check=None):
+        """Wait for a reaction on message_id, optionally restricted to a user and a set of emojis.
+
+        Returns the RawReactionActionEvent payload. Raises asyncio.TimeoutError like client.wait_for."""
+        if emojis is None:
+            keys = [(message_id, user_id, None)]
+        else:
+            keys = [(message_id, user_id, str(e)) for e in emojis]
+        return await self._wait(self.reactions, keys, timeout, check)
+
+    async def wait_for_message(self, channel_id, author_id=None, timeout=None, check=None):
+        """Wait for a message in channel_id, optionally restricted to a single author.
+
+        Returns the Message. Raises asyncio.TimeoutError like client.wait_for."""
+        return await self._wait(self.messages, [(channel_id, author_id)], timeout, check)
+
+    async def _wait(self, table, keys, timeout, check):
+        session = _Session(self.client.loop.create_future(), check, keys)
+        for key in keys:
+            table.setdefault(key, []).append(session)
+        self.live.add(session)
+        try:
+            return await asyncio.wait_for(session.future, timeout=timeout)
+        finally:
+            self.live.discard(session)
+            for key in keys:
+                sessions = table.get(key)
+                if sessions is not None:
+                    try:
+                        sessions.remove(session)
+                    except ValueError:
+                        pass
+                    if not sessions:
+                        del table[key]
+
+    @staticmethod
+    def _dispatch(table, keys, event):
+        for key in keys:
+            for session in list(table.get(key, ())):
+                if session.future.done():
+                    continue
+                try:
+                    if session.check is None or session.check(event):
+                        session.future.set_result(event)
+                except Exception as e:
+                    session.future.set_exception(e)
+
+    async def on_raw_reaction_add(self, payload):
+        if not self.reactions or payload.user_id == self.client.user.id:
+            return
+        emoji = str(payload.emoji)
+        mid, uid = payload.message_id, payload.user_id
+        self._dispatch(self.reactions, ((mid, uid, emoji), (mid, uid, None), (mid, None, emoji), (mid, None, None)), payload)
+
+    async def on_message(self, message):
+        if not self.messages or message.author.id == self.client.user.id:
+            return
+        cid, aid = message.channel.id, message.author.id
+        self._dispatch(self.messages, ((cid, aid), (cid, None)), message)
@@ -1,15 +1,164 @@
+import asyncio
+import bisect
 import enum
 import json
+import time
+from collections import OrderedDict
 from datetime import datetime, timedelta
 
 
+class UserCache:
+    """Bounded LRU cache of rotmg.users rows (including misses) with a TTL, invalidated by the writers in this module"""
+
+    def __init__(self, maxsize=10000, ttl=300):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.rows = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, uid):
+        """Return (found, row) for uid"""
+        entry = self.rows.get(uid)
+        if entry is None or entry[0] < time.monotonic():
+            self.misses += 1
+            return False, None
+        self.rows.move_to_end(uid)
+        self.hits += 1
+        return True, entry[1]
+
+    def put(self, uid, row):
+        self.rows[uid] = (time.monotonic() + self.ttl, row)
+        self.rows.move_to_end(uid)
+        while len(self.rows) > self.maxsize:
+            self.rows.popitem(last=False)
+
+    def invalidate(self, uid):
+        self.rows.pop(int(uid), None)
+
+    def clear(self):
+        self.rows.clear()
+
+    def stats(self):
+        total = self.hits + self.misses
+        return {'size': len(self.rows), 'hits': self.hits, 'misses': self.misses, 'hit_rate': round(self.hits / total, 3) if total else 0.0}
+
+
+user_cache = UserCache()
+# Most alt names that can be linked to one account (kept in rotmg.aliases)
+max_alts = 5
+
+
+class CasinoLeaderboard:
+    """In-memory per-guild casino balance leaderboards, seeded from rotmg.casino and persisted to rotmg.casino_top.
+
+    Each guild keeps a sorted list of (-balance, uid) for up to `capacity` players (more than the `size` shown, so
+    someone falling out of the top still leaves the next player ranked), found with bisect on every balance change.
+    A guild's casino_top row is only rewritten when its visible top `size` changed, at most every `delay` seconds."""
+
+    def __init__(self, size=10, capacity=100, delay=5):
+        self.size = size
+        self.capacity = capacity
+        self.delay = delay
+        self.ranked = {}  # guild id -> [(-balance, uid)] sorted
+        self.balances = {}  # guild id -> {uid: balance}
+        self.dirty = set()
+        self.pool = None
+        self.task = None
+
+    async def load(self, pool, guilds, chunk=500):
+        """Seed every guild's leaderboard with its `capacity` richest members. guilds maps guild id -> member ids.
+
+        Balances aren't stored per guild, so each guild's members are looked up `chunk` ids at a time, each query
+        returning only its top `capacity` rows, and the best of those are kept."""
+        self.pool = pool
+        self.ranked.clear()
+        self.balances.clear()
+        async with pool.acquire() as conn:
+            async with conn.cursor() as cursor:
+                for guild_id, members in guilds.items():
+                    members = list(members)
+                    rows = []
+                    for i in range(0, len(members), chunk):
+                        ids = members[i:i + chunk]
+                        await cursor.execute(f"SELECT balance, id from rotmg.casino WHERE id IN ({', '.join(['%s'] * len(ids))}) "
+                                             "ORDER BY balance DESC LIMIT %s", (*ids, self.capacity))
+                        rows.extend(await cursor.fetchall())
+                    ranked = sorted((-bal, uid) for bal, uid in rows)[:self.capacity]
+                    self.ranked[guild_id] = ranked
+                    self.balances[guild_id] = {uid: -bal for bal, uid in ranked}
+                await conn.commit()
+        self.dirty.clear()
+
+    def top(self, guild_id):
+        """[(uid, balance)] for the guild's top `size` players"""
+        return [(uid, -bal) for bal, uid in self.ranked.get(guild_id, [])[:self.size]]
+
+    def update(self, guild_id, uid, balance):
+        ranked = self.ranked.setdefault(guild_id, [])
+        balances = self.balances.setdefault(guild_id, {})
+        changed = False
+        old = balances.pop(uid, None)
+        if old is not None:
+            i = bisect.bisect_left(ranked, (-old, uid))
+            del ranked[i]
+            changed = i < self.size
+        if len(ranked) < self.capacity or (-balance, uid) < ranked[-1]:
+            i = bisect.bisect_left(ranked, (-balance, uid))
+            ranked.insert(i, (-balance, uid))
+            balances[uid] = balance
+            changed = changed or i < self.size
+            if len(ranked) > self.capacity:
+                del balances[ranked.pop()[1]]
+        if changed:
+            self.dirty.add(guild_id)
+            if self.pool and self.task is None:
+                self.task = asyncio.get_event_loop().create_task(self._persist_later())
+
+    def row(self, guild_id):
+        top = self.top(guild_id)
+        top += [(None, 0)] * (self.size - len(top))
+        return [guild_id, *[v for pair in top for v in pair]]
+
+    async def flush(self):
+        """Write the casino_top row of every guild whose top changed"""
+        guilds, self.dirty = self.dirty, set()
+        if not guilds or not self.pool:
+            return
+        async with self.pool.acquire() as conn:
+            async with conn.cursor() as cursor:
+                await cursor.executemany("REPLACE INTO rotmg.casino_top (guildid, 1_id, 1_bal, 2_id, 2_bal, 3_id, 3_bal, 4_id, 4_bal, 5_id, "
+                                         "5_bal, 6_id, 6_bal, 7_id, 7_bal, 8_id, 8_bal, 9_id, 9_bal, 10_id, 10_bal) "
+                                         "VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)",
+                                         [self.row(g) for g in guilds])
+                await conn.commit()
+
+    async def _persist_later(self):
+        await asyncio.sleep(self.delay)
+        self.task = None
+        try:
+            await self.flush()
+        except Exception as e:
+            print(f"Failed to persist casino leaderboards: {e}")
+
+
+casino_top = CasinoLeaderboard()
+# Balance a player's casino row is created with
+starting_balance = 7500
+
+
 async def get_user(pool, uid):
     """Return user data from rotmg.users table"""
+    uid = int(uid)
+    found, data = user_cache.get(uid)
+    if found:
+        return data
     async with pool.acquire() as conn:
         async with conn.cursor() as cursor:
             await cursor.execute(f"SELECT * from rotmg.users WHERE id = {uid}")
             data = await cursor.fetchone()
             await conn.commit()
+            user_cache.put(uid, data)
             return data
 
 
@@ -23,10 +172,12 @@ async def get_num_verified(pool):
             return data
 
 async def ign_exists(pool, ign, id):
-    """Check if an IGN has been entered into the user table already"""
+    """Check if an IGN (or alt) is already linked to a different verified user"""
     async with pool.acquire() as conn:
         async with conn.cursor() as cursor:
-            await cursor.execute("SELECT * from rotmg.users WHERE ign = '{}' AND status = 'verified'".format(ign))
+            sql = ("SELECT a.uid from rotmg.aliases a JOIN rotmg.users u ON u.id = a.uid "
+                   "WHERE a.normalized_name = %s AND u.status = 'verified'")
+            await cursor.execute(sql, (normalize_ign(ign),))
             user = await cursor.fetchone()
             await conn.commit()
             if not user or user[0] == id:
@@ -34,12 +185,12 @@ async def ign_exists(pool, ign, id):
             return True
 
 async def get_user_from_ign(pool, name):
-    """Retrieve User Data From IGN"""
+    """Retrieve User Data From IGN or alt name"""
     async with pool.acquire() as conn:
         async with conn.cursor() as cursor:
-            sql = "SELECT * from rotmg.users WHERE (ign = %s OR alt1 = %s OR alt2 = %s) AND status = 'verified'"
-            data = (name, name, name)
-            await cursor.execute(sql, data)
+            sql = ("SELECT u.* from rotmg.aliases a JOIN rotmg.users u ON u.id = a.uid "
+                   "WHERE a.normalized_name = %s AND u.status = 'verified'")
+            await cursor.execute(sql, (normalize_ign(name),))
             user = await cursor.fetchone()
             return user
 
@@ -66,6 +217,7 @@ async def set_patreon_status(pool, uid, ign, status: bool):
                 sql = "UPDATE rotmg.users SET is_patreon=%s WHERE id=%s"
                 await cursor.execute(sql, (status, uid))
                 await conn.commit()
+            user_cache.invalidate(uid)
 
 async def get_all_patreons(pool):
     async with pool.acquire() as conn:
@@ -90,6 +242,7 @@ async def change_username(pool, uid, newname):
             return True
 
 async def add_alt_name(pool, uid, altname):
+    """Link an alt to a verified user. Returns False if they're at max_alts or the name belongs to someone else."""
     async with pool.acquire() as conn:
         async with conn.cursor() as cursor:
             sql = "SELECT * from rotmg.users WHERE id = %s AND status = 'verified'"
@@ -98,17 +251,17 @@ async def add_alt_name(pool, uid, altname):
             data = await cursor.fetchone()
             if not data:
                 return False
-            if data[usr_cols.alt1]:
-                if data[usr_cols.alt2]:
-                    return False
-                else:
-                    t = 'alt2'
-            else:
-                t = 'alt1'
-            sql = f"UPDATE rotmg.users SET {t} = %s WHERE id = %s"
-            data = (altname, uid)
-            await cursor.execute(sql, data)
+            await cursor.execute("SELECT uid from rotmg.aliases WHERE normalized_name = %s", (normalize_ign(altname),))
+            owner = await cursor.fetchone()
+            if owner:
+                return owner[0] == int(uid)
+            if len(await _get_alts(cursor, uid)) >= max_alts:
+                return False
+            sql = "INSERT INTO rotmg.aliases (uid, name, normalized_name, kind) VALUES (%s, %s, %s, 'alt')"
+            await cursor.execute(sql, (uid, altname, normalize_ign(altname)))
+            await _sync_alt_columns(cursor, uid)
             await conn.commit()
+            user_cache.invalidate(uid)
             return True
 
 async def remove_alt_name(pool, uid, altname):
@@ -120,26 +273,77 @@ async def remove_alt_name(pool, uid, altname):
             data = await cursor.fetchone()
             if not data:
                 return False
-            movealts=False
-            if data[usr_cols.alt1] and data[usr_cols.alt1].lower() == altname.lower():
-                t = 'alt1'
-                if data[usr_cols.alt2]:
-                    movealts=True
-            elif data[usr_cols.alt2] and data[usr_cols.alt2].lower() == altname.lower():
-                t = 'alt2'
-            else:
+            sql = "DELETE FROM rotmg.aliases WHERE uid = %s AND normalized_name = %s AND kind = 'alt'"
+            await cursor.execute(sql, (uid, normalize_ign(altname)))
+            if not cursor.rowcount:
                 return False
-
-            if not movealts:
-                sql = f"UPDATE rotmg.users SET {t} = %s WHERE id = %s"
-                data = (None, uid)
-            else:
-                sql = f"UPDATE rotmg.users SET alt1 = %s, alt2 = %s WHERE id = %s"
-                data = (data[usr_cols.alt2], None, uid)
-            await cursor.execute(sql, data)
+            await _sync_alt_columns(cursor, uid)
             await conn.commit()
+            user_cache.invalidate(uid)
             return True
 
+async def get_alts(pool, uid):
+    """Return a user's alt names in the order they were added"""
+    async with pool.acquire() as conn:
+        async with conn.cursor() as cursor:
+            return await _get_alts(cursor, uid)
+
+async def set_ign_alias(pool, uid, ign):
+    """Point a user's main IGN alias at ign, taking the name over from whoever held it before"""
+    async with pool.acquire() as conn:
+        async with conn.cursor() as cursor:
+            await cursor.execute("DELETE FROM rotmg.aliases WHERE uid = %s AND kind = 'ign'", (uid,))
+            sql = ("INSERT INTO rotmg.aliases (uid, name, normalized_name, kind) VALUES (%s, %s, %s, 'ign') "
+                   "ON DUPLICATE KEY UPDATE uid = VALUES(uid), name = VALUES(name), kind = VALUES(kind)")
+            await cursor.execute(sql, (uid, ign, normalize_ign(ign)))
+            await conn.commit()
+
+async def replace_aliases(pool, names):
+    """Replace every alias of the given users. names is a list of (uid, ign, [alts]); duplicate names keep the first owner."""
+    rows = []
+    for uid, ign, alts in names:
+        if ign:
+            rows.append((uid, ign, normalize_ign(ign), 'ign'))
+        rows.extend((uid, alt, normalize_ign(alt), 'alt') for alt in alts if alt)
+    async with pool.acquire() as conn:
+        async with conn.cursor() as cursor:
+            await cursor.executemany("DELETE FROM rotmg.aliases WHERE uid = %s", [(n[0],) for n in names])
+            sql = "INSERT IGNORE INTO rotmg.aliases (uid, name, normalized_name, kind) VALUES (%s, %s, %s, %s)"
+            await cursor.executemany(sql, rows)
+            await conn.commit()
+
+async def create_alias_table(pool):
+    """Create rotmg.aliases if it doesn't exist yet and backfill it from the ign/alt columns of rotmg.users"""
+    async with pool.acquire() as conn:
+        async with conn.cursor() as cursor:
+            await cursor.execute("SHOW TABLES FROM rotmg LIKE 'aliases'")
+            if await cursor.fetchone():
+                return
+            await cursor.execute("CREATE TABLE rotmg.aliases ("
+                                 "id INT NOT NULL AUTO_INCREMENT PRIMARY KEY, "
+                                 "uid BIGINT NOT NULL, "
+                                 "name VARCHAR(32) NOT NULL, "
+                                 "normalized_name VARCHAR(32) NOT NULL, "
+                                 "kind ENUM('ign', 'alt') NOT NULL, "
+                                 "UNIQUE KEY normalized_name (normalized_name), "
+                                 "KEY uid (uid))")
+            await cursor.execute("SELECT id, ign, alt1, alt2 FROM rotmg.users WHERE ign IS NOT NULL ORDER BY status = 'verified' DESC")
+            users = await cursor.fetchall()
+    await replace_aliases(pool, [(u[0], u[1], [u[2], u[3]]) for u in users])
+
+async def _get_alts(cursor, uid):
+    await cursor.execute("SELECT name from rotmg.aliases WHERE uid = %s AND kind = 'alt' ORDER BY id", (uid,))
+    return [r[0] for r in await cursor.fetchall()]
+
+async def _sync_alt_columns(cursor, uid):
+    """Mirror the first two alts into rotmg.users.alt1/alt2 for anything still reading those columns"""
+    alts = await _get_alts(cursor, uid) + [None, None]
+    await cursor.execute("UPDATE rotmg.users SET alt1 = %s, alt2 = %s WHERE id = %s", (alts[0], alts[1], uid))
+
+def normalize_ign(name):
+    """Lowercase a name and strip everything but letters, the way aliases are keyed"""
+    return "".join(c for c in name if c.isalpha()).lower()
+
 async def get_blacklist(pool, uid, gid, type=None):
     """Get Blacklist entry for user or get all entries"""
     async with pool.acquire() as conn:
@@ -187,6 +391,7 @@ async def add_new_user(pool, user_id, guild_id, verify_id):
             data = (user_id, guild_id, verify_id)
             await cursor.execute(sql, data)
             await conn.commit()
+            user_cache.invalidate(user_id)
 
 
 async def update_user(pool, id, column, change):
@@ -196,6 +401,7 @@ async def update_user(pool, id, column, change):
             sql = "UPDATE rotmg.users SET {} = %s WHERE id = {}".format(column, id)
             await cursor.execute(sql, (change,))
             await conn.commit()
+            user_cache.invalidate(id)
 
 
 ## GUILD Functions
@@ -218,14 +424,24 @@ async def add_new_guild(pool, guild_id, guild_name):
             await conn.commit()
 
 
-async def update_guild(pool, id, column, change):
-    """Update guild data in rotmg.guilds"""
+async def update_guild(pool, id, column, change, client=None):
+    """Update guild data in rotmg.guilds (and the client's in-memory guild_db & reaction index if a client is passed)"""
     async with pool.acquire() as conn:
         async with conn.cursor() as cursor:
             sql = f"UPDATE rotmg.guilds SET {column} = %s WHERE id = %s"
             await cursor.execute(sql, (change, id))
             await conn.commit()
 
+    if client and id in client.guild_db:
+        col = gld_cols[column]
+        if col in reaction_index_cols:
+            old = client.guild_db[id][col]
+            if old and client.reaction_index.get(old) == (id, col):
+                del client.reaction_index[old]
+            if change:
+                client.reaction_index[change] = (id, col)
+        client.guild_db[id][col] = guild_db_value(client.get_guild(id), col, change)
+
 async def get_guild(pool, gid):
     """Return guild data from rotmg.guilds"""
     async with pool.acquire() as conn:
@@ -244,187 +460,282 @@ async def get_guilds(pool):
             return data
 
 
+class GuildConfig:
+    """One guild's rotmg.guilds row, with channel & role ids resolved to discord objects and unset values as None.
+
+    Indexed like the row (config[gld_cols.raidvc1], config.get(gld_cols.raidvc1)) or by column name (config.raidvc1)."""
+    __slots__ = ('id', 'values')
+
+    def __init__(self, guild, row):
+        self.id = row[0]
+        # One pass over the row, with each column's resolver looked up ahead of time in gdb_resolvers
+        self.values = [resolve(guild, v) if v else None for resolve, v in zip(gdb_resolvers, row)]
+        self.values.extend(row[len(self.values):])
+
+    def __getitem__(self, column):
+        return self.values[column]
+
+    def __setitem__(self, column, value):
+        self.values[column] = value
+
+    def __len__(self):
+        return len(self.values)
+
+    def __iter__(self):
+        return iter(self.values)
+
+    def __getattr__(self, name):
+        try:
+            return self.values[gld_cols[name]]
+        except KeyError:
+            raise AttributeError(name) from None
+
+    def get(self, column, default=None):
+        value = self.values[column] if 0 <= column < len(self.values) else None
+        return default if value is None else value
+
+    def __repr__(self):
+        return f"GuildConfig({self.id})"
+
+
 async def construct_guild_database(pool, client, guildid=None):
+    """Build {guild id: GuildConfig} for every guild the client is in, or refetch only guildid into client.guild_db"""
     if not guildid:
         guilds = await get_guilds(pool)
         guild_db = {}
     else:
         guild_db = client.guild_db
-        guilds = get_guild(pool, guildid)
-    for i, g in enumerate(guilds):
-        db = {}
+        guild = await get_guild(pool, guildid)
+        guilds = [guild] if guild else []
+    for g in guilds:
         guild = client.get_guild(g[0])
         if guild:
-            for j, r in enumerate(g):
-                if r:
-                    if j in gdb_channels:
-                        db[j] = guild.get_channel(r)
-                    elif j in gdb_roles:
-                        db[j] = guild.get_role(r)
-                    else:
-                        db[j] = r
-                else:
-                    db[j] = None
-            guild_db[g[0]] = db
+            guild_db[g[0]] = GuildConfig(guild, g)
     return guild_db
 
-# CASINO Functions
+def guild_db_value(guild, column, value):
+    """Convert a raw rotmg.guilds value into the channel/role object (or plain value) stored in guild_db"""
+    return gdb_resolvers[column](guild, value) if value else None
 
-async def get_casino_player(pool, id):
-    async with pool.acquire() as conn:
-        async with conn.cursor() as cursor:
-            await cursor.execute(f"SELECT * from rotmg.casino WHERE id = {id}")
-            data = await cursor.fetchone()
-            await conn.commit()
-            if not data:
-                now = datetime.utcnow()
-                now = now.strftime('%Y-%m-%d %H:%M:%S')
-                sql = ("REPLACE INTO rotmg.casino (id, balance, dailycooldown, workcooldown, searchcooldown) VALUES (%s, %s, %s, %s, %s)")
-                data = [id, 7500, now, now, now]
-                await cursor.execute(sql, data)
-                await conn.commit()
-                for i, d in enumerate(data):
-                    if i > 1:
-                        data[i] = datetime.strptime(d, '%Y-%m-%d %H:%M:%S')
-            return data
+def build_reaction_index(guild_db):
+    """Map every verification & sub-verification message id to (guild_id, column) so reactions can be routed without the DB"""
+    index = {}
+    for gid, db in guild_db.items():
+        for col in reaction_index_cols:
+            if db.get(col):
+                index[db[col]] = (gid, col)
+    return index
 
+# CASINO Functions
 
-async def change_balance(pool, guild_id, id, new_bal):
-    async with pool.acquire() as conn:
-        async with conn.cursor() as cursor:
-            await cursor.execute(f"SELECT * FROM rotmg.casino_top where guildid = {guild_id}")
-            data = list(await cursor.fetchone())
-            leaderboard_size = 10
-            if data[-1] <= new_bal:
-                # Split the data out into relevant parts
-                g_id = data[0]
-                data = data[1:]
-                uids = data[::2]
-                bals = data[1::2]
-                # Build balance uid pairs
-                data = [[u, b] for u, b in zip(uids, bals)]
-                uid_loc = None
+class CasinoStore:
+    """In-memory rotmg.casino accounts (balances & cooldowns) with write-behind persistence.
+
+    Rows are loaded on first use and then served from memory; every change marks the row dirty and dirty rows are
+    written in one batch `flush_interval` seconds later (and at shutdown). flush_interval is the durability knob: it's
+    the most casino activity a crash can lose, and 0 writes every change through before returning. Since the bot is
+    the only writer and all changes happen on the event loop, read-modify-write sequences are atomic without locking."""
+
+    def __init__(self, flush_interval=2.0):
+        self.flush_interval = flush_interval
+        self.rows = {}  # uid -> [id, balance, dailycooldown, workcooldown, searchcooldown, stealcooldown]
+        self.loading = {}  # uid -> future of an in-flight load
+        self.dirty = set()
+        self.pool = None
+        self.task = None
+        self.flushes = 0
+        self.rows_written = 0
+        self.failures = 0
+        self.last_flush = 0.0
+        self.max_flush = 0.0
+
+    async def get(self, pool, uid):
+        """The (mutable) row for uid, loading it or creating a new account if needed"""
+        row = self.rows.get(uid)
+        if row is not None:
+            return row
+        self.pool = pool
+        if uid in self.loading:
+            return await asyncio.shield(self.loading[uid])
+        future = self.loading[uid] = asyncio.get_event_loop().create_future()
+        try:
+            async with pool.acquire() as conn:
+                async with conn.cursor() as cursor:
+                    await cursor.execute("SELECT id, balance, dailycooldown, workcooldown, searchcooldown, stealcooldown "
+                                         "from rotmg.casino WHERE id = %s", (uid,))
+                    data = await cursor.fetchone()
+                    await conn.commit()
+            if data:
+                row = list(data)
+            else:
+                now = datetime.utcnow().replace(microsecond=0)
+                row = [uid, starting_balance, now, now, now, now]
+                self.dirty.add(uid)
+            self.rows[uid] = row
+            future.set_result(row)
+        except Exception as e:
+            future.set_exception(e)
+            raise
+        finally:
+            del self.loading[uid]
+        return row
+
+    async def changed(self, *uids):
+        """Mark rows dirty and schedule (or with write-through, perform) a flush"""
+        self.dirty.update(uids)
+        if self.flush_interval <= 0:
+            await self.flush()
+        elif self.task is None:
+            self.task = asyncio.get_event_loop().create_task(self._flush_later())
+
+    async def flush(self):
+        """Write every dirty row in one batch. Rows stay dirty if the write fails."""
+        uids, self.dirty = self.dirty, set()
+        if not uids or not self.pool:
+            self.dirty |= uids
+            return
+        start = time.monotonic()
+        try:
+            async with self.pool.acquire() as conn:
+                async with conn.cursor() as cursor:
+                    await cursor.executemany("INSERT INTO rotmg.casino (id, balance, dailycooldown, workcooldown, searchcooldown, "
+                                             "stealcooldown) VALUES (%s, %s, %s, %s, %s, %s) ON DUPLICATE KEY UPDATE "
+                                             "balance = VALUES(balance), dailycooldown = VALUES(dailycooldown), "
+                                             "workcooldown = VALUES(workcooldown), searchcooldown = VALUES(searchcooldown), "
+                                             "stealcooldown = VALUES(stealcooldown)", [self.rows[u] for u in uids])
+                    await conn.commit()
+        except Exception:
+            self.failures += 1
+            self.dirty |= uids
+            raise
+        self.last_flush = time.monotonic() - start
+        self.max_flush = max(self.max_flush, self.last_flush)
+        self.flushes += 1
+        self.rows_written += len(uids)
+
+    async def _flush_later(self):
+        await asyncio.sleep(self.flush_interval)
+        self.task = None
+        try:
+            await self.flush()
+        except Exception as e:
+            print(f"Failed to flush casino accounts: {e}")
+        if self.dirty and self.task is None:
+            self.task = asyncio.get_event_loop().create_task(self._flush_later())
+
+    def stats(self):
+        return {'cached': len(self.rows), 'dirty': len(self.dirty), 'flushes': self.flushes, 'rows_written': self.rows_written,
+                'failures': self.failures, 'last_flush_ms': round(self.last_flush * 1000, 1),
+                'max_flush_ms': round(self.max_flush * 1000, 1)}
+
+
+casino_store = CasinoStore()
 
-                # Index throws up when not found
-                try:
-                    uid_loc = uids.index(id)
-                except:
-                    pass
 
-                if uid_loc is not None:
-                    data[uid_loc][1] = new_bal
-                else:
-                    data.append((id, new_bal))
-
-                # Remove any entry with None
-                data = list(filter(lambda x: x[0] is not None, data))
-                # Sort by balance
-                data = sorted(data, key=lambda x: x[1], reverse=True)
-
-                # Append so data is 10 long
-                if len(data) < leaderboard_size:
-                    data = [*data, *[[None, 0]] * (leaderboard_size - len(data))]
-                # Chop to 10
-                data = data[:leaderboard_size]
-
-                # De-interleave data
-                # Build list
-                write_data = list(range(leaderboard_size * 2))
-                # Put user ids in even indexes
-                write_data[::2] = [pair[0] for pair in data]
-                # Put balances in odd indexes
-                write_data[1::2] = [pair[1] for pair in data]
-
-                # Add guild id to front
-                write_data = [g_id, *write_data]
-                # Write to database
-                await cursor.execute("REPLACE INTO rotmg.casino_top (guildid, 1_id, 1_bal, 2_id, 2_bal, 3_id, 3_bal, 4_id, 4_bal, 5_id, "
-                                     "5_bal, 6_id, 6_bal, 7_id, 7_bal, 8_id, 8_bal, 9_id, 9_bal, 10_id, 10_bal) "
-                                     "VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)", write_data)
-
-            elif id in data and new_bal < data[-1]:
-                # Index throws up when not found
-                uid_loc = None
-                try:
-                    uid_loc = data.index(id)
-                except:
-                    pass
-
-                if uid_loc:
-                    del data[uid_loc]
-                    del data[uid_loc]
-                    data.append(None)
-                    data.append(0)
-                    await cursor.execute(
-                        "REPLACE INTO rotmg.casino_top (guildid, 1_id, 1_bal, 2_id, 2_bal, 3_id, 3_bal, 4_id, 4_bal, 5_id, "
-                        "5_bal, 6_id, 6_bal, 7_id, 7_bal, 8_id, 8_bal, 9_id, 9_bal, 10_id, 10_bal) "
-                        "VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)", data)
-
-            await cursor.execute(f"UPDATE rotmg.casino SET balance = {new_bal} WHERE id = {id}")
-            await conn.commit()
+async def get_casino_player(pool, id):
+    return tuple(await casino_store.get(pool, int(id)))
+
+
+async def transfer(pool, guild_id, from_id, to_id, amount, check_funds=True):
+    """Move amount credits from from_id to to_id as one step. Either id can be None for the house (payouts & bets).
+
+    amount can also be a function of (from balance, to balance) returning the amount, or None to cancel, evaluated on
+    the current balances with nothing else able to run in between. Returns (moved, from balance, to balance); nothing
+    moves if the amount was cancelled or check_funds is set and from_id can't cover it."""
+    ids = [i for i in (from_id, to_id) if i is not None]
+    rows = {i: await casino_store.get(pool, i) for i in ids}
+    from_row, to_row = rows.get(from_id), rows.get(to_id)
+    from_bal = from_row[casino_cols.balance] if from_row else None
+    to_bal = to_row[casino_cols.balance] if to_row else None
+    if callable(amount):
+        amount = amount(from_bal, to_bal)
+    if amount is None or (check_funds and from_row and from_bal < amount):
+        return False, from_bal, to_bal
+
+    if from_row:
+        from_row[casino_cols.balance] = from_bal = from_bal - amount
+    if to_row:
+        to_row[casino_cols.balance] = to_bal = to_bal + amount
+    for i in ids:
+        casino_top.update(guild_id, i, rows[i][casino_cols.balance])
+    await casino_store.changed(*ids)
+    return True, from_bal, to_bal
 
 
 async def update_cooldown(pool, id, column):
-    async with pool.acquire() as conn:
-        async with conn.cursor() as cursor:
-            time = datetime.utcnow()
-            if column == 2:
-                column = "dailycooldown"
-                time = time + timedelta(days=1)
-            elif column == 3:
-                column = "workcooldown"
-                time = time + timedelta(hours=4)
-            elif column == 4:
-                column = "searchcooldown"
-                time = time + timedelta(minutes=30)
-            elif column == 5:
-                column = "stealcooldown"
-                time = time + timedelta(hours=8)
-            else:
-                return
-            time = time.strftime('%Y-%m-%d %H:%M:%S')
-            await cursor.execute(f"UPDATE rotmg.casino SET {column} = '{time}' WHERE id = {id}")
-            await conn.commit()
-
-async def get_top_balances(pool, guild_id):
-    async with pool.acquire() as conn:
-        async with conn.cursor() as cursor:
-            await cursor.execute(f"SELECT * from rotmg.casino_top WHERE guildid = {guild_id}")
-            data = await cursor.fetchone()
-            await conn.commit()
-            return data
+    cooldowns = {casino_cols.dailycooldown: timedelta(days=1), casino_cols.workcooldown: timedelta(hours=4),
+                 casino_cols.searchcooldown: timedelta(minutes=30), casino_cols.stealcooldown: timedelta(hours=8)}
+    if column not in cooldowns:
+        return
+    row = await casino_store.get(pool, int(id))
+    row[column] = datetime.utcnow().replace(microsecond=0) + cooldowns[column]
+    await casino_store.changed(row[casino_cols.id])
 
 
 ## RUN LOGGING:
 async def log_runs(pool, guild_id, member_id, column=1, number=1):
+    """Add number to one member's column (see log_runs_batch) and return the new total"""
+    totals = await log_runs_batch(pool, guild_id, [(member_id, column, number)])
+    return totals[(member_id, column)]
+
+def log_targets(column):
+    """Return every rotmg.logging column that an increment of `column` touches (leads/assists also count toward the weekly totals)"""
+    if column in (log_cols.srunled, log_cols.frunled, log_cols.eventled):
+        return (column, log_cols.weeklyruns)
+    if column == log_cols.runsassisted:
+        return (column, log_cols.weeklyassists)
+    return (column,)
+
+async def log_runs_batch(pool, guild_id, increments):
+    """Log a whole run's worth of (member_id, column, number) increments in a single transaction.
+    Returns a dict of (member_id, column) -> new total, for use with utils.check_pops"""
+    deltas = {}
+    for member_id, column, number in increments:
+        row = deltas.setdefault(member_id, {})
+        for c in log_targets(column):
+            row[c] = row.get(c, 0) + number
+    if not deltas:
+        return {}
+
+    columns = sorted({c for row in deltas.values() for c in row})
+    names = [log_cols(c).name for c in columns]
+    rows = [(uid, guild_id, *[row.get(c, 0) for c in columns]) for uid, row in deltas.items()]
+    # Relies on (uid, gid) being the primary key (see create_log_key) so new raiders are inserted & existing ones incremented
+    # in one statement
+    sql = f"INSERT INTO rotmg.logging (uid, gid, {', '.join(names)}) VALUES (%s, %s, {', '.join(['%s'] * len(names))}) " \
+          f"ON DUPLICATE KEY UPDATE {', '.join(f'{n} = {n} + VALUES({n})' for n in names)}"
+    async with pool.acquire() as conn:
+        async with conn.cursor() as cursor:
+            try:
+                await cursor.executemany(sql, rows)
+                uids = list(deltas)
+                await cursor.execute(f"SELECT uid, {', '.join(names)} FROM rotmg.logging WHERE gid = %s AND uid IN "
+                                     f"({', '.join(['%s'] * len(uids))})", (guild_id, *uids))
+                data = await cursor.fetchall()
+                await conn.commit()
+            except Exception:
+                await conn.rollback()
+                raise
+
+    totals = {}
+    for r in data:
+        for i, c in enumerate(columns):
+            totals[(r[0], c)] = r[i+1]
+    return totals
+
+async def create_log_key(pool):
+    """Make (uid, gid) rotmg.logging's primary key if an older schema lacks it, log_runs_batch's upsert depends on it"""
     async with pool.acquire() as conn:
         async with conn.cursor() as cursor:
-            await cursor.execute(f"SELECT * from rotmg.logging WHERE uid = {member_id} AND gid = {guild_id}")
-            data = await cursor.fetchone()
-            await conn.commit()
-            if not data:
-                await cursor.execute(f"INSERT INTO rotmg.logging(uid, gid) VALUES({member_id}, {guild_id})")
-                await conn.commit()
-                data = 0
-            else:
-                data = data[column]
-
-            name = "pkey" if column == 2 else "vials" if column == 3 else "helmrunes" if column == 4 else "shieldrunes" if column == 5 else\
-                "swordrunes" if column == 6 else "eventkeys" if column == 7 else "runsdone" if column == 8 else "eventsdone" if column == 9\
-                else "srunled" if column == 10 else "frunled" if column == 11 else "eventled" if column == 12 else "runsassisted" if\
-                column == 13 else "eventsassisted" if column == 14 else "ocompletes" if column == 17 else 'oattempts'
-            if column == 10 or column == 11 or column == 12:
-                await cursor.execute(f"UPDATE rotmg.logging SET {name} = {name} + {number}, weeklyruns = weeklyruns + {number} "
-                                     f"WHERE uid = {member_id} AND gid = {guild_id}")
-            elif column == 13:
-                await cursor.execute(f"UPDATE rotmg.logging SET {name} = {name} + {number}, weeklyassists = weeklyassists + {number} "
-                                     f"WHERE uid = {member_id} AND gid = {guild_id}")
-            else:
-                await cursor.execute(f"UPDATE rotmg.logging SET {name} = {name} + {number} WHERE uid = {member_id} AND gid = {guild_id}")
+            await cursor.execute("SHOW INDEX FROM rotmg.logging")
+            primary = [r[4] for r in sorted(await cursor.fetchall(), key=lambda r: r[3]) if r[2] == 'PRIMARY']
+            if primary != ['uid', 'gid']:
+                if primary:
+                    await cursor.execute("ALTER TABLE rotmg.logging DROP PRIMARY KEY, ADD PRIMARY KEY (uid, gid)")
+                else:
+                    await cursor.execute("ALTER TABLE rotmg.logging ADD PRIMARY KEY (uid, gid)")
             await conn.commit()
 
-            return data + number
-
 async def get_log(pool, guild_id, member_id):
     async with pool.acquire() as conn:
         async with conn.cursor() as cursor:
@@ -438,30 +749,69 @@ async def get_log(pool, guild_id, member_id):
                 data = await cursor.fetchone()
             return data
 
-async def get_top_10_logs(pool, guild_id, column, only_10=True):
+async def get_top_logs(pool, guild_id, column, k=10, uids=None):
+    """Top k (uid, value) rows of a rotmg.logging column, optionally only for the member ids in uids"""
+    if uids is not None and not uids:
+        return []
+    name = log_cols(column).name
+    sql = f"SELECT uid, {name} from rotmg.logging WHERE gid = %s"
+    data = [guild_id]
+    if uids is not None:
+        sql += f" AND uid IN ({', '.join(['%s'] * len(uids))})"
+        data.extend(uids)
+    sql += f" ORDER BY {name} DESC LIMIT %s"
+    data.append(k)
     async with pool.acquire() as conn:
         async with conn.cursor() as cursor:
-            name = "pkey" if column == 2 else "vials" if column == 3 else "helmrunes" if column == 4 else "shieldrunes" if column == 5 \
-                else "swordrunes" if column == 6 else "eventkeys" if column == 7 else "runsdone" if column == 8 else "eventsdone" if \
-                column == 9 else "srunled" if column == 10 else "frunled" if column == 11 else "eventled" if column == 12 else \
-                "runsassisted" if column == 13 else "eventsassisted" if column == 14 else "weeklyruns" if column == 15 else "weeklyassists" if column == 16 \
-                else 'ocompletes' if column == 17 else 'oattempts'
-            if only_10:
-                await cursor.execute(f"SELECT * from rotmg.logging WHERE gid = {guild_id} ORDER BY {name} DESC LIMIT 10")
-            else:
-                await cursor.execute(f"SELECT * from rotmg.logging WHERE gid = {guild_id} ORDER BY {name} DESC")
+            await cursor.execute(sql, data)
             data = await cursor.fetchall()
             await conn.commit()
             return list(data)
 
-async def get_0_runs(pool, guild_id):
+async def get_top_runes(pool, guild_id, k=10):
+    """Top k (uid, total runes popped) rows"""
     async with pool.acquire() as conn:
         async with conn.cursor() as cursor:
-            await cursor.execute(f"SELECT * from rotmg.logging WHERE gid = {guild_id} AND weeklyruns = 0")
+            sql = ("SELECT uid, helmrunes + shieldrunes + swordrunes AS runes from rotmg.logging WHERE gid = %s "
+                   "ORDER BY runes DESC LIMIT %s")
+            await cursor.execute(sql, (guild_id, k))
             data = await cursor.fetchall()
             await conn.commit()
             return list(data)
 
+async def get_0_runs(pool, guild_id, uids=None):
+    """(uid, weeklyassists) rows of members with no runs led this week, optionally only for the member ids in uids"""
+    if uids is not None and not uids:
+        return []
+    sql = "SELECT uid, weeklyassists from rotmg.logging WHERE gid = %s AND weeklyruns = 0"
+    data = [guild_id]
+    if uids is not None:
+        sql += f" AND uid IN ({', '.join(['%s'] * len(uids))})"
+        data.extend(uids)
+    async with pool.acquire() as conn:
+        async with conn.cursor() as cursor:
+            await cursor.execute(sql, data)
+            data = await cursor.fetchall()
+            await conn.commit()
+            return list(data)
+
+# Covering indexes for get_top_logs (gid range, ordered by the column, uid read from the index): lb_weeklyruns and
+# lb_weeklyassists serve the weekly RL leaderboards (the uid IN filter is checked on the index entries), lb_pkey the
+# top key poppers. get_top_runes orders by a sum of three columns, which no plain index can serve, so it sorts the
+# guild's rows instead.
+log_indexes = {'lb_weeklyruns': '(gid, weeklyruns, uid)', 'lb_weeklyassists': '(gid, weeklyassists, uid)', 'lb_pkey': '(gid, pkey, uid)'}
+
+async def create_log_indexes(pool):
+    """Add any missing leaderboard indexes to rotmg.logging"""
+    async with pool.acquire() as conn:
+        async with conn.cursor() as cursor:
+            await cursor.execute("SHOW INDEX FROM rotmg.logging")
+            existing = {r[2] for r in await cursor.fetchall()}
+            for name, cols in log_indexes.items():
+                if name not in existing:
+                    await cursor.execute(f"CREATE INDEX {name} ON rotmg.logging {cols}")
+            await conn.commit()
+
 ## Punishments
 async def add_punishment(pool, uid, gid, type, rid, endtime, reason, roles=None):
     async with pool.acquire() as conn:
@@ -576,9 +926,9 @@ class usr_cols(enum.IntEnum):
 
 # Define which DB records are of what type
 # Channels (Text, Voice, Category)
-gdb_channels = [9, 11, 13, 14, 15, 16, 17, 18, 20, 21, 28, 33, 34, 35, 36, 38, 39, 40, 41, 42, 44, 45, 46, 60, 61, 62, 63, 64, 65, 66, 67, 68, 69, 70, 71, 72]
+gdb_channels = {9, 11, 13, 14, 15, 16, 17, 18, 20, 21, 28, 33, 34, 35, 36, 38, 39, 40, 41, 42, 44, 45, 46, 60, 61, 62, 63, 64, 65, 66, 67, 68, 69, 70, 71, 72}
 # Roles
-gdb_roles = [10, 19, 22, 23, 27, 31, 32, 37, 43, 47, 48, 50, 52, 54, 58, 73, 75, 79]
+gdb_roles = {10, 19, 22, 23, 27, 31, 32, 37, 43, 47, 48, 50, 52, 54, 58, 73, 75, 79}
 
 class gld_cols(enum.IntEnum):
     """Contains References to rotmg.guilds table for easy access"""
@@ -662,3 +1012,10 @@ class gld_cols(enum.IntEnum):
     numpopsfirstrune = 77
     numpopssecondrune = 78
     eventraiderroleid = 79
+
+# Resolver for every rotmg.guilds column: (guild, raw value) -> what GuildConfig stores
+gdb_resolvers = [(lambda guild, v: guild.get_channel(v)) if c in gdb_channels else (lambda guild, v: guild.get_role(v))
+                 if c in gdb_roles else (lambda guild, v: v) for c in range(max(gld_cols) + 1)]
+
+# Message id columns which route reactions to a verification flow
+reaction_index_cols = (gld_cols.verificationid, gld_cols.subverify1id, gld_cols.subverify2id)
@@ -0,0 +1,213 @@
+import asyncio
+import os
+import re
+import sqlite3
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from functools import lru_cache
+
+import sql
+
+
+async def create_pool(backend=None, **kwargs):
+    """Create the pool every function in sql.py takes.
+
+    backend is 'mysql' (aiomysql, kwargs go to aiomysql.create_pool) or 'sqlite' (kwargs go to SqlitePool), and
+    defaults to the DB_BACKEND environment variable, then mysql."""
+    backend = (backend or os.getenv('DB_BACKEND') or 'mysql').lower()
+    if backend == 'sqlite':
+        pool = SqlitePool(**kwargs)
+        await pool.open()
+        return pool
+    if backend == 'mysql':
+        import aiomysql
+        return await aiomysql.create_pool(**kwargs)
+    raise ValueError(f"Unknown database backend: {backend}")
+
+
+## SQLite
+
+sqlite3.register_adapter(datetime, lambda d: d.isoformat(' '))
+sqlite3.register_converter('TIMESTAMP', lambda b: datetime.fromisoformat(b.decode()))
+
+
+def _schema():
+    """CREATE TABLE statements for the rotmg tables, with columns taken from the *_cols enums in sql.py"""
+    def cols(enum, types=None, skip=()):
+        types = types or {}
+        return [f"{c.name} {types.get(c.name, '')}".strip() for c in enum if c.name not in skip]
+
+    top = [f'"{i}_id" INTEGER, "{i}_bal" INTEGER DEFAULT 0' for i in range(1, 11)]
+    logs = [f"{c.name} INTEGER DEFAULT 0" for c in sql.log_cols if c > sql.log_cols.gid]
+    punishments = cols(sql.punish_cols, {'starttime': 'TIMESTAMP DEFAULT CURRENT_TIMESTAMP', 'endtime': 'TIMESTAMP',
+                                          'active': 'INTEGER DEFAULT TRUE'}, skip=('roles',)) + ['presuspendroles TEXT']
+    return [
+        f"CREATE TABLE IF NOT EXISTS rotmg.users ({', '.join(cols(sql.usr_cols, {'id': 'INTEGER PRIMARY KEY'}))})",
+        f"CREATE TABLE IF NOT EXISTS rotmg.guilds ({', '.join(cols(sql.gld_cols, {'id': 'INTEGER PRIMARY KEY'}))})",
+        f"CREATE TABLE IF NOT EXISTS rotmg.logging (uid INTEGER, gid INTEGER, {', '.join(logs)}, PRIMARY KEY (uid, gid))",
+        "CREATE TABLE IF NOT EXISTS rotmg.casino (id INTEGER PRIMARY KEY, balance INTEGER, dailycooldown TIMESTAMP, "
+        "workcooldown TIMESTAMP, searchcooldown TIMESTAMP, stealcooldown TIMESTAMP)",
+        f"CREATE TABLE IF NOT EXISTS rotmg.casino_top (guildid INTEGER PRIMARY KEY, {', '.join(top)})",
+        f"CREATE TABLE IF NOT EXISTS rotmg.punishments ({', '.join(punishments)})",
+        "CREATE TABLE IF NOT EXISTS rotmg.blacklist (uid INTEGER, gid INTEGER, rid INTEGER, type TEXT, reason TEXT)",
+        "CREATE TABLE IF NOT EXISTS rotmg.aliases (id INTEGER PRIMARY KEY AUTOINCREMENT, uid INTEGER NOT NULL, name TEXT NOT NULL, "
+        "normalized_name TEXT NOT NULL UNIQUE, kind TEXT NOT NULL)",
+        "CREATE INDEX IF NOT EXISTS rotmg.aliases_uid ON aliases (uid)",
+    ]
+
+
+# MySQL-isms used by sql.py and their SQLite equivalents, applied in order
+_rewrites = [
+    (re.compile(r"%s"), "?"),
+    (re.compile(r"\bINSERT IGNORE\b", re.I), "INSERT OR IGNORE"),
+    (re.compile(r"\s+FOR UPDATE\b", re.I), ""),
+    (re.compile(r"(?<![\w\"`])(\d+_(?:id|bal))\b"), r'"\1"'),
+    (re.compile(r"\bDEFAULT\b(?=\s*[,)])"), "NULL"),
+    (re.compile(r"^SHOW TABLES FROM (\w+) LIKE", re.I), r"SELECT name FROM \1.sqlite_master WHERE type = 'table' AND name LIKE"),
+    # Same leading columns as MySQL: Table, Non_unique, Key_name, Seq_in_index, Column_name
+    (re.compile(r"^SHOW INDEX FROM (\w+)\.(\w+)", re.I),
+     r"SELECT '\2', NOT il.[unique], CASE WHEN il.origin = 'pk' THEN 'PRIMARY' ELSE il.name END, ii.seqno + 1, ii.name "
+     r"FROM \1.sqlite_master t JOIN pragma_index_list(t.name, '\1') il JOIN pragma_index_info(il.name, '\1') ii "
+     r"WHERE t.type = 'table' AND t.name = '\2'"),
+    (re.compile(r"^CREATE INDEX (\w+) ON (\w+)\.(\w+)", re.I), r"CREATE INDEX IF NOT EXISTS \2.\1 ON \3"),
+]
+_upsert = re.compile(r"\bON DUPLICATE KEY UPDATE\b(.*)$", re.I | re.S)
+_values = re.compile(r"\bVALUES\((\w+)\)", re.I)
+
+
+@lru_cache(maxsize=512)
+def translate(query):
+    """Rewrite a MySQL query from sql.py into SQLite syntax"""
+    for pattern, repl in _rewrites:
+        query = pattern.sub(repl, query)
+    return _upsert.sub(lambda m: "ON CONFLICT DO UPDATE SET" + _values.sub(r"excluded.\1", m.group(1)), query)
+
+
+class SqliteCursor:
+    __slots__ = ('conn', 'cursor')
+
+    def __init__(self, conn):
+        self.conn = conn
+        self.cursor = None
+
+    async def __aenter__(self):
+        self.cursor = await self.conn.run(self.conn.db.cursor)
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.conn.run(self.cursor.close)
+
+    @staticmethod
+    def _params(args):
+        if args is None:
+            return ()
+        return args if isinstance(args, (tuple, list, dict)) else (args,)
+
+    async def execute(self, query, args=None):
+        await self.conn.run(self.cursor.execute, translate(query), self._params(args))
+        return self.cursor.rowcount
+
+    async def executemany(self, query, args):
+        await self.conn.run(self.cursor.executemany, translate(query), [self._params(a) for a in args])
+        return self.cursor.rowcount
+
+    async def fetchone(self):
+        return await self.conn.run(self.cursor.fetchone)
+
+    async def fetchall(self):
+        return tuple(await self.conn.run(self.cursor.fetchall))
+
+    @property
+    def rowcount(self):
+        return self.cursor.rowcount
+
+    @property
+    def lastrowid(self):
+        return self.cursor.lastrowid
+
+
+class SqliteConnection:
+    """One sqlite3 connection, only ever touched from its own worker thread"""
+
+    def __init__(self, path):
+        self.path = path
+        self.executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='sqlite')
+        self.db = None
+
+    async def run(self, fn, *args):
+        return await asyncio.get_event_loop().run_in_executor(self.executor, fn, *args)
+
+    def _connect(self):
+        self.db = sqlite3.connect(':memory:', detect_types=sqlite3.PARSE_DECLTYPES, timeout=30)
+        self.db.execute("ATTACH DATABASE ? AS rotmg", (self.path,))
+        self.db.execute("PRAGMA rotmg.journal_mode = WAL")
+        self.db.execute("PRAGMA rotmg.synchronous = NORMAL")
+
+    async def connect(self):
+        await self.run(self._connect)
+
+    def cursor(self):
+        return SqliteCursor(self)
+
+    async def commit(self):
+        await self.run(self.db.commit)
+
+    async def rollback(self):
+        await self.run(self.db.rollback)
+
+    async def close(self):
+        await self.run(self.db.close)
+        self.executor.shutdown(wait=False)
+
+
+class _Acquire:
+    __slots__ = ('pool', 'conn')
+
+    def __init__(self, pool):
+        self.pool = pool
+        self.conn = None
+
+    async def __aenter__(self):
+        self.conn = await self.pool.free.get()
+        return self.conn
+
+    async def __aexit__(self, *exc):
+        # Like aiomysql, anything left uncommitted when the connection goes back to the pool is discarded
+        await self.conn.rollback()
+        self.pool.free.put_nowait(self.conn)
+
+
+class SqlitePool:
+    """Embedded SQLite stand-in for an aiomysql pool, so sql.py runs without a MySQL server.
+
+    The database file is attached as `rotmg` so queries keep their schema prefix, and MySQL-specific syntax is rewritten
+    by translate(). Each connection runs on its own thread; WAL mode lets readers carry on while one connection writes."""
+
+    def __init__(self, path='data/rotmg.db', size=4):
+        self.path = path
+        self.size = size
+        self.free = None
+        self.connections = []
+
+    async def open(self):
+        self.free = asyncio.Queue()
+        for _ in range(self.size):
+            conn = SqliteConnection(self.path)
+            await conn.connect()
+            self.connections.append(conn)
+            self.free.put_nowait(conn)
+        conn = self.connections[0]
+        for statement in _schema():
+            await conn.run(conn.db.execute, statement)
+        await conn.commit()
+
+    def acquire(self):
+        return _Acquire(self)
+
+    def close(self):
+        pass
+
+    async def wait_closed(self):
+        for conn in self.connections:
+            await conn.close()
+        self.connections.clear()
@@ -0,0 +1,115 @@
+# Runs the same sql.py workload against the embedded SQLite backend and (optionally) MySQL and compares query latency.
+# Usage: python sqlbench.py [users]
+# MySQL is only benchmarked when BENCH_MYSQL_HOST (and BENCH_MYSQL_PASSWORD) are set. It writes to that server's rotmg schema
+# (ids below 10**6, deleted afterwards), so point it at a scratch copy, never production.
+import asyncio
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+
+import sql
+import sqlbackend
+
+GUILD = 1
+random.seed(1)
+
+
+async def seed(pool, users):
+    async with pool.acquire() as conn:
+        async with conn.cursor() as cursor:
+            await cursor.executemany("REPLACE INTO rotmg.users (id, ign, status) VALUES (%s, %s, 'verified')",
+                                     [(i, f"Raider{i}") for i in range(1, users + 1)])
+            await cursor.executemany("REPLACE INTO rotmg.logging (uid, gid, weeklyruns, weeklyassists, pkey) VALUES (%s, %s, %s, %s, %s)",
+                                     [(i, GUILD, random.randint(0, 30), random.randint(0, 30), random.randint(0, 50))
+                                      for i in range(1, users + 1)])
+            await conn.commit()
+    await sql.replace_aliases(pool, [(i, f"Raider{i}", [f"Alt{i}"]) for i in range(1, users + 1)])
+    await sql.add_new_guild(pool, GUILD, 'Benchmark')
+
+
+async def cleanup(pool, users):
+    async with pool.acquire() as conn:
+        async with conn.cursor() as cursor:
+            for table, col in (('users', 'id'), ('logging', 'uid'), ('aliases', 'uid'), ('casino', 'id')):
+                await cursor.execute(f"DELETE FROM rotmg.{table} WHERE {col} BETWEEN 1 AND %s", (users,))
+            await cursor.execute("DELETE FROM rotmg.guilds WHERE id = %s", (GUILD,))
+            await cursor.execute("DELETE FROM rotmg.casino_top WHERE guildid = %s", (GUILD,))
+            await conn.commit()
+
+
+async def timed(fn, runs):
+    times = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        await fn()
+        times.append((time.perf_counter() - start) * 1000)
+    times.sort()
+    return statistics.mean(times), times[len(times) // 2], times[int(len(times) * 0.95)]
+
+
+async def workload(pool, users, runs=200):
+    sql.user_cache.ttl = -1  # Measure the database, not the cache
+    ids = list(range(1, users + 1))
+    rls = set(random.sample(ids, min(50, users)))
+    ops = {
+        'get_user': lambda: sql.get_user(pool, random.choice(ids)),
+        'get_user_from_ign': lambda: sql.get_user_from_ign(pool, f"alt{random.choice(ids)}"),
+        'get_guild': lambda: sql.get_guild(pool, GUILD),
+        'log_runs_batch (10 raiders)': lambda: sql.log_runs_batch(pool, GUILD, [(u, sql.log_cols.runsdone, 1)
+                                                                               for u in random.sample(ids, 10)]),
+        'get_top_logs (50 RLs)': lambda: sql.get_top_logs(pool, GUILD, sql.log_cols.weeklyruns, uids=rls),
+        'get_top_runes': lambda: sql.get_top_runes(pool, GUILD),
+    }
+
+    async def casino_flush():
+        for u in random.sample(ids, 50):
+            await sql.transfer(pool, GUILD, None, u, 10)
+        await sql.casino_store.flush()
+    ops['casino flush (50 rows)'] = casino_flush
+
+    results = {}
+    for name, fn in ops.items():
+        results[name] = await timed(fn, runs if 'flush' not in name else runs // 10)
+    sql.user_cache.ttl = 300
+    return results
+
+
+async def run(label, pool, users):
+    sql.casino_store.rows.clear()
+    await sql.create_alias_table(pool)
+    await sql.create_log_key(pool)
+    await sql.create_log_indexes(pool)
+    await cleanup(pool, users)
+    await seed(pool, users)
+    try:
+        results = await workload(pool, users)
+    finally:
+        await sql.casino_store.flush()
+        await cleanup(pool, users)
+    print(f"\n{label} ({users} users)")
+    for name, (mean, p50, p95) in results.items():
+        print(f"  {name:<28} mean {mean:7.3f}ms  p50 {p50:7.3f}ms  p95 {p95:7.3f}ms")
+    return results
+
+
+async def main():
+    users = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+    with tempfile.TemporaryDirectory() as d:
+        pool = await sqlbackend.create_pool('sqlite', path=os.path.join(d, 'rotmg.db'))
+        await run('sqlite', pool, users)
+        pool.close()
+        await pool.wait_closed()
+    if os.getenv('BENCH_MYSQL_HOST'):
+        pool = await sqlbackend.create_pool('mysql', host=os.getenv('BENCH_MYSQL_HOST'), port=3306, user='root',
+                                            password=os.getenv('BENCH_MYSQL_PASSWORD'), db='mysql')
+        await run('mysql', pool, users)
+        pool.close()
+        await pool.wait_closed()
+    else:
+        print("\nSet BENCH_MYSQL_HOST to compare against MySQL.")
+
+
+asyncio.run(main())
@@ -1,6 +1,5 @@
 import asyncio
 import datetime
-import difflib
 import logging
 import random
 import re
@@ -13,9 +12,100 @@ from discord.embeds import _EmptyEmbed
 from discord.ext.commands import BadArgument, Converter
 
 import sql
+from fuzzy import FuzzyIndex
 from cogs.Raiding.vc_select import VCSelect
 
 
+def normalize_name(name):
+    """Lowercase a name and strip everything but letters, the way IGNs are stored in nicknames"""
+    return "".join(c for c in name if c.isalpha()).lower()
+
+
+def nick_names(nick):
+    """Normalized IGN and alt names from a 'Main | Alt1 | Alt2' style nickname"""
+    if not nick:
+        return []
+    return [n for n in (normalize_name(p) for p in nick.split(" | ")) if n]
+
+
+class IgnIndex:
+    """Per-guild map of normalized IGN/alt names (from member nicknames) to member ids.
+
+    Built once at startup and kept current by Core's member join/update/remove listeners, so exact name lookups
+    don't need to scan guild.members or hit the database. A name several members share resolves to nobody, so callers
+    fall back to their slower lookups."""
+
+    def __init__(self):
+        self.names = {}  # guild id -> {normalized name: {member ids}}
+        self.members = {}  # guild id -> {member id: [normalized names]}
+        self.nicks = {}  # guild id -> {lowercase nickname: {member ids}}
+        self.fuzzy = {}  # guild id -> FuzzyIndex of lowercase nicknames
+
+    def build(self, guild):
+        self.names[guild.id] = {}
+        self.members[guild.id] = {}
+        self.nicks[guild.id] = {}
+        self.fuzzy[guild.id] = FuzzyIndex()
+        for m in guild.members:
+            self.add(m)
+
+    def add(self, member):
+        if member.nick:
+            nick = member.nick.lower()
+            nicks = self.nicks.setdefault(member.guild.id, {})
+            if nick not in nicks:
+                nicks[nick] = set()
+                self.fuzzy.setdefault(member.guild.id, FuzzyIndex()).add(nick)
+            nicks[nick].add(member.id)
+        names = nick_names(member.nick)
+        if not names:
+            return
+        index = self.names.setdefault(member.guild.id, {})
+        self.members.setdefault(member.guild.id, {})[member.id] = names
+        for n in names:
+            index.setdefault(n, set()).add(member.id)
+
+    def remove(self, member):
+        if member.nick:
+            nick = member.nick.lower()
+            nicks = self.nicks.get(member.guild.id, {})
+            ids = nicks.get(nick)
+            if ids is not None:
+                ids.discard(member.id)
+                if not ids:
+                    del nicks[nick]
+                    self.fuzzy[member.guild.id].remove(nick)
+        names = self.members.get(member.guild.id, {}).pop(member.id, None)
+        if not names:
+            return
+        index = self.names[member.guild.id]
+        for n in names:
+            ids = index.get(n)
+            if ids is not None:
+                ids.discard(member.id)
+                if not ids:
+                    del index[n]
+
+    def update(self, before, after):
+        if before.nick != after.nick:
+            self.remove(before)
+            self.add(after)
+
+    @staticmethod
+    def _only(guild, ids):
+        return guild.get_member(next(iter(ids))) if ids and len(ids) == 1 else None
+
+    def get(self, guild, name):
+        """Return the member whose nickname contains name, or None if nobody's or several members' do"""
+        return self._only(guild, self.names.get(guild.id, {}).get(normalize_name(name)))
+
+    def closest(self, guild, name, cutoff=0.75):
+        """Return the member with the most similar nickname, or None if there's none or it's shared"""
+        fuzzy = self.fuzzy.get(guild.id)
+        nick = fuzzy.best(name.lower(), cutoff) if fuzzy else None
+        return self._only(guild, self.nicks[guild.id][nick]) if nick else None
+
+
 class MemberLookupConverter(discord.ext.commands.MemberConverter):
     async def convert(self, ctx, mem, guild: discord.Guild = None) -> discord.Member:
         in_db = False
@@ -23,6 +113,11 @@ class MemberLookupConverter(discord.ext.commands.MemberConverter):
             ctx.guild = guild
 
         if not mem.isdigit():
+            index = getattr(ctx.bot, 'ign_index', None)
+            if index:
+                member = index.get(ctx.guild, mem)
+                if member:
+                    return member
             try:
                 data = await sql.get_user_from_ign(ctx.bot.pool, mem)
                 if data:
@@ -47,21 +142,10 @@ class MemberLookupConverter(discord.ext.commands.MemberConverter):
                         if result is not None:
                             return result
 
-                    def pred(m):
-                        if m.nick:
-                            if " | " in m.nick:
-                                names = m.nick.split(" | ")
-                                for n in names:
-                                    if "".join([m.lower() for m in n if m.isalpha()]) == mem:
-                                        return True
-                            else:
-                                if "".join([m.lower() for m in m.nick if m.isalpha()]) == mem:
-                                    return True
-                        return False
-
-                    res = discord.utils.find(pred, members)
-                    if res is not None:
-                        return res
+                    if not index:
+                        res = discord.utils.find(lambda m: normalize_name(mem) in nick_names(m.nick), members)
+                        if res is not None:
+                            return res
 
                 try:
                     member = await super().convert(ctx, mem)  # Convert parameter to discord.member
@@ -69,17 +153,12 @@ class MemberLookupConverter(discord.ext.commands.MemberConverter):
                 except discord.ext.commands.BadArgument:
                     pass
 
-                nicks = []
-                mems = []
-                for m in ctx.guild.members:
-                    if m.nick:
-                        nicks.append(m.nick.lower())
-                        mems.append(m)
-
-                res = difflib.get_close_matches(mem.lower(), nicks, n=1, cutoff=0.75)
-                if res:
-                    index = nicks.index(res[0])
-                    return mems[index]
+                if not index:
+                    index = IgnIndex()
+                    index.build(ctx.guild)
+                res = index.closest(ctx.guild, mem)
+                if res is not None:
+                    return res
 
                 desc = f"No members found with the name: {mem}. "
                 desc += f"Found 1 result in the bot's database under the user: <@{data[0]}>. Verified in: [{data[6]}]" if in_db \
@@ -120,31 +199,29 @@ class EmbedPaginator:
             starttime = datetime.datetime.utcnow()
             timeleft = 300  # 5 minute timeout
             while True:
-                def check(react, usr):
-                    return not usr.bot and react.message.id == msg.id and usr.id == self.ctx.author.id and str(react.emoji) in \
-                           ["⏮️", "⬅️", "⏹️", "➡️", "⏭️"]
                 try:
-                    reaction, user = await self.client.wait_for('reaction_add', timeout=timeleft, check=check)
+                    payload = await self.client.router.wait_for_reaction(msg.id, self.ctx.author.id, ["⏮️", "⬅️", "⏹️", "➡️", "⏭️"],
+                                                                         timeout=timeleft)
                 except asyncio.TimeoutError:
                     return await self.end_pagination(msg)
 
-                await msg.remove_reaction(reaction.emoji, self.ctx.author)
+                await msg.remove_reaction(payload.emoji, self.ctx.author)
                 timeleft = 300 - (datetime.datetime.utcnow() - starttime).seconds
-                if str(reaction.emoji) == "⬅️":
+                if str(payload.emoji) == "⬅️":
                     if pagenum == 0:
                         pagenum = len(self.pages)-1
                     else:
                         pagenum -= 1
-                elif str(reaction.emoji) == "➡️":
+                elif str(payload.emoji) == "➡️":
                     if pagenum == len(self.pages)-1:
                         pagenum = 0
                     else:
                         pagenum += 1
-                elif str(reaction.emoji) == "⏮️":
+                elif str(payload.emoji) == "⏮️":
                     pagenum = 0
-                elif str(reaction.emoji) == "⏭️":
+                elif str(payload.emoji) == "⏭️":
                     pagenum = len(self.pages)-1
-                elif str(reaction.emoji) == "⏹️":
+                elif str(payload.emoji) == "⏹️":
                     return await self.end_pagination(msg)
                 else:
                     continue